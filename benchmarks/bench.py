@@ -0,0 +1,174 @@
+"""Benchmark the TRMNL integration against local stand-in servers.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python -m benchmarks.bench --devices 500 --pushes 100 --latency 0.005
+
+Each scenario reports requests per operation (as seen by the stand-in
+servers), wall time and peak Python memory, so request amplification and
+regressions show up as changed numbers between runs.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from typing import Callable, Dict, List
+
+from custom_components.trmnl.const import (
+    DOMAIN,
+    SERVICE_APPLY_SLEEP_SCHEDULE,
+    SERVICE_REFRESH_DEVICE,
+)
+
+from .harness import Harness, ScenarioResult, async_create_harness
+
+
+async def _gather_calls(harness: Harness, service: str, payloads: List[Dict], concurrency: int) -> int:
+    """Call a service once per payload with bounded concurrency; return failures."""
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def call(data: Dict) -> None:
+        nonlocal failures
+        async with semaphore:
+            try:
+                await harness.hass.services.async_call(DOMAIN, service, data, blocking=True)
+            except Exception:  # noqa: BLE001 - counted, not fatal
+                failures += 1
+
+    await asyncio.gather(*(call(data) for data in payloads))
+    return failures
+
+
+async def scenario_poll(harness: Harness, args: argparse.Namespace) -> ScenarioResult:
+    """Coordinator polls of the whole fleet."""
+    async def run() -> int:
+        for _ in range(args.polls):
+            for coordinator in harness.coordinators:
+                await coordinator.async_refresh()
+        return 0
+
+    return await harness.measure(
+        f"poll x{args.polls} ({len(harness.device_ids)} devices)",
+        args.polls * len(harness.coordinators),
+        run,
+    )
+
+
+async def scenario_refresh(harness: Harness, args: argparse.Namespace) -> ScenarioResult:
+    """refresh_device for every device in the fleet."""
+    payloads = [{"device": device_id} for device_id in harness.device_ids]
+    return await harness.measure(
+        f"refresh_device x{len(payloads)}",
+        len(payloads),
+        lambda: _gather_calls(harness, SERVICE_REFRESH_DEVICE, payloads, args.concurrency),
+    )
+
+
+async def scenario_push(harness: Harness, args: argparse.Namespace) -> ScenarioResult:
+    """send_dashboard_to_device to the first N panels."""
+    payloads = [
+        {
+            "device_friendly_id": device_id,
+            "dashboard_path": "/lovelace/trmnl",
+            "screenshot_service_url": harness.screenshot.base_url,
+        }
+        for device_id in harness.device_ids[: args.pushes]
+    ]
+    return await harness.measure(
+        f"send_dashboard_to_device x{len(payloads)}",
+        len(payloads),
+        lambda: _gather_calls(harness, "send_dashboard_to_device", payloads, args.concurrency),
+    )
+
+
+async def scenario_sleep(harness: Harness, args: argparse.Namespace) -> ScenarioResult:
+    """apply_sleep_schedule across every server."""
+    async def run() -> int:
+        return await _gather_calls(
+            harness,
+            SERVICE_APPLY_SLEEP_SCHEDULE,
+            [{"sleep_start": "22:00", "sleep_stop": "06:00"}],
+            1,
+        )
+
+    return await harness.measure(
+        f"apply_sleep_schedule ({len(harness.device_ids)} devices)", 1, run
+    )
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "poll": scenario_poll,
+    "push": scenario_push,
+    "sleep": scenario_sleep,
+    "refresh": scenario_refresh,
+}
+
+
+def _format(result: ScenarioResult) -> str:
+    data = result.as_dict()
+    lines = [
+        f"== {data['name']}",
+        f"   operations        {data['operations']} ({data['failures']} failed)",
+        f"   wall time         {data['wall_time_s']} s ({data['ops_per_s']} ops/s)",
+        f"   requests          {data['requests']} ({data['requests_per_operation']} per operation)",
+        f"   peak in flight    {data['peak_in_flight']}",
+        f"   peak memory       {data['peak_memory_kib']} KiB",
+    ]
+    lines.extend(
+        f"     {count:>7}  {route}" for route, count in data["server_requests"].items()
+    )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=500, help="devices per Terminus server")
+    parser.add_argument("--servers", type=int, default=1, help="number of Terminus servers")
+    parser.add_argument("--latency", type=float, default=0.0, help="Terminus response delay in seconds")
+    parser.add_argument("--render-latency", type=float, default=0.0, help="screenshot render delay in seconds")
+    parser.add_argument("--image-bytes", type=int, default=48_000, help="decoded screenshot size")
+    parser.add_argument("--pushes", type=int, default=100, help="panels for the push scenario")
+    parser.add_argument("--polls", type=int, default=10, help="poll rounds for the poll scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent service calls")
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS),
+        help="scenario to run (repeatable, default: all)",
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser
+
+
+async def async_main(args: argparse.Namespace) -> List[ScenarioResult]:
+    """Run the selected scenarios on one harness."""
+    harness = await async_create_harness(
+        devices=args.devices,
+        servers=args.servers,
+        latency=args.latency,
+        render_latency=args.render_latency,
+        image_bytes=args.image_bytes,
+    )
+    try:
+        return [
+            await SCENARIOS[name](harness, args)
+            for name in (args.scenario or list(SCENARIOS))
+        ]
+    finally:
+        await harness.async_stop()
+
+
+def main() -> None:
+    """Run from the command line and print the results."""
+    args = build_parser().parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("custom_components.trmnl").setLevel(logging.ERROR)
+    results = asyncio.run(async_main(args))
+    if args.json:
+        print(json.dumps([result.as_dict() for result in results], indent=2))
+    else:
+        print("\n\n".join(_format(result) for result in results))
+
+
+if __name__ == "__main__":
+    main()
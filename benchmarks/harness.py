@@ -0,0 +1,202 @@
+"""Wire the integration to stand-in servers inside a bare Home Assistant core.
+
+The harness skips config entries and platforms: it builds the same per-server
+entry data that async_setup_entry stores, registers it with the router and
+sets up the integration services, so service calls run the production code
+paths end to end against local servers.
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import device_registry as dr  # noqa: E402
+
+from custom_components.trmnl import services  # noqa: E402
+from custom_components.trmnl.api import TRMNLApi  # noqa: E402
+from custom_components.trmnl.const import DOMAIN  # noqa: E402
+from custom_components.trmnl.coordinator import TRMNLDataUpdateCoordinator  # noqa: E402
+from custom_components.trmnl.router import TRMNLRouter  # noqa: E402
+
+from .standin import ScreenshotStandIn, TerminusStandIn  # noqa: E402
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements of one benchmark scenario."""
+
+    name: str
+    operations: int
+    wall_time: float
+    peak_memory: int
+    server_requests: Dict[str, int]
+    client_requests: int
+    peak_in_flight: int
+    failures: int = 0
+    # Scenario-specific figures, reported after the common ones
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        """Return the requests the stand-ins served."""
+        return sum(self.server_requests.values())
+
+    @property
+    def requests_per_operation(self) -> float:
+        """Return the requests served per operation."""
+        return self.requests / self.operations if self.operations else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the result as a JSON-friendly dict."""
+        return {
+            "name": self.name,
+            "operations": self.operations,
+            "failures": self.failures,
+            "wall_time_s": round(self.wall_time, 3),
+            "ops_per_s": round(self.operations / self.wall_time, 1) if self.wall_time else None,
+            "requests": self.requests,
+            "requests_per_operation": round(self.requests_per_operation, 2),
+            "client_requests": self.client_requests,
+            "peak_in_flight": self.peak_in_flight,
+            "peak_memory_kib": round(self.peak_memory / 1024, 1),
+            "server_requests": dict(sorted(self.server_requests.items())),
+            **self.extra,
+        }
+
+
+@dataclass
+class Harness:
+    """A running Home Assistant core wired to stand-in servers."""
+
+    hass: HomeAssistant
+    terminus: List[TerminusStandIn]
+    screenshot: ScreenshotStandIn
+    coordinators: List[TRMNLDataUpdateCoordinator] = field(default_factory=list)
+    _config_dir: Any = None
+
+    @property
+    def router(self) -> TRMNLRouter:
+        """Return the integration's router."""
+        return self.hass.data[DOMAIN]["router"]
+
+    @property
+    def device_ids(self) -> List[str]:
+        """Return the IDs of every device across the servers."""
+        return [
+            device_id
+            for coordinator in self.coordinators
+            for device_id in (coordinator.data or {})
+        ]
+
+    def _servers(self):
+        return [*self.terminus, self.screenshot]
+
+    def _client_requests(self) -> int:
+        total = sum(c.api.metrics.overall.requests for c in self.coordinators)
+        metrics = self.hass.data[DOMAIN].get("screenshot_metrics")
+        return total + (metrics.overall.requests if metrics else 0)
+
+    async def measure(
+        self,
+        name: str,
+        operations: int,
+        run: Callable[[], Awaitable[Optional[int]]],
+    ) -> ScenarioResult:
+        """Run a scenario and collect request counts, wall time and peak memory.
+
+        ``run`` may return the number of failed operations.
+        """
+        for server in self._servers():
+            server.reset_counters()
+        client_before = self._client_requests()
+
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            failures = await run() or 0
+            await self.hass.async_block_till_done()
+        finally:
+            wall_time = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        server_requests: Dict[str, int] = {}
+        for server in self._servers():
+            for key, count in server.requests.items():
+                server_requests[key] = server_requests.get(key, 0) + count
+
+        return ScenarioResult(
+            name=name,
+            operations=operations,
+            wall_time=wall_time,
+            peak_memory=peak,
+            server_requests=server_requests,
+            client_requests=self._client_requests() - client_before,
+            peak_in_flight=max(server.peak_in_flight for server in self._servers()),
+            failures=failures,
+        )
+
+    async def async_stop(self) -> None:
+        """Tear everything down."""
+        self.router.async_shutdown()
+        for coordinator in self.coordinators:
+            await coordinator.api.close()
+        await services.async_unload_services(self.hass)
+        await self.hass.async_stop(force=True)
+        for server in self._servers():
+            await server.stop()
+        if self._config_dir is not None:
+            self._config_dir.cleanup()
+
+
+async def async_create_harness(
+    devices: int = 10,
+    servers: int = 1,
+    latency: float = 0.0,
+    render_latency: float = 0.0,
+    image_bytes: int = 48_000,
+    render_workers: Optional[int] = None,
+) -> Harness:
+    """Start the stand-ins and a Home Assistant core with the integration services."""
+    terminus = [TerminusStandIn(devices=devices, latency=latency) for _ in range(servers)]
+    screenshot = ScreenshotStandIn(latency=render_latency, image_bytes=image_bytes, workers=render_workers)
+    for server in [*terminus, screenshot]:
+        await server.start()
+
+    config_dir = tempfile.TemporaryDirectory(prefix="trmnl-bench-")
+    hass = HomeAssistant(config_dir.name)
+    hass.config.internal_url = "http://homeassistant.local:8123"
+    await dr.async_load(hass)
+
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN]["router"] = TRMNLRouter(hass)
+    harness = Harness(hass, terminus, screenshot, _config_dir=config_dir)
+
+    for index, server in enumerate(terminus):
+        api = TRMNLApi(server.host, server.port)
+        coordinator = TRMNLDataUpdateCoordinator(hass, api)
+        coordinator.models = await api.get_models()
+        await coordinator.async_refresh()
+        entry_id = f"bench_{index}"
+        entry_data = {
+            "api": api,
+            "coordinator": coordinator,
+            "host": server.host,
+            "port": server.port,
+            "devices": coordinator.data,
+        }
+        hass.data[DOMAIN][entry_id] = entry_data
+        harness.router.async_register(entry_id, entry_data)
+        harness.coordinators.append(coordinator)
+
+    await services.async_setup_services(hass)
+    return harness
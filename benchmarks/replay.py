@@ -0,0 +1,190 @@
+"""Replay recorded TRMNL service calls against local stand-in servers.
+
+Record calls in Home Assistant with ``trmnl.start_call_recording`` and
+``trmnl.stop_call_recording``, then run from the repository root:
+
+    python -m benchmarks.replay trmnl_calls.json --speed 1 --speed 10 --speed 100
+
+Each speed runs on a fresh harness. Recorded devices are mapped onto stand-in
+devices in order of appearance and screenshot URLs point at the stand-in, so
+the replay exercises the same code paths with the recorded timing compressed
+by the speed factor.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from custom_components.trmnl.const import DOMAIN
+
+from .bench import _format
+from .harness import Harness, ScenarioResult, async_create_harness
+
+# Service data keys that name a device, by service
+DEVICE_KEYS = {
+    "send_dashboard_to_device": "device_friendly_id",
+    "refresh_device": "device",
+}
+
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    """Return the recorded calls ordered by offset."""
+    with open(path, encoding="utf-8") as file:
+        recording = json.load(file)
+    return sorted(recording["calls"], key=lambda call: call["offset"])
+
+
+def recorded_devices(calls: List[Dict[str, Any]]) -> List[str]:
+    """Return the devices named by the calls, in order of first appearance."""
+    devices: Dict[str, None] = {}
+    for call in calls:
+        key = DEVICE_KEYS.get(call["service"])
+        if key and call["data"].get(key):
+            devices.setdefault(call["data"][key], None)
+    return list(devices)
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _ms_summary(values: List[float]) -> Dict[str, Optional[float]]:
+    """Return p50, p95 and max of durations in seconds, as milliseconds."""
+    if not values:
+        return {"p50_ms": None, "p95_ms": None, "max_ms": None}
+    return {
+        "p50_ms": round(statistics.median(values) * 1000, 1),
+        "p95_ms": round(_percentile(values, 0.95) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1),
+    }
+
+
+async def replay(harness: Harness, calls: List[Dict[str, Any]], speed: float) -> ScenarioResult:
+    """Play the calls at the recorded pace divided by speed."""
+    mapping = dict(zip(recorded_devices(calls), harness.device_ids))
+    lags: List[float] = []
+    latencies: List[float] = []
+    failures = 0
+
+    def prepare(call: Dict[str, Any]) -> Dict[str, Any]:
+        data = dict(call["data"])
+        key = DEVICE_KEYS.get(call["service"])
+        if key and data.get(key) in mapping:
+            data[key] = mapping[data[key]]
+        if call["service"] == "send_dashboard_to_device":
+            data["screenshot_service_url"] = harness.screenshot.base_url
+        return data
+
+    async def fire(call: Dict[str, Any], due: float) -> None:
+        nonlocal failures
+        started = time.monotonic()
+        lags.append(started - due)
+        try:
+            await harness.hass.services.async_call(
+                DOMAIN, call["service"], prepare(call), blocking=True
+            )
+        except Exception:  # noqa: BLE001 - counted, not fatal
+            failures += 1
+        latencies.append(time.monotonic() - due)
+
+    async def run() -> int:
+        start = time.monotonic()
+        tasks = []
+        for call in calls:
+            due = start + call["offset"] / speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Calls overlap as they did when recorded; nothing waits for the previous one
+            tasks.append(asyncio.create_task(fire(call, due)))
+        await asyncio.gather(*tasks)
+        return failures
+
+    result = await harness.measure(f"replay {len(calls)} calls at {speed:g}x", len(calls), run)
+    screenshot = harness.screenshot
+    result.extra = {
+        "speed": speed,
+        "devices_mapped": len(mapping),
+        "schedule_lag": _ms_summary(lags),
+        "call_latency": _ms_summary(latencies),
+        "render_queue_delay": _ms_summary(screenshot.queue_delays),
+        "peak_render_concurrency": screenshot.peak_rendering,
+    }
+    return result
+
+
+def _format_replay(result: ScenarioResult) -> str:
+    extra = result.extra
+    lines = [_format(result)]
+    lines.append(f"   devices mapped    {extra['devices_mapped']}")
+    for label, key in (
+        ("schedule lag", "schedule_lag"),
+        ("call latency", "call_latency"),
+        ("render queue", "render_queue_delay"),
+    ):
+        stats = extra[key]
+        lines.append(
+            f"   {label:<17} p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms, max {stats['max_ms']} ms"
+        )
+    lines.append(f"   renders at once   {extra['peak_render_concurrency']}")
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", help="JSON file written by trmnl.stop_call_recording")
+    parser.add_argument(
+        "--speed", type=float, action="append",
+        help="replay speed factor (repeatable, default: 1, 10 and 100)",
+    )
+    parser.add_argument("--servers", type=int, default=1, help="number of Terminus servers")
+    parser.add_argument("--latency", type=float, default=0.0, help="Terminus response delay in seconds")
+    parser.add_argument("--render-latency", type=float, default=1.0, help="screenshot render time in seconds")
+    parser.add_argument("--render-workers", type=int, default=4, help="renders the screenshot stand-in runs at once")
+    parser.add_argument("--image-bytes", type=int, default=48_000, help="decoded screenshot size")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser
+
+
+async def async_main(args: argparse.Namespace) -> List[ScenarioResult]:
+    """Replay the recording once per speed, each on a fresh harness."""
+    calls = load_recording(args.recording)
+    devices = max(1, -(-len(recorded_devices(calls)) // args.servers))
+    results = []
+    for speed in args.speed or [1, 10, 100]:
+        harness = await async_create_harness(
+            devices=devices,
+            servers=args.servers,
+            latency=args.latency,
+            render_latency=args.render_latency,
+            image_bytes=args.image_bytes,
+            render_workers=args.render_workers,
+        )
+        try:
+            results.append(await replay(harness, calls, speed))
+        finally:
+            await harness.async_stop()
+    return results
+
+
+def main() -> None:
+    """Run from the command line and print the results."""
+    args = build_parser().parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("custom_components.trmnl").setLevel(logging.ERROR)
+    results = asyncio.run(async_main(args))
+    if args.json:
+        print(json.dumps([result.as_dict() for result in results], indent=2))
+    else:
+        print("\n\n".join(_format_replay(result) for result in results))
+
+
+if __name__ == "__main__":
+    main()
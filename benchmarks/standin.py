@@ -0,0 +1,279 @@
+"""Local stand-ins for a Terminus server and the screenshot service.
+
+Both servers keep everything in memory, count requests per route and can
+delay every response by a fixed latency, so benchmarks measure the
+integration rather than the network or a real renderer.
+"""
+import abc
+import asyncio
+import base64
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+
+def make_device(index: int) -> Dict[str, Any]:
+    """Return a Terminus-shaped device record."""
+    return {
+        "id": index + 1,
+        "model_id": 1,
+        "playlist_id": None,
+        "friendly_id": f"BENCH{index:05d}",
+        "label": f"Bench Panel {index}",
+        "mac_address": "AA:BB:CC:{:02X}:{:02X}:{:02X}".format(
+            (index >> 16) & 0xFF, (index >> 8) & 0xFF, index & 0xFF
+        ),
+        "api_key": f"key-{index}",
+        "firmware_version": "1.5.2",
+        "battery": 3.9,
+        "wifi": -60,
+        "width": 800,
+        "height": 480,
+        "refresh_rate": 900,
+        "image_timeout": 0,
+        "firmware_update": False,
+        "sleep_start_at": None,
+        "sleep_stop_at": None,
+        "updated_at": "2025-01-01T00:00:00Z",
+    }
+
+
+class _StandIn(abc.ABC):
+    """Shared lifecycle, latency injection and request counting."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """Initialize the stand-in; it listens on a free port once started."""
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.host = "127.0.0.1"
+        self.port = 0
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        route = request.match_info.route.resource
+        name = route.canonical if route is not None else request.path
+        self.requests[f"{request.method} {name}"] += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    @abc.abstractmethod
+    def _build_app(self) -> web.Application:
+        """Return the application with the stand-in's routes."""
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL the stand-in listens on."""
+        return f"http://{self.host}:{self.port}"
+
+    def reset_counters(self) -> None:
+        """Clear request counts and peaks before a scenario."""
+        self.requests.clear()
+        self.peak_in_flight = self.in_flight
+
+    async def start(self) -> str:
+        """Serve on a free local port and return the base URL."""
+        app = self._build_app()
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+class TerminusStandIn(_StandIn):
+    """In-memory Terminus API."""
+
+    def __init__(self, devices: int = 10, latency: float = 0.0, models: int = 3) -> None:
+        """Initialize the server with generated devices and models."""
+        super().__init__(latency)
+        self.devices: List[Dict[str, Any]] = [make_device(i) for i in range(devices)]
+        self.models = [
+            {"id": i + 1, "name": f"model_{i + 1}", "label": f"Model {i + 1}", "width": 800, "height": 480}
+            for i in range(models)
+        ]
+        self.screens: Dict[int, Dict[str, Any]] = {}
+        self.logs: List[Dict[str, Any]] = []
+        self._next_screen_id = 1
+
+    def _device(self, device_id: str) -> Optional[Dict[str, Any]]:
+        for device in self.devices:
+            if str(device["id"]) == device_id:
+                return device
+        return None
+
+    def _build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware], client_max_size=64 * 1024 * 1024)
+        app.router.add_get("/", self._index)
+        app.router.add_get("/api/devices", self._list_devices)
+        app.router.add_post("/api/devices", self._create_device)
+        app.router.add_get("/api/devices/{id}", self._get_device)
+        app.router.add_patch("/api/devices/{id}", self._patch_device)
+        app.router.add_delete("/api/devices/{id}", self._delete_device)
+        app.router.add_get("/api/screens", self._list_screens)
+        app.router.add_post("/api/screens", self._create_screen)
+        app.router.add_get("/api/screens/{id}", self._get_screen)
+        app.router.add_patch("/api/screens/{id}", self._patch_screen)
+        app.router.add_delete("/api/screens/{id}", self._delete_screen)
+        app.router.add_get("/api/models", self._list_models)
+        app.router.add_get("/api/models/{id}", self._get_model)
+        app.router.add_get("/api/display", self._display)
+        app.router.add_post("/api/log", self._log)
+        return app
+
+    async def _index(self, request: web.Request) -> web.Response:
+        return web.Response(text="<html><body>Terminus stand-in</body></html>", content_type="text/html")
+
+    async def _list_devices(self, request: web.Request) -> web.Response:
+        return web.json_response({"data": self.devices})
+
+    async def _create_device(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        device = make_device(len(self.devices))
+        device.update(body.get("device", {}))
+        device["id"] = max((d["id"] for d in self.devices), default=0) + 1
+        self.devices.append(device)
+        return web.json_response({"data": device}, status=201)
+
+    async def _get_device(self, request: web.Request) -> web.Response:
+        device = self._device(request.match_info["id"])
+        if device is None:
+            raise web.HTTPNotFound()
+        return web.json_response({"data": device})
+
+    async def _patch_device(self, request: web.Request) -> web.Response:
+        device = self._device(request.match_info["id"])
+        if device is None:
+            raise web.HTTPNotFound()
+        body = await request.json()
+        device.update(body.get("device", {}))
+        return web.json_response({"data": device})
+
+    async def _delete_device(self, request: web.Request) -> web.Response:
+        device = self._device(request.match_info["id"])
+        if device is None:
+            raise web.HTTPNotFound()
+        self.devices.remove(device)
+        return web.Response(status=204)
+
+    async def _list_screens(self, request: web.Request) -> web.Response:
+        return web.json_response({"data": list(self.screens.values())})
+
+    async def _create_screen(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        screen = dict(body.get("image", {}))
+        screen["id"] = self._next_screen_id
+        self._next_screen_id += 1
+        self.screens[screen["id"]] = screen
+        return web.json_response({"data": {k: v for k, v in screen.items() if k != "image"}}, status=201)
+
+    async def _get_screen(self, request: web.Request) -> web.Response:
+        screen = self.screens.get(int(request.match_info["id"]))
+        if screen is None:
+            raise web.HTTPNotFound()
+        return web.json_response({"data": {k: v for k, v in screen.items() if k != "image"}})
+
+    async def _patch_screen(self, request: web.Request) -> web.Response:
+        screen = self.screens.get(int(request.match_info["id"]))
+        if screen is None:
+            raise web.HTTPNotFound()
+        body = await request.json()
+        screen.update(body.get("image", {}))
+        return web.json_response({"data": {"id": screen["id"]}})
+
+    async def _delete_screen(self, request: web.Request) -> web.Response:
+        if self.screens.pop(int(request.match_info["id"]), None) is None:
+            raise web.HTTPNotFound()
+        return web.Response(status=204)
+
+    async def _list_models(self, request: web.Request) -> web.Response:
+        return web.json_response({"data": self.models})
+
+    async def _get_model(self, request: web.Request) -> web.Response:
+        for model in self.models:
+            if str(model["id"]) == request.match_info["id"]:
+                return web.json_response({"data": model})
+        raise web.HTTPNotFound()
+
+    async def _display(self, request: web.Request) -> web.Response:
+        mac = request.headers.get("ID")
+        for device in self.devices:
+            if device["mac_address"] == mac:
+                screen_id = device.get("current_screen_id") or 0
+                return web.json_response({
+                    "filename": f"screen-{screen_id}.png",
+                    "image_url": f"{self.base_url}/assets/screen-{screen_id}.png",
+                    "refresh_rate": device["refresh_rate"],
+                    "update_firmware": device["firmware_update"],
+                })
+        raise web.HTTPNotFound()
+
+    async def _log(self, request: web.Request) -> web.Response:
+        self.logs.append(await request.json())
+        return web.Response(status=204)
+
+
+class ScreenshotStandIn(_StandIn):
+    """Screenshot service that returns a fixed-size base64 image after a render delay.
+
+    With ``workers`` set, only that many renders run at once and the rest wait,
+    like a real headless-browser pool; the wait of each request is recorded.
+    """
+
+    def __init__(self, latency: float = 0.0, image_bytes: int = 48_000, workers: Optional[int] = None) -> None:
+        """Initialize the service with a random image of the given decoded size."""
+        super().__init__()
+        self.render_latency = latency
+        self.image = base64.b64encode(os.urandom(image_bytes)).decode()
+        self.renders = 0
+        self.rendering = 0
+        self.peak_rendering = 0
+        self.queue_delays: List[float] = []
+        self._workers = asyncio.Semaphore(workers) if workers else None
+
+    def reset_counters(self) -> None:
+        """Clear request counts, render peaks and queue delays."""
+        super().reset_counters()
+        self.peak_rendering = self.rendering
+        self.queue_delays.clear()
+
+    def _build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/screenshot", self._screenshot)
+        return app
+
+    async def _screenshot(self, request: web.Request) -> web.Response:
+        await request.json()
+        queued = time.monotonic()
+        if self._workers is not None:
+            await self._workers.acquire()
+        self.queue_delays.append(time.monotonic() - queued)
+        self.rendering += 1
+        self.peak_rendering = max(self.peak_rendering, self.rendering)
+        try:
+            if self.render_latency:
+                await asyncio.sleep(self.render_latency)
+        finally:
+            self.rendering -= 1
+            if self._workers is not None:
+                self._workers.release()
+        self.renders += 1
+        return web.json_response({"success": True, "image": self.image})
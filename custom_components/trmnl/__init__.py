@@ -1,26 +1,28 @@
 """TRMNL integration for Home Assistant."""
 import logging
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 
-<<<<<<< HEAD
-from .const import DOMAIN, PLATFORMS, CONF_HOST, CONF_PORT, SERVICE_UPDATE_SCREEN, SERVICE_REFRESH_DEVICE
-from .api import TRMNLApi
-=======
-from .api import TRMNLApiClient
-from . import services
 from .const import (
     DOMAIN,
-    CONF_API_TOKEN,
-    CONF_DEVICE_ID,
-    CONF_BASE_URL,
-    DEFAULT_SCAN_INTERVAL,
-    SERVICE_REFRESH_DISPLAY,
-    SERVICE_UPDATE_PLUGIN,
-    SERVICE_SEND_NOTIFICATION,
+    PLATFORMS,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_ADAPTIVE_REFRESH,
+    CONF_MIN_REFRESH_RATE,
+    CONF_MAX_REFRESH_RATE,
+    DEFAULT_MIN_REFRESH_RATE,
+    DEFAULT_MAX_REFRESH_RATE,
+    STORAGE_VERSION,
 )
->>>>>>> 4a87724 (TRMNL Home Assistant Integration v3.8.0 with external screenshot service support)
+from .api import TRMNLApi
+from .coordinator import TRMNLDataUpdateCoordinator
+from .refresh_controller import AdaptiveRefreshController
+from .router import TRMNLRouter
+from .write_queue import WriteBehindQueue
+from . import services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,123 +34,119 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up TRMNL from a config entry."""
-<<<<<<< HEAD
     host = entry.data[CONF_HOST]
     port = entry.data.get(CONF_PORT, 2300)
-    
+
     _LOGGER.info("Setting up TRMNL: %s:%s", host, port)
-    
+
     api = TRMNLApi(host, port)
-    
-    # Test connection and discover devices
-    try:
-        if not await api.test_connection():
-            _LOGGER.error("Cannot connect to TRMNL server")
+    coordinator = TRMNLDataUpdateCoordinator(hass, api, entry.entry_id)
+
+    restored = await coordinator.async_restore_snapshot()
+    if restored:
+        # Create entities from the last-known devices and catch up with the
+        # live server once the platforms are listening for new devices
+        _LOGGER.info("Restored %d TRMNL devices from snapshot, reconciling with %s:%s in background",
+                     len(coordinator.data), host, port)
+    else:
+        # First start: nothing cached, so devices must come from the server
+        try:
+            if not await api.test_connection():
+                _LOGGER.error("Cannot connect to TRMNL server")
+                await api.close()
+                return False
+
+            coordinator.models = await api.get_models()
+            await coordinator.async_config_entry_first_refresh()
+
+        except Exception as e:
+            _LOGGER.error("Failed to setup TRMNL connection: %s", e)
+            await api.close()
             return False
-            
-        devices = await api.get_devices()
-        _LOGGER.info("Found %d TRMNL devices", len(devices))
-        
-        # Log device details
-        for device in devices:
-            _LOGGER.info("Device: %s (%s) - Battery: %sV, WiFi: %s dBm", 
-                        device.get('friendly_id'), device.get('label'), 
-                        device.get('battery'), device.get('wifi'))
-        
-    except Exception as e:
-        _LOGGER.error("Failed to setup TRMNL connection: %s", e)
-        return False
-    
+
+    devices = list(coordinator.data.values())
+    for device in devices:
+        _LOGGER.debug("Device: %s (%s) - Battery: %sV, WiFi: %s dBm",
+                      device.get('friendly_id'), device.get('label'),
+                      device.get('battery'), device.get('wifi'))
+
+    # Mutations made while the server is down are kept and replayed later
+    write_queue = WriteBehindQueue(hass, api, entry.entry_id)
+    await write_queue.async_load()
+    write_queue.async_start()
+
     # Store data
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
+    entry_data = hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
+        "coordinator": coordinator,
         "host": host,
         "port": port,
         "devices": devices,
+        "write_queue": write_queue,
     }
-    
-=======
-    api_token = entry.data[CONF_API_TOKEN]
-    device_id = entry.data[CONF_DEVICE_ID]
-    base_url = entry.data.get(CONF_BASE_URL)
 
-    session = async_get_clientsession(hass)
-    api_client = TRMNLApiClient(session, api_token, base_url, device_id)
+    if entry.options.get(CONF_ADAPTIVE_REFRESH):
+        controller = AdaptiveRefreshController(
+            hass,
+            coordinator,
+            entry.options.get(CONF_MIN_REFRESH_RATE, DEFAULT_MIN_REFRESH_RATE),
+            entry.options.get(CONF_MAX_REFRESH_RATE, DEFAULT_MAX_REFRESH_RATE),
+        )
+        controller.async_start()
+        entry.async_on_unload(controller.async_stop)
+        entry_data["refresh_controller"] = controller
 
-    coordinator = TRMNLDataUpdateCoordinator(hass, api_client, device_id)
-    await coordinator.async_config_entry_first_refresh()
+    # One router per integration maps devices to servers and staggers polls
+    if "router" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["router"] = TRMNLRouter(hass)
+    hass.data[DOMAIN]["router"].async_register(entry.entry_id, entry_data)
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
-    hass.data.setdefault(DOMAIN, {})["api"] = api_client  # Make API available to services
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    
-    # Setup dashboard capture services
+    # Setup services shared by all servers
     await services.async_setup_services(hass)
 
->>>>>>> 4a87724 (TRMNL Home Assistant Integration v3.8.0 with external screenshot service support)
-    # Register services
-    await _register_services(hass, entry)
-    
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    
+
+    if restored:
+        # Devices found by the reconcile must reach the platforms' device listeners
+        entry.async_create_background_task(
+            hass, coordinator.async_reconcile(), f"{DOMAIN} reconcile {host}:{port}"
+        )
+
     _LOGGER.info("TRMNL setup complete - managing %d devices", len(devices))
     return True
 
 
-async def _register_services(hass: HomeAssistant, entry: ConfigEntry):
-    """Register TRMNL services."""
-    
-    async def update_screen_service(call: ServiceCall):
-        """Handle update screen service call."""
-        device_id = call.data.get("device")
-        screen_id = call.data.get("screen_id")
-        
-        _LOGGER.info("Update screen service called: device=%s, screen=%s", device_id, screen_id)
-        
-        # Find the API instance for this device
-        api = hass.data[DOMAIN][entry.entry_id]["api"]
-        
-        # For now, just log the request since screen updates are complex
-        _LOGGER.info("Screen update requested but not yet implemented")
-        
-    async def refresh_device_service(call: ServiceCall):
-        """Handle refresh device service call."""
-        device_id = call.data.get("device")
-        
-        _LOGGER.info("Refresh device service called: device=%s", device_id)
-        
-        api = hass.data[DOMAIN][entry.entry_id]["api"]
-        
-        try:
-            success = await api.refresh_device(device_id)
-            if success:
-                _LOGGER.info("Successfully refreshed device %s", device_id)
-            else:
-                _LOGGER.error("Failed to refresh device %s", device_id)
-        except Exception as e:
-            _LOGGER.error("Error refreshing device %s: %s", device_id, e)
-    
-    # Register services
-    hass.services.async_register(DOMAIN, SERVICE_UPDATE_SCREEN, update_screen_service)
-    hass.services.async_register(DOMAIN, SERVICE_REFRESH_DEVICE, refresh_device_service)
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    # Remove services
-    hass.services.async_remove(DOMAIN, SERVICE_UPDATE_SCREEN)
-    hass.services.async_remove(DOMAIN, SERVICE_REFRESH_DEVICE)
-    
-    # Unload platforms
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    
+
     if unload_ok:
+        router = hass.data[DOMAIN]["router"]
+        router.async_unregister(entry.entry_id)
+
         # Close API session
         entry_data = hass.data[DOMAIN].pop(entry.entry_id)
-        if "api" in entry_data:
-            await entry_data["api"].close()
-        
-    return unload_ok
\ No newline at end of file
+        await entry_data["write_queue"].async_stop()
+        entry_data["coordinator"].async_stop()
+        await entry_data["api"].close()
+
+        if not router.entries:
+            await services.async_unload_services(hass)
+            hass.data[DOMAIN].pop("router").async_shutdown()
+
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the device snapshot and write queue of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.write_queue").async_remove()
@@ -1,9 +1,15 @@
 """API client for TRMNL Terminus server."""
 import asyncio
+import json
 import logging
-from typing import Dict, List, Optional
+import time
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 import aiohttp
 
+from .const import HEALTH_CHECK_CACHE_TTL, HEALTH_CHECK_TIMEOUT, PATCH_COALESCE_WINDOW
+from .health import ServerHealth, parse_capabilities, parse_version
+from .metrics import RequestMetrics
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -16,6 +22,25 @@ class TRMNLApi:
         self.port = port
         self.base_url = f"http://{host}:{port}"
         self.session = None
+        self.metrics = RequestMetrics()
+        # False once a request gets no response at all; any response resets it
+        self.reachable = True
+        # WriteBehindQueue that takes mutations while the server is unreachable
+        self.write_queue = None
+        # LogPipeline that batches device log posts
+        self.log_pipeline = None
+        # Numeric Terminus IDs by friendly_id and by str(id), from the last device fetch
+        self._numeric_ids: Dict[str, int] = {}
+        # Pending coalesced PATCH per device: merged fields and the shared result
+        self._patch_batches: Dict[str, Tuple[Dict, asyncio.Future]] = {}
+        self._flush_tasks: Set[asyncio.Task] = set()
+        # Features the server advertised or that requests have shown to work,
+        # e.g. the index of the screen assignment method Terminus accepts
+        self.capabilities: Dict[str, Any] = {}
+        # Screen each device was last pointed at through assign_screen
+        self.assigned_screens: Dict[str, Any] = {}
+        self._health: Optional[ServerHealth] = None
+        self._health_lock = asyncio.Lock()
         
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
@@ -30,63 +55,81 @@ class TRMNLApi:
         if self.session and not self.session.closed:
             await self.session.close()
 
-    async def _make_request(self, endpoint: str, method: str = "GET", data: dict = None) -> Optional[Dict]:
+    async def _make_request(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        data: dict = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Optional[Dict]:
         """Make an async HTTP request to the API."""
+        _, result = await self._request(endpoint, method, data, headers)
+        return result
+
+    async def _request(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        data: dict = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Optional[int], Optional[Dict]]:
+        """Make a request and return the HTTP status (None if no response) and result."""
+        method = method.upper()
+        url = f"{self.base_url}{endpoint}"
+        if method not in ("GET", "POST", "PATCH", "DELETE"):
+            _LOGGER.error("Unsupported HTTP method: %s", method)
+            return None, None
+
+        payload = json.dumps(data).encode() if data is not None else None
+        status = None
+        bytes_in = 0
+        start = time.monotonic()
         try:
-            url = f"{self.base_url}{endpoint}"
             _LOGGER.debug("Making request to: %s", url)
             
             session = await self._get_session()
-            
-            if method.upper() == "GET":
-                async with session.get(url) as response:
-                    return await self._handle_response(response, url)
-<<<<<<< HEAD
-            elif method.upper() == "PATCH" and data:
-                async with session.patch(url, json=data) as response:
-                    return await self._handle_response(response, url)
-=======
-            elif method.upper() == "POST":
-                async with session.post(url, json=data) as response:
-                    return await self._handle_response(response, url)
-            elif method.upper() == "PATCH":
-                async with session.patch(url, json=data) as response:
-                    return await self._handle_response(response, url)
-            elif method.upper() == "DELETE":
-                async with session.delete(url) as response:
-                    return await self._handle_response(response, url)
->>>>>>> 4a87724 (TRMNL Home Assistant Integration v3.8.0 with external screenshot service support)
-            else:
-                _LOGGER.error("Unsupported HTTP method: %s", method)
-                return None
+            request_headers = dict(headers or {})
+            if payload is not None:
+                request_headers["Content-Type"] = "application/json"
+            
+            async with session.request(method, url, data=payload, headers=request_headers) as response:
+                status = response.status
+                body = await response.read()
+                bytes_in = len(body)
+                return status, self._handle_response(status, body, url)
                 
         except aiohttp.ClientError as e:
             _LOGGER.error("HTTP client error requesting %s: %s", url, e)
-            return None
+            return status, None
         except Exception as e:
             _LOGGER.error("Unexpected error requesting %s: %s", url, e, exc_info=True)
-            return None
+            return status, None
+        finally:
+            self.reachable = status is not None
+            self.metrics.record(
+                method,
+                endpoint,
+                status,
+                time.monotonic() - start,
+                bytes_in,
+                len(payload) if payload is not None else 0,
+            )
             
-    async def _handle_response(self, response, url: str) -> Optional[Dict]:
+    def _handle_response(self, status: int, body: bytes, url: str) -> Optional[Dict]:
         """Handle HTTP response."""
-<<<<<<< HEAD
-        if response.status == 200:
-            try:
-=======
-        if response.status in [200, 201, 204]:
+        if status in [200, 201, 204]:
             try:
                 # Handle empty responses for DELETE operations
-                if response.status == 204:
+                if status == 204:
                     return {"status": "ok"}
->>>>>>> 4a87724 (TRMNL Home Assistant Integration v3.8.0 with external screenshot service support)
-                data = await response.json()
+                data = json.loads(body)
                 _LOGGER.debug("Request successful to %s", url)
                 return data
             except Exception:
                 _LOGGER.debug("Response is not JSON from %s", url)
                 return {"status": "ok", "content_type": "text"}
         else:
-            _LOGGER.warning("HTTP %s from %s", response.status, url)
+            _LOGGER.warning("HTTP %s from %s", status, url)
             return None
             
     async def get_devices(self) -> List[Dict]:
@@ -96,14 +139,14 @@ class TRMNLApi:
         
         if result and "data" in result:
             devices = result["data"]
-            _LOGGER.info("Found %d TRMNL devices", len(devices))
-<<<<<<< HEAD
-=======
-            # Log each device's available fields for model detection debugging
-            for i, device in enumerate(devices):
-                _LOGGER.info("Device %d available fields: %s", i, list(device.keys()))
-                _LOGGER.info("Device %d full data: %s", i, device)
->>>>>>> 4a87724 (TRMNL Home Assistant Integration v3.8.0 with external screenshot service support)
+            _LOGGER.debug("Found %d TRMNL devices", len(devices))
+            self._numeric_ids = {}
+            for device in devices:
+                if device.get('id') is None:
+                    continue
+                self._numeric_ids[str(device['id'])] = device['id']
+                if device.get('friendly_id'):
+                    self._numeric_ids[device['friendly_id']] = device['id']
             return devices
         else:
             _LOGGER.error("No devices found or API error")
@@ -122,8 +165,6 @@ class TRMNLApi:
             _LOGGER.error("No screens found or API error")
             return []
             
-<<<<<<< HEAD
-=======
     async def get_models(self) -> Dict[str, str]:
         """Get all models from Terminus and return as ID->name mapping."""
         _LOGGER.debug("Fetching models from %s", self.base_url)
@@ -139,49 +180,70 @@ class TRMNLApi:
                 model_name = model.get('label', model.get('description', model.get('name', f'Model {model_id}')))
                 if model_id:
                     models_map[model_id] = model_name
-                    _LOGGER.info("Model mapping: ID %s -> Name '%s'", model_id, model_name)
+                    _LOGGER.debug("Model mapping: ID %s -> Name '%s'", model_id, model_name)
         else:
             _LOGGER.warning("No models found or API error")
             
         return models_map
             
->>>>>>> 4a87724 (TRMNL Home Assistant Integration v3.8.0 with external screenshot service support)
     async def test_connection(self) -> bool:
         """Test connection to Terminus server."""
-        try:
-            _LOGGER.debug("Testing connection to %s:%s", self.host, self.port)
-            
-            # Try simple HTTP request first
-            result = await self._make_request("/")
-            if result is not None:
-                _LOGGER.info("HTTP connection successful to %s:%s", self.host, self.port)
-                return True
-            
-            # Fallback to TCP connection test
-            _LOGGER.debug("HTTP failed, trying TCP connection")
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(self.host, self.port), timeout=5
+        health = await self.health_check()
+        if health.ok:
+            _LOGGER.info("Connection successful to %s:%s (version %s)",
+                         self.host, self.port, health.version or "unknown")
+        else:
+            _LOGGER.warning("Connection failed to %s:%s", self.host, self.port)
+        return health.ok
+
+    async def health_check(self, max_age: float = HEALTH_CHECK_CACHE_TTL) -> ServerHealth:
+        """Check the server with a HEAD request, reusing a recent result.
+
+        Any HTTP status counts as healthy, so no page is rendered or parsed.
+        Concurrent callers share one request.
+        """
+        async with self._health_lock:
+            if self._health is not None and time.monotonic() - self._health.checked_at < max_age:
+                return self._health
+
+            status = None
+            headers: Mapping[str, str] = {}
+            start = time.monotonic()
+            try:
+                _LOGGER.debug("Checking health of %s", self.base_url)
+                session = await self._get_session()
+                async with session.head(
+                    f"{self.base_url}/",
+                    allow_redirects=False,
+                    timeout=aiohttp.ClientTimeout(total=HEALTH_CHECK_TIMEOUT),
+                ) as response:
+                    status = response.status
+                    # Keep the case-insensitive multidict for header lookups
+                    headers = response.headers
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                _LOGGER.debug("Health check of %s failed: %s", self.base_url, e)
+            except Exception as e:
+                _LOGGER.error("Unexpected error checking health of %s: %s", self.base_url, e, exc_info=True)
+            finally:
+                self.reachable = status is not None
+                self.metrics.record("HEAD", "/", status, time.monotonic() - start)
+
+            self.capabilities.update(parse_capabilities(headers))
+            self._health = ServerHealth(
+                ok=status is not None,
+                checked_at=time.monotonic(),
+                status=status,
+                latency_ms=round((time.monotonic() - start) * 1000, 1),
+                version=parse_version(headers),
+                capabilities=self.capabilities,
             )
-            writer.close()
-            await writer.wait_closed()
-            _LOGGER.info("TCP connection successful to %s:%s", self.host, self.port)
-            return True
-            
-        except Exception as e:
-            _LOGGER.warning("Connection failed to %s:%s - %s", self.host, self.port, e)
-            return False
+            return self._health
+
+    @property
+    def health(self) -> Optional[ServerHealth]:
+        """Return the last health check result without checking again."""
+        return self._health
 
-<<<<<<< HEAD
-    async def refresh_device(self, device_id: str) -> bool:
-        """Trigger a device refresh by updating its data."""
-        try:
-            _LOGGER.info("Refreshing device: %s", device_id)
-            
-            # Get all devices to find the target device
-            devices = await self.get_devices()
-            device_data = None
-            numeric_id = None
-=======
     # Device Management Methods
     async def create_device(self, device_data: Dict) -> Optional[Dict]:
         """Create a new device in Terminus."""
@@ -196,18 +258,68 @@ class TRMNLApi:
             _LOGGER.error("Error creating device: %s", e)
             return None
 
-    async def update_device(self, device_id: str, updates: Dict) -> bool:
-        """Update device configuration."""
+    async def update_device(self, device_id: str, updates: Dict, defer: bool = True) -> Optional[bool]:
+        """Update device configuration.
+
+        Returns True once the server applied the update and False if it failed.
+        With a write queue attached, updates that cannot reach the server are
+        queued and None is returned; defer=False bypasses the queue.
+        """
+        queue = self.write_queue if defer else None
+        if queue is not None and (not self.reachable or queue.has_pending_device(device_id)):
+            queue.enqueue_device(device_id, updates)
+            return None
+
+        if await self._update_device(device_id, updates):
+            return True
+
+        if queue is not None and not self.reachable:
+            queue.enqueue_device(device_id, updates)
+            return None
+        return False
+
+    async def _update_device(self, device_id: str, updates: Dict) -> bool:
+        """Merge the update into the device's pending PATCH and wait for its result.
+
+        Updates to the same device within PATCH_COALESCE_WINDOW are sent as a
+        single request; later values win for fields set more than once.
+        """
+        key = str(device_id)
+        batch = self._patch_batches.get(key)
+        if batch is None:
+            batch = self._patch_batches[key] = ({}, asyncio.get_running_loop().create_future())
+            task = asyncio.create_task(self._flush_device_update(key))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        batch[0].update(updates)
+        # Shield so one cancelled caller does not fail the others
+        return await asyncio.shield(batch[1])
+
+    async def _flush_device_update(self, device_id: str) -> None:
+        """Send the coalesced update for a device once the window closes."""
+        await asyncio.sleep(PATCH_COALESCE_WINDOW)
+        updates, future = self._patch_batches.pop(device_id)
+        try:
+            result = await self._send_device_update(device_id, updates)
+        except Exception as e:
+            _LOGGER.error("Error updating device %s: %s", device_id, e)
+            result = False
+        if not future.done():
+            future.set_result(result)
+
+    async def _resolve_device_id(self, device_id: str, refresh: bool = False) -> Optional[int]:
+        """Return the numeric ID of a device, fetching the device list if unknown."""
+        if refresh or str(device_id) not in self._numeric_ids:
+            await self.get_devices()
+        return self._numeric_ids.get(str(device_id))
+
+    async def _send_device_update(self, device_id: str, updates: Dict) -> bool:
+        """Send a device update to the server."""
         try:
             _LOGGER.info("Updating device %s with: %s", device_id, updates)
             
-            devices = await self.get_devices()
-            numeric_id = None
-            
-            for device in devices:
-                if device.get('friendly_id') == device_id or str(device.get('id')) == str(device_id):
-                    numeric_id = device.get('id')
-                    break
+            cached = str(device_id) in self._numeric_ids
+            numeric_id = await self._resolve_device_id(device_id)
             
             if not numeric_id:
                 _LOGGER.error("Device %s not found", device_id)
@@ -215,6 +327,12 @@ class TRMNLApi:
             
             result = await self._make_request(f"/api/devices/{numeric_id}", method="PATCH", data={"device": updates})
             
+            if not result and cached and self.reachable:
+                # The cached ID may be stale if the device was re-created
+                fresh_id = await self._resolve_device_id(device_id, refresh=True)
+                if fresh_id and fresh_id != numeric_id:
+                    result = await self._make_request(f"/api/devices/{fresh_id}", method="PATCH", data={"device": updates})
+            
             if result:
                 _LOGGER.info("Successfully updated device %s", device_id)
                 return True
@@ -224,6 +342,47 @@ class TRMNLApi:
             _LOGGER.error("Error updating device %s: %s", device_id, e)
             return False
 
+    async def update_devices(self, updates: Dict[str, Dict], concurrency: int = 4) -> Dict[str, bool]:
+        """Update several devices, resolving their IDs from the last device fetch.
+
+        The device list is fetched only if a device is not cached yet, and
+        once more if PATCHes to cached IDs fail, in case devices were re-created.
+        """
+        if any(str(device_id) not in self._numeric_ids for device_id in updates):
+            await self.get_devices()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _patch(device_id: str, device_updates: Dict, numeric_id: Optional[int]) -> bool:
+            if not numeric_id:
+                _LOGGER.error("Device %s not found", device_id)
+                return False
+            async with semaphore:
+                result = await self._make_request(
+                    f"/api/devices/{numeric_id}", method="PATCH", data={"device": device_updates}
+                )
+            return bool(result)
+
+        async def _patch_all(device_ids: List[str], numeric_ids: Dict[str, int]) -> Dict[str, bool]:
+            results = await asyncio.gather(*(
+                _patch(device_id, updates[device_id], numeric_ids.get(str(device_id)))
+                for device_id in device_ids
+            ))
+            return dict(zip(device_ids, results))
+
+        cached = dict(self._numeric_ids)
+        results = await _patch_all(list(updates), cached)
+
+        failed = [device_id for device_id, ok in results.items() if not ok and str(device_id) in cached]
+        if failed and self.reachable:
+            await self.get_devices()
+            stale = [
+                device_id for device_id in failed
+                if self._numeric_ids.get(str(device_id)) not in (None, cached[str(device_id)])
+            ]
+            if stale:
+                results.update(await _patch_all(stale, self._numeric_ids))
+        return results
+
     async def delete_device(self, device_id: str) -> bool:
         """Delete a device from Terminus."""
         try:
@@ -268,89 +427,64 @@ class TRMNLApi:
             _LOGGER.error("Error getting device %s: %s", device_id, e)
             return None
 
-    async def set_device_sleep_schedule(self, device_id: str, sleep_start: str, sleep_stop: str) -> bool:
+    async def set_device_sleep_schedule(self, device_id: str, sleep_start: str, sleep_stop: str) -> Optional[bool]:
         """Set device sleep schedule (format: HH:MM)."""
         return await self.update_device(device_id, {
             "sleep_start_at": sleep_start,
             "sleep_stop_at": sleep_stop
         })
 
-    async def set_device_refresh_rate(self, device_id: str, refresh_rate: int) -> bool:
+    async def set_device_refresh_rate(self, device_id: str, refresh_rate: int) -> Optional[bool]:
         """Set device refresh rate in seconds."""
         return await self.update_device(device_id, {"refresh_rate": refresh_rate})
 
-    async def set_device_image_timeout(self, device_id: str, timeout: int) -> bool:
+    async def set_device_image_timeout(self, device_id: str, timeout: int) -> Optional[bool]:
         """Set device image timeout in seconds."""
         return await self.update_device(device_id, {"image_timeout": timeout})
 
-    async def enable_firmware_update(self, device_id: str, enable: bool = True) -> bool:
+    async def enable_firmware_update(self, device_id: str, enable: bool = True) -> Optional[bool]:
         """Enable or disable firmware updates for device."""
         return await self.update_device(device_id, {"firmware_update": enable})
 
     async def refresh_device(self, device_id: str) -> bool:
         """Trigger a device refresh by simulating what Terminus web UI does."""
         try:
-            _LOGGER.error("REFRESH DEBUG: Starting refresh for device %s", device_id)
+            _LOGGER.debug("REFRESH DEBUG: Starting refresh for device %s", device_id)
             
             # Find the device data  
             devices = await self.get_devices()
             device_data = None
             numeric_id = None
             mac_address = None
->>>>>>> 4a87724 (TRMNL Home Assistant Integration v3.8.0 with external screenshot service support)
             
             for device in devices:
                 if device.get('friendly_id') == device_id or str(device.get('id')) == str(device_id):
                     device_data = device.copy()
                     numeric_id = device.get('id')
-<<<<<<< HEAD
-                    break
-            
-            if not device_data or not numeric_id:
-                _LOGGER.error("Device %s not found", device_id)
-                return False
-            
-            # Update device with same data to trigger refresh
-            url = f"/api/devices/{numeric_id}"
-            payload = {"device": device_data}
-            
-            result = await self._make_request(url, method="PATCH", data=payload)
-            
-            if result:
-                _LOGGER.info("Successfully refreshed device %s", device_id)
-                return True
-            else:
-                _LOGGER.error("Failed to refresh device %s", device_id)
-                return False
-                
-        except Exception as e:
-            _LOGGER.error("Error refreshing device %s: %s", device_id, e)
-            return False
-=======
                     mac_address = device.get('mac_address')
                     break
             
             if not device_data or not numeric_id:
-                _LOGGER.error("REFRESH DEBUG: Device %s not found", device_id)
+                _LOGGER.error("Device %s not found", device_id)
                 return False
                 
-            _LOGGER.error("REFRESH DEBUG: Found device %s (ID: %s, MAC: %s)", device_id, numeric_id, mac_address)
+            _LOGGER.debug("REFRESH DEBUG: Found device %s (ID: %s, MAC: %s)", device_id, numeric_id, mac_address)
             
             # Method 1: Pre-generate display content by calling display API
             # This forces the server to prepare the latest content for this device
             display_result = await self.get_device_display(device_id)
             if display_result:
-                _LOGGER.error("REFRESH DEBUG: Pre-generated display content: %s", display_result)
+                _LOGGER.debug("REFRESH DEBUG: Pre-generated display content: %s", display_result)
             else:
-                _LOGGER.error("REFRESH DEBUG: Failed to pre-generate display content")
+                _LOGGER.debug("REFRESH DEBUG: Failed to pre-generate display content")
             
             # Method 2: Force refresh by temporarily setting very low refresh rate (10 seconds)
             original_refresh_rate = device_data.get('refresh_rate', 3600)
-            _LOGGER.error("REFRESH DEBUG: Original refresh rate: %s", original_refresh_rate)
+            _LOGGER.debug("REFRESH DEBUG: Original refresh rate: %s", original_refresh_rate)
             
             # Set to 10 seconds to force almost immediate polling
             temp_rate = 10
-            _LOGGER.error("REFRESH DEBUG: Setting refresh rate to %s seconds", temp_rate)
+            _LOGGER.debug("REFRESH DEBUG: Setting refresh rate to %s seconds", temp_rate)
             
             fast_refresh_result = await self._make_request(
                 f"/api/devices/{numeric_id}", 
@@ -359,14 +493,14 @@ class TRMNLApi:
             )
             
             if fast_refresh_result:
-                _LOGGER.error("REFRESH DEBUG: Successfully set fast refresh rate. Device should poll in %s seconds", temp_rate)
+                _LOGGER.debug("REFRESH DEBUG: Successfully set fast refresh rate. Device should poll in %s seconds", temp_rate)
                 
                 # Wait longer to let device actually poll
                 import asyncio
                 await asyncio.sleep(5)  # Wait 5 seconds before restoring
                 
                 # Restore original rate
-                _LOGGER.error("REFRESH DEBUG: Restoring original refresh rate %s", original_refresh_rate)
+                _LOGGER.debug("REFRESH DEBUG: Restoring original refresh rate %s", original_refresh_rate)
                 restore_result = await self._make_request(
                     f"/api/devices/{numeric_id}", 
                     method="PATCH", 
@@ -374,10 +508,10 @@ class TRMNLApi:
                 )
                 
                 if restore_result:
-                    _LOGGER.error("REFRESH DEBUG: Successfully restored refresh rate")
+                    _LOGGER.debug("REFRESH DEBUG: Successfully restored refresh rate")
                     return True
                 else:
-                    _LOGGER.error("REFRESH DEBUG: Failed to restore refresh rate, trying again...")
+                    _LOGGER.debug("REFRESH DEBUG: Failed to restore refresh rate, trying again...")
                     await asyncio.sleep(1)
                     await self._make_request(
                         f"/api/devices/{numeric_id}", 
@@ -386,11 +520,11 @@ class TRMNLApi:
                     )
                     return True  # Consider it successful even if restore failed
             else:
-                _LOGGER.error("REFRESH DEBUG: Failed to set fast refresh rate")
+                _LOGGER.error("Failed to set fast refresh rate for device %s", device_id)
                 return False
                 
         except Exception as e:
-            _LOGGER.error("REFRESH DEBUG: Exception during refresh: %s", device_id, e)
+            _LOGGER.error("Exception during refresh of device %s: %s", device_id, e)
             return False
 
     # Screen Management Methods
@@ -420,6 +554,44 @@ class TRMNLApi:
             _LOGGER.error("Error updating screen %s: %s", screen_id, e)
             return False
 
+    async def assign_screen(
+        self, device_id: str, screen_id, label: str, first: Optional[int] = None
+    ) -> Tuple[bool, int]:
+        """Point a device at a screen, trying each field Terminus versions have used.
+
+        Methods are tried starting at index first, or at the method this server
+        last accepted, so usually a single PATCH is needed. Returns whether an
+        assignment succeeded and the index of the last method tried.
+        """
+        assignment_methods = [
+            {"current_screen_id": screen_id},
+            {"screen_id": screen_id}, 
+            {"active_screen": screen_id},
+            {"display_screen_id": screen_id},
+            {"label": label, "active_screen_id": screen_id}
+        ]
+        
+        if first is None:
+            first = self.capabilities.get("assignment", 0)
+        first = first if 0 <= first < len(assignment_methods) else 0
+        order = [first] + [i for i in range(len(assignment_methods)) if i != first]
+        for i in order:
+            try:
+                _LOGGER.info("Trying screen assignment method %d", i + 1)
+                # Sent directly: a queued attempt would prove nothing about the method
+                result = await self.update_device(device_id, assignment_methods[i], defer=False)
+                if result:
+                    _LOGGER.info("Screen assignment method %d succeeded!", i + 1)
+                    self.capabilities["assignment"] = i
+                    self.assigned_screens[str(device_id)] = screen_id
+                    return True, i
+                if not self.reachable:
+                    # The server is down, not rejecting the field; the others would fail too
+                    return False, i
+            except Exception as assign_error:
+                _LOGGER.warning("Screen assignment method %d failed: %s", i + 1, assign_error)
+        return False, order[-1]
+
     async def delete_screen(self, screen_id: str) -> bool:
         """Delete a screen from Terminus."""
         try:
@@ -512,26 +684,60 @@ class TRMNLApi:
                 _LOGGER.error("Could not find MAC address for device %s", device_id)
                 return None
             
-            # Make request with MAC address as ID header (as per TRMNL API spec)
-            session = await self._get_session()
-            headers = {
-                'ID': mac_address,
-                'Content-Type': 'application/json'
-            }
-            
-            async with session.get(f"{self.base_url}/api/display", headers=headers) as response:
-                result = await self._handle_response(response, f"{self.base_url}/api/display")
-                if result:
-                    _LOGGER.debug("Retrieved display content for device %s (MAC: %s)", device_id, mac_address)
-                    return result
-                return None
+            result = await self.get_display(mac_address)
+            if result:
+                _LOGGER.debug("Retrieved display content for device %s (MAC: %s)", device_id, mac_address)
+                return result
+            return None
                 
         except Exception as e:
             _LOGGER.error("Error getting display for device %s: %s", device_id, e)
             return None
 
-    async def send_device_log(self, device_id: str, log_data: Dict) -> bool:
-        """Send log data from a device."""
+    async def get_display(self, mac_address: str) -> Optional[Dict]:
+        """Get the display content for a known MAC address."""
+        # Make request with MAC address as ID header (as per TRMNL API spec)
+        return await self._make_request("/api/display", headers={'ID': mac_address})
+
+    async def get_image(self, url: str) -> Optional[Tuple[bytes, str]]:
+        """Download an image served by Terminus and return its bytes and content type."""
+        status = None
+        bytes_in = 0
+        start = time.monotonic()
+        try:
+            session = await self._get_session()
+            async with session.get(self.absolute_url(url)) as response:
+                status = response.status
+                body = await response.read()
+                bytes_in = len(body)
+                if status != 200:
+                    _LOGGER.warning("HTTP %s fetching image %s", status, url)
+                    return None
+                return body, response.content_type
+        except aiohttp.ClientError as e:
+            _LOGGER.error("HTTP client error fetching image %s: %s", url, e)
+            return None
+        except Exception as e:
+            _LOGGER.error("Unexpected error fetching image %s: %s", url, e, exc_info=True)
+            return None
+        finally:
+            # Image URLs carry per-render filenames, so they share one metrics key
+            self.metrics.record("GET", "/{image}", status, time.monotonic() - start, bytes_in, 0)
+
+    def absolute_url(self, url: str) -> str:
+        """Resolve a server-relative URL against the Terminus base URL."""
+        if url.startswith("/"):
+            return f"{self.base_url}{url}"
+        return url
+
+    async def send_device_log(self, device_id: str, log_data: Dict, batch: bool = True) -> bool:
+        """Send log data from a device.
+
+        With a log pipeline attached, entries are gathered into batched posts;
+        batch=False sends right away.
+        """
+        if batch and self.log_pipeline is not None:
+            return await self.log_pipeline.async_post(device_id, log_data)
         try:
             _LOGGER.debug("Sending log data for device %s", device_id)
             result = await self._make_request("/api/log", method="POST", data=log_data)
@@ -542,6 +748,21 @@ class TRMNLApi:
             _LOGGER.error("Error sending log for device %s: %s", device_id, e)
             return False
 
+    async def get_device_logs(self, numeric_id: int) -> Tuple[Optional[int], Optional[List[Dict]]]:
+        """Get the stored log entries of a device.
+
+        Returns the HTTP status (None without a response) and the entries, or
+        None in their place if they are unavailable.
+        """
+        try:
+            status, result = await self._request(f"/api/devices/{numeric_id}/logs")
+            if isinstance(result, dict):
+                result = result.get("data", result.get("logs_array"))
+            return status, result if isinstance(result, list) else None
+        except Exception as e:
+            _LOGGER.error("Error getting logs for device %s: %s", numeric_id, e)
+            return None, None
+
     # Setup and Configuration
     async def get_setup_info(self) -> Optional[Dict]:
         """Get setup information from Terminus."""
@@ -554,4 +775,3 @@ class TRMNLApi:
         except Exception as e:
             _LOGGER.error("Error getting setup info: %s", e)
             return None
->>>>>>> 4a87724 (TRMNL Home Assistant Integration v3.8.0 with external screenshot service support)
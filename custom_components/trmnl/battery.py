@@ -0,0 +1,191 @@
+"""Battery discharge analytics for TRMNL devices."""
+import logging
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .const import (
+    BATTERY_CHARGE_JUMP,
+    BATTERY_EMPTY_VOLTAGE,
+    BATTERY_HISTORY_SIZE,
+    BATTERY_MIN_FIT_SAMPLES,
+    BATTERY_MIN_FIT_SPAN,
+    BATTERY_MIN_FULL_VOLTAGE,
+    BATTERY_MIN_SAMPLE_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Single-cell LiPo open-circuit voltage to state-of-charge, ascending by voltage
+LIPO_DISCHARGE_CURVE: Tuple[Tuple[float, float], ...] = (
+    (3.27, 0), (3.61, 5), (3.69, 10), (3.71, 15), (3.73, 20), (3.75, 25),
+    (3.77, 30), (3.79, 35), (3.80, 40), (3.82, 45), (3.84, 50), (3.85, 55),
+    (3.87, 60), (3.91, 65), (3.95, 70), (3.98, 75), (4.02, 80), (4.08, 85),
+    (4.11, 90), (4.15, 95), (4.20, 100),
+)
+_CURVE_VOLTAGES = [point[0] for point in LIPO_DISCHARGE_CURVE]
+CURVE_FULL_VOLTAGE = LIPO_DISCHARGE_CURVE[-1][0]
+
+SECONDS_PER_DAY = 86400
+
+
+def voltage_to_percent(voltage: float, full_voltage: Optional[float] = None) -> int:
+    """Map a battery voltage onto the discharge curve.
+
+    When the device's observed full-charge voltage is known, the reading is
+    scaled so that the device's own peak maps to 100 %.
+    """
+    if full_voltage:
+        voltage = voltage * CURVE_FULL_VOLTAGE / full_voltage
+
+    if voltage <= LIPO_DISCHARGE_CURVE[0][0]:
+        return 0
+    if voltage >= CURVE_FULL_VOLTAGE:
+        return 100
+
+    index = bisect_left(_CURVE_VOLTAGES, voltage)
+    low_v, low_pct = LIPO_DISCHARGE_CURVE[index - 1]
+    high_v, high_pct = LIPO_DISCHARGE_CURVE[index]
+    return int(low_pct + (voltage - low_v) / (high_v - low_v) * (high_pct - low_pct))
+
+
+@dataclass
+class BatteryForecast:
+    """Derived battery state for one device."""
+
+    voltage: float
+    percent: int
+    full_voltage: Optional[float]
+    samples: int
+    discharge_rate: Optional[float] = None  # volts per day, positive while draining
+    remaining_days: Optional[float] = None
+    energy_per_refresh_mv: Optional[float] = None
+    percent_per_refresh: Optional[float] = None
+
+
+class BatteryTracker:
+    """Ring-buffered voltage history and discharge fit for a single device."""
+
+    def __init__(self, size: int = BATTERY_HISTORY_SIZE) -> None:
+        """Initialize the tracker."""
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=size)
+        self.full_voltage: Optional[float] = None
+        self.latest_voltage: Optional[float] = None
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return len(self._samples)
+
+    def add(self, timestamp: float, voltage: float) -> bool:
+        """Record a voltage sample, returning whether it was kept."""
+        self.latest_voltage = voltage
+        if self._samples:
+            last_ts, last_voltage = self._samples[-1]
+            if timestamp - last_ts < BATTERY_MIN_SAMPLE_INTERVAL:
+                return False
+            if voltage - last_voltage > BATTERY_CHARGE_JUMP:
+                # Charged since the last sample: start a new discharge segment
+                self._samples.clear()
+                self.full_voltage = None
+
+        self._samples.append((timestamp, voltage))
+        if self.full_voltage is None or voltage > self.full_voltage:
+            self.full_voltage = voltage
+        return True
+
+    def discharge_rate(self) -> Optional[float]:
+        """Return the least-squares discharge rate in volts per day."""
+        if len(self._samples) < BATTERY_MIN_FIT_SAMPLES:
+            return None
+
+        first_ts = self._samples[0][0]
+        if self._samples[-1][0] - first_ts < BATTERY_MIN_FIT_SPAN:
+            return None
+
+        count = len(self._samples)
+        mean_t = sum(ts - first_ts for ts, _ in self._samples) / count
+        mean_v = sum(v for _, v in self._samples) / count
+        covariance = sum(
+            (ts - first_ts - mean_t) * (v - mean_v) for ts, v in self._samples
+        )
+        variance = sum((ts - first_ts - mean_t) ** 2 for ts, _ in self._samples)
+        if not variance:
+            return None
+
+        return -covariance / variance * SECONDS_PER_DAY
+
+    def forecast(self, refresh_rate: Optional[int]) -> Optional[BatteryForecast]:
+        """Fit the current segment and project remaining battery life."""
+        if not self._samples:
+            return None
+
+        voltage = self.latest_voltage
+        forecast = BatteryForecast(
+            voltage=voltage,
+            percent=voltage_to_percent(voltage, self._calibration()),
+            full_voltage=self.full_voltage,
+            samples=len(self._samples),
+        )
+
+        rate = self.discharge_rate()
+        if rate is None or rate <= 0:
+            return forecast
+
+        forecast.discharge_rate = rate
+        forecast.remaining_days = max(voltage - BATTERY_EMPTY_VOLTAGE, 0) / rate
+
+        if refresh_rate:
+            refreshes_per_day = SECONDS_PER_DAY / refresh_rate
+            forecast.energy_per_refresh_mv = rate * 1000 / refreshes_per_day
+            remaining_refreshes = forecast.remaining_days * refreshes_per_day
+            if remaining_refreshes:
+                forecast.percent_per_refresh = forecast.percent / remaining_refreshes
+
+        return forecast
+
+    def _calibration(self) -> Optional[float]:
+        """Return the full-charge voltage to calibrate against, if trustworthy."""
+        # Only trust a peak that looks like a real full charge; a device unplugged
+        # half-charged would otherwise read 100 % for the whole segment
+        if (
+            self.full_voltage
+            and self.full_voltage >= BATTERY_MIN_FULL_VOLTAGE
+            and len(self._samples) >= BATTERY_MIN_FIT_SAMPLES
+        ):
+            return self.full_voltage
+        return None
+
+
+class BatteryAnalytics:
+    """Battery trackers for every device on a Terminus server."""
+
+    def __init__(self) -> None:
+        """Initialize the analytics engine."""
+        self._trackers: Dict[str, BatteryTracker] = {}
+        self._refresh_rates: Dict[str, Optional[int]] = {}
+
+    def record(self, device_id: str, device: Dict[str, Any], timestamp: float) -> None:
+        """Record the battery voltage reported in a device payload."""
+        try:
+            voltage = float(device.get("battery"))
+        except (TypeError, ValueError):
+            return
+        if voltage <= 0:
+            return
+
+        tracker = self._trackers.setdefault(device_id, BatteryTracker())
+        tracker.add(timestamp, voltage)
+        self._refresh_rates[device_id] = device.get("refresh_rate")
+
+    def forecast(self, device_id: str) -> Optional[BatteryForecast]:
+        """Return the battery forecast for a device."""
+        tracker = self._trackers.get(device_id)
+        if tracker is None:
+            return None
+        return tracker.forecast(self._refresh_rates.get(device_id))
+
+    def remove(self, device_id: str) -> None:
+        """Forget a device."""
+        self._trackers.pop(device_id, None)
+        self._refresh_rates.pop(device_id, None)
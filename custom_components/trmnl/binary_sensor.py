@@ -0,0 +1,82 @@
+"""Support for TRMNL binary sensors."""
+import logging
+from typing import Set
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import TRMNLDataUpdateCoordinator
+from .const import BINARY_SENSOR_TYPES, DOMAIN
+from .entity import TRMNLEntity, async_add_device_entities
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up TRMNL binary sensors from a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+
+    async_add_device_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        lambda device_id: [
+            TRMNLConnectivitySensor(coordinator, device_id, sensor_type)
+            for sensor_type in BINARY_SENSOR_TYPES
+        ],
+    )
+
+
+class TRMNLConnectivitySensor(TRMNLEntity, BinarySensorEntity):
+    """Whether a device has checked in by its expected deadline."""
+
+    def __init__(
+        self,
+        coordinator: TRMNLDataUpdateCoordinator,
+        device_id: str,
+        sensor_type: str,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, device_id)
+        self._attr_name = BINARY_SENSOR_TYPES[sensor_type]["name"]
+        self._attr_unique_id = f"{device_id}_{sensor_type}"
+        self._attr_device_class = BinarySensorDeviceClass(BINARY_SENSOR_TYPES[sensor_type]["device_class"])
+        self._update_from_tracker()
+
+    async def async_added_to_hass(self) -> None:
+        """Also update when the device becomes overdue between polls."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.connectivity.async_add_listener(self._handle_overdue)
+        )
+
+    @callback
+    def _handle_overdue(self, device_ids: Set[str]) -> None:
+        if self._device_id in device_ids:
+            self._update_from_tracker()
+            self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Pick up the recomputed deadline once per coordinator update."""
+        self._update_from_tracker()
+        super()._handle_coordinator_update()
+
+    def _update_from_tracker(self) -> None:
+        """Read the device's deadline and overdue state."""
+        tracker = self.coordinator.connectivity
+        overdue = tracker.is_overdue(self._device_id)
+        self._attr_is_on = None if overdue is None else not overdue
+        deadline = tracker.deadlines.get(self._device_id)
+        self._attr_extra_state_attributes = {
+            "expected_by": deadline.isoformat() if deadline else None,
+        }
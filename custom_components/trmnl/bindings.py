@@ -0,0 +1,158 @@
+"""Push dashboards to panels when the entities they show change."""
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, PUSH_BINDING_SAVE_DELAY, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PushBinding:
+    """One dashboard bound to the entities it depends on."""
+
+    def __init__(self, hass: HomeAssistant, config: Dict[str, Any]) -> None:
+        """Initialize the binding from its stored config."""
+        self.hass = hass
+        self.config = config
+        self.binding_id: str = config["binding_id"]
+        self.pushes = 0
+        self.changes = 0
+        self.ignored = 0
+        self.last_push: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self._cancel_push: Optional[Callable[[], None]] = None
+        self._unsub: Optional[Callable[[], None]] = None
+
+    @callback
+    def async_start(self) -> None:
+        """Subscribe to the watched entities."""
+        self._unsub = async_track_state_change_event(
+            self.hass, self.config["entities"], self._handle_state_change
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe and drop any pending push."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._async_cancel_push()
+
+    @callback
+    def _handle_state_change(self, event: Event) -> None:
+        """Schedule a push if the state or attributes really changed."""
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if (
+            old_state is not None
+            and new_state is not None
+            and old_state.state == new_state.state
+            and old_state.attributes == new_state.attributes
+        ):
+            # Only last_updated or context moved; nothing on the panel would differ
+            self.ignored += 1
+            return
+        self.changes += 1
+        # Every change restarts the window, so a burst ends in a single push
+        self._async_cancel_push()
+        self._cancel_push = async_call_later(self.hass, self.config["debounce"], self._async_fire)
+
+    @callback
+    def _async_cancel_push(self) -> None:
+        """Drop the scheduled push, if any."""
+        if self._cancel_push is not None:
+            self._cancel_push()
+            self._cancel_push = None
+
+    async def _async_fire(self, _now: Any) -> None:
+        """Push once the watched entities have been quiet for the debounce window."""
+        self._cancel_push = None
+        await self._async_push()
+
+    async def _async_push(self) -> None:
+        """Run the bound service."""
+        _LOGGER.debug("Push binding %s fired after %d changes", self.binding_id, self.changes)
+        try:
+            await self.hass.services.async_call(
+                DOMAIN, self.config["service"], self.config["data"], blocking=True
+            )
+        except Exception as err:  # noqa: BLE001 - reported in diagnostics, next change retries
+            self.last_error = str(err)
+            _LOGGER.warning("Push binding %s failed: %s", self.binding_id, err)
+            return
+        self.pushes += 1
+        self.last_error = None
+        self.last_push = dt_util.utcnow().isoformat()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the binding and its counters."""
+        return {
+            **self.config,
+            "pushes": self.pushes,
+            "changes": self.changes,
+            "ignored": self.ignored,
+            "last_push": self.last_push,
+            "last_error": self.last_error,
+        }
+
+
+class PushBindingManager:
+    """Persisted set of push bindings shared by all servers."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the manager."""
+        self.hass = hass
+        self.bindings: Dict[str, PushBinding] = {}
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.push_bindings")
+
+    async def async_load(self) -> None:
+        """Restore and start stored bindings."""
+        data = await self._store.async_load() or {}
+        for config in data.get("bindings", []):
+            self._async_add(config)
+
+    @callback
+    def async_set(self, config: Dict[str, Any]) -> None:
+        """Create or replace a binding and persist the set."""
+        self._async_add(config)
+        self._async_save()
+
+    @callback
+    def async_remove(self, binding_id: str) -> bool:
+        """Remove a binding; return False if it did not exist."""
+        binding = self.bindings.pop(binding_id, None)
+        if binding is None:
+            return False
+        binding.async_stop()
+        self._async_save()
+        return True
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop every binding."""
+        for binding in self.bindings.values():
+            binding.async_stop()
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        """Return all bindings for diagnostics."""
+        return [binding.as_dict() for binding in self.bindings.values()]
+
+    @callback
+    def _async_add(self, config: Dict[str, Any]) -> None:
+        previous = self.bindings.pop(config["binding_id"], None)
+        if previous is not None:
+            previous.async_stop()
+        binding = self.bindings[config["binding_id"]] = PushBinding(self.hass, config)
+        binding.async_start()
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(
+            lambda: {"bindings": [binding.config for binding in self.bindings.values()]},
+            PUSH_BINDING_SAVE_DELAY,
+        )
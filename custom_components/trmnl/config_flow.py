@@ -1,17 +1,32 @@
 """Config flow for TRMNL integration."""
 import voluptuous as vol
-import asyncio
 import logging
+from typing import Dict, Optional
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.components.zeroconf import ZeroconfServiceInfo
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
 from .api import TRMNLApi
-from .const import DOMAIN, CONF_HOST, CONF_PORT
+from .const import (
+    DOMAIN,
+    CONF_HOST,
+    CONF_PORT,
+    DEFAULT_PORT,
+    CONF_ADAPTIVE_REFRESH,
+    CONF_MIN_REFRESH_RATE,
+    CONF_MAX_REFRESH_RATE,
+    DEFAULT_MIN_REFRESH_RATE,
+    DEFAULT_MAX_REFRESH_RATE,
+)
+from .discovery import DiscoveredServer, async_discover_servers, async_probe_server
 
 _LOGGER = logging.getLogger(__name__)
 
+CONF_SERVER = "server"
+MANUAL_ENTRY = "manual"
+
 
 async def validate_connection(hass: HomeAssistant, host: str, port: int) -> dict:
     """Validate connection to Terminus server and discover devices."""
@@ -41,38 +56,32 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> "OptionsFlowHandler":
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovered: Dict[str, DiscoveredServer] = {}
+        self._zeroconf_server: Optional[DiscoveredServer] = None
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         """Handle the initial step."""
         errors = {}
         
         if user_input is None:
-            # Auto-discover known Terminus server
-            known_servers = [
-                ("192.168.1.56", 2300),
-            ]
+            _LOGGER.info("Scanning local network for TRMNL Terminus servers...")
             
-            _LOGGER.info("Auto-discovering TRMNL Terminus server...")
+            configured = self._async_current_ids()
+            servers = await async_discover_servers(self.hass)
+            self._discovered = {
+                server.key: server for server in servers if server.key not in configured
+            }
             
-            for host, port in known_servers:
-                try:
-                    info = await validate_connection(self.hass, host, port)
-                    
-                    # Check if already configured
-                    await self.async_set_unique_id(f"{host}:{port}")
-                    self._abort_if_unique_id_configured()
-                    
-                    # Create entry immediately
-                    return self.async_create_entry(
-                        title=info["title"], 
-                        data={CONF_HOST: host, CONF_PORT: port}
-                    )
-                    
-                except CannotConnect:
-                    _LOGGER.debug("Cannot connect to %s:%s", host, port)
-                    continue
-                except Exception as e:
-                    _LOGGER.debug("Error testing %s:%s: %s", host, port, e)
-                    continue
+            if self._discovered:
+                return await self.async_step_pick()
             
             # If auto-discovery fails, show manual form
             errors["base"] = "cannot_connect_auto"
@@ -96,12 +105,107 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
 
-        # Show manual configuration form
+        return self._show_manual_form(errors)
+
+    async def async_step_pick(self, user_input=None) -> FlowResult:
+        """Let the user choose one of the discovered servers."""
+        if user_input is not None:
+            if user_input[CONF_SERVER] == MANUAL_ENTRY:
+                return self._show_manual_form({})
+            
+            server = self._discovered[user_input[CONF_SERVER]]
+            return await self._async_create_server_entry(server)
+
+        choices = {key: f"Terminus at {key}" for key in self._discovered}
+        choices[MANUAL_ENTRY] = "Enter server manually"
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema({
+                vol.Required(CONF_SERVER): vol.In(choices),
+            }),
+        )
+
+    async def async_step_zeroconf(self, discovery_info: ZeroconfServiceInfo) -> FlowResult:
+        """Handle a Terminus server announced over mDNS."""
+        host = discovery_info.host
+        port = discovery_info.port or DEFAULT_PORT
+        
+        await self.async_set_unique_id(f"{host}:{port}")
+        self._abort_if_unique_id_configured()
+        
+        if not await async_probe_server(self.hass, host, port):
+            return self.async_abort(reason="not_terminus")
+        
+        self._zeroconf_server = DiscoveredServer(host, port)
+        self.context["title_placeholders"] = {"server": self._zeroconf_server.key}
+        return await self.async_step_zeroconf_confirm()
+
+    async def async_step_zeroconf_confirm(self, user_input=None) -> FlowResult:
+        """Confirm adding a server found over mDNS."""
+        if user_input is not None:
+            return await self._async_create_server_entry(self._zeroconf_server)
+
+        return self.async_show_form(
+            step_id="zeroconf_confirm",
+            description_placeholders={"server": self._zeroconf_server.key},
+        )
+
+    async def _async_create_server_entry(self, server: DiscoveredServer) -> FlowResult:
+        """Create an entry for a server that already answered the discovery probe."""
+        await self.async_set_unique_id(server.key)
+        self._abort_if_unique_id_configured()
+        
+        return self.async_create_entry(
+            title=f"TRMNL ({server.key})",
+            data={CONF_HOST: server.host, CONF_PORT: server.port},
+        )
+
+    @callback
+    def _show_manual_form(self, errors: Dict[str, str]) -> FlowResult:
+        """Show the manual host/port form."""
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema({
                 vol.Required(CONF_HOST, default="192.168.1.56"): str,
-                vol.Required(CONF_PORT, default=2300): int,
+                vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
+            }),
+            errors=errors,
+        )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle TRMNL options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        """Manage the adaptive refresh options."""
+        errors = {}
+
+        if user_input is not None:
+            if user_input[CONF_MIN_REFRESH_RATE] > user_input[CONF_MAX_REFRESH_RATE]:
+                errors["base"] = "invalid_refresh_bounds"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_ADAPTIVE_REFRESH,
+                    default=options.get(CONF_ADAPTIVE_REFRESH, False),
+                ): bool,
+                vol.Required(
+                    CONF_MIN_REFRESH_RATE,
+                    default=options.get(CONF_MIN_REFRESH_RATE, DEFAULT_MIN_REFRESH_RATE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                vol.Required(
+                    CONF_MAX_REFRESH_RATE,
+                    default=options.get(CONF_MAX_REFRESH_RATE, DEFAULT_MAX_REFRESH_RATE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10)),
             }),
             errors=errors,
         )
@@ -0,0 +1,197 @@
+"""Check-in deadlines and offline detection for TRMNL devices."""
+import heapq
+import logging
+from datetime import datetime, time, timedelta, tzinfo
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONNECTIVITY_DEFAULT_REFRESH_RATE,
+    CONNECTIVITY_GRACE,
+    CONNECTIVITY_MISSED_CHECK_INS,
+)
+from .sleep_schedule import normalize_time
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _at(day: datetime, value: str, tz: tzinfo) -> datetime:
+    hour, minute = (int(part) for part in value.split(":")[:2])
+    return datetime.combine(day.date(), time(hour, minute), tz)
+
+
+def in_sleep_window(device: Dict[str, Any], when: datetime, tz: tzinfo) -> bool:
+    """Return whether a device's sleep window covers the given moment."""
+    sleep_start = normalize_time(device.get("sleep_start_at"))
+    sleep_stop = normalize_time(device.get("sleep_stop_at"))
+    if not sleep_start or not sleep_stop or sleep_start == sleep_stop:
+        return False
+    local = when.astimezone(tz).strftime("%H:%M")
+    if sleep_start < sleep_stop:
+        return sleep_start <= local < sleep_stop
+    return local >= sleep_start or local < sleep_stop
+
+
+def expected_check_in(device: Dict[str, Any], tz: tzinfo) -> Optional[datetime]:
+    """Return when a device is overdue if it has not checked in again.
+
+    A device may miss a few refresh intervals before it counts as offline. If
+    its sleep window starts before that, the deadline moves past the wake-up.
+    Sleep times are in the server's timezone, which the integration takes to
+    be Home Assistant's (as apply_sleep_schedule does); pass that as tz.
+    """
+    last_seen = dt_util.parse_datetime(str(device.get("last_seen") or device.get("updated_at") or ""))
+    if last_seen is None:
+        return None
+    if last_seen.tzinfo is None:
+        last_seen = last_seen.replace(tzinfo=tz)
+    refresh_rate = device.get("refresh_rate") or CONNECTIVITY_DEFAULT_REFRESH_RATE
+    slack = timedelta(seconds=refresh_rate * CONNECTIVITY_MISSED_CHECK_INS + CONNECTIVITY_GRACE)
+    deadline = last_seen + slack
+
+    sleep_start = normalize_time(device.get("sleep_start_at"))
+    sleep_stop = normalize_time(device.get("sleep_stop_at"))
+    if not sleep_start or not sleep_stop or sleep_start == sleep_stop:
+        return deadline
+
+    local = last_seen.astimezone(tz)
+    for offset in range(-1, 3):
+        day = local + timedelta(days=offset)
+        start = _at(day, sleep_start, tz)
+        stop = _at(day, sleep_stop, tz)
+        if stop <= start:
+            stop += timedelta(days=1)
+        if start <= deadline and stop > last_seen:
+            deadline = max(deadline, stop + slack)
+    return deadline
+
+
+class ConnectivityTracker:
+    """Keep every device's check-in deadline in a min-heap.
+
+    Only the earliest deadline has a timer. When it passes, the devices that
+    are due are marked overdue and listeners hear about those devices alone.
+    Polls move deadlines forward and clear devices that checked in again.
+    """
+
+    def __init__(self, hass: HomeAssistant, is_live: Callable[[], bool]) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.deadlines: Dict[str, datetime] = {}
+        self.overdue: Set[str] = set()
+        # Server reachability; nothing is marked overdue while the server is down
+        self._is_live = is_live
+        # (deadline, device_id); entries superseded in deadlines are skipped lazily
+        self._heap: List[Tuple[datetime, str]] = []
+        self._listeners: List[Callable[[Set[str]], None]] = []
+        self._unsub_timer: Optional[Callable[[], None]] = None
+        self._timer_at: Optional[datetime] = None
+
+    @callback
+    def async_update(self, devices: Dict[str, Dict[str, Any]]) -> None:
+        """Recompute deadlines from freshly polled devices."""
+        tz = dt_util.get_time_zone(self.hass.config.time_zone) or dt_util.UTC
+        now = dt_util.utcnow()
+        for device_id in set(self.deadlines) - set(devices):
+            del self.deadlines[device_id]
+            self.overdue.discard(device_id)
+
+        for device_id, device in devices.items():
+            deadline = expected_check_in(device, tz)
+            if deadline is None:
+                self.deadlines.pop(device_id, None)
+                self.overdue.discard(device_id)
+                continue
+            if deadline > now:
+                self.overdue.discard(device_id)
+            if self.deadlines.get(device_id) != deadline:
+                self.deadlines[device_id] = deadline
+                heapq.heappush(self._heap, (deadline, device_id))
+
+        if len(self._heap) > 2 * len(self.deadlines):
+            # Superseded entries only leave the heap when they reach the top
+            self._heap = [
+                (deadline, device_id)
+                for device_id, deadline in self.deadlines.items()
+                if device_id not in self.overdue
+            ]
+            heapq.heapify(self._heap)
+        self._async_schedule()
+
+    @callback
+    def async_add_listener(self, listener: Callable[[Set[str]], None]) -> Callable[[], None]:
+        """Call listener with the devices that became overdue between polls."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the pending timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+            self._timer_at = None
+
+    def is_overdue(self, device_id: str) -> Optional[bool]:
+        """Return whether a device missed its deadline, or None if it has none."""
+        if device_id not in self.deadlines:
+            return None
+        return device_id in self.overdue
+
+    def summary(self) -> Dict[str, Any]:
+        """Return fleet-wide figures."""
+        upcoming = self._head()
+        return {
+            "overdue": len(self.overdue),
+            "devices": sorted(self.overdue),
+            "tracked": len(self.deadlines),
+            "next_deadline": upcoming[0].isoformat() if upcoming else None,
+        }
+
+    def _head(self) -> Optional[Tuple[datetime, str]]:
+        """Drop stale heap entries and return the next live deadline."""
+        while self._heap:
+            deadline, device_id = self._heap[0]
+            if self.deadlines.get(device_id) == deadline and device_id not in self.overdue:
+                return self._heap[0]
+            heapq.heappop(self._heap)
+        return None
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Arm the timer for the earliest deadline."""
+        head = self._head()
+        if head is None:
+            self.async_stop()
+            return
+        if head[0] == self._timer_at:
+            return
+        self.async_stop()
+        self._timer_at = head[0]
+        self._unsub_timer = async_track_point_in_utc_time(self.hass, self._async_due, head[0])
+
+    @callback
+    def _async_due(self, now: datetime) -> None:
+        """Mark every device whose deadline has passed as overdue."""
+        self._unsub_timer = None
+        self._timer_at = None
+        if not self._is_live():
+            # The next successful poll recomputes deadlines and re-arms the timer
+            return
+
+        due: Set[str] = set()
+        head = self._head()
+        while head is not None and head[0] <= now:
+            heapq.heappop(self._heap)
+            self.overdue.add(head[1])
+            due.add(head[1])
+            head = self._head()
+        self._async_schedule()
+
+        if due:
+            _LOGGER.info("Devices overdue for check-in: %s", sorted(due))
+            for listener in list(self._listeners):
+                listener(due)
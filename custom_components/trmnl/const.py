@@ -3,16 +3,228 @@
 DOMAIN = "trmnl"
 
 # Platforms
-PLATFORMS = ["sensor"]
+PLATFORMS = ["binary_sensor", "image", "sensor", "switch"]
 
 # Configuration
 CONF_HOST = "host"
 CONF_PORT = "port"
+CONF_ADAPTIVE_REFRESH = "adaptive_refresh"
+CONF_MIN_REFRESH_RATE = "min_refresh_rate"
+CONF_MAX_REFRESH_RATE = "max_refresh_rate"
 
 # Default values
 DEFAULT_PORT = 2300
 DEFAULT_NAME = "TRMNL"
+DEFAULT_SCAN_INTERVAL = 60
+DEFAULT_MIN_REFRESH_RATE = 300
+DEFAULT_MAX_REFRESH_RATE = 3600
+
+# Storage
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # seconds to coalesce device snapshot writes
+
+# API client
+PATCH_COALESCE_WINDOW = 0.05  # seconds to gather device field updates into one PATCH
+HEALTH_CHECK_CACHE_TTL = 5  # seconds a health check result is reused
+HEALTH_CHECK_TIMEOUT = 5  # seconds for the health check request
+
+# Display cache
+DISPLAY_FETCH_CONCURRENCY = 8  # simultaneous /api/display requests per poll
+
+# Device fields whose change means the panel is showing new content
+CONTENT_FIELDS = (
+    "playlist_id",
+    "current_screen_id",
+    "screen_id",
+    "active_screen",
+    "active_screen_id",
+    "display_screen_id",
+)
+
+# Template rendering
+RENDER_FONT_CACHE_SIZE = 16  # loaded fonts kept by path and size
+RENDER_DEFAULT_SIZE = (800, 480)  # used when neither device nor model has a resolution
+RENDER_SCREENS_SAVE_DELAY = 1  # seconds to coalesce writes of the per-device template screens
+
+# Push bindings
+PUSH_BINDING_DEFAULT_DEBOUNCE = 30  # seconds of quiet before a bound dashboard is pushed
+PUSH_BINDING_SAVE_DELAY = 1
+
+# Playlists
+PLAYLIST_MIN_INTERVAL = 60  # seconds between rotation steps, at least
+PLAYLIST_DEFAULT_MAX_AGE = 3600  # seconds before a pre-rendered screen is re-rendered
+PLAYLIST_SAVE_DELAY = 1
+
+# Connectivity
+CONNECTIVITY_MISSED_CHECK_INS = 2  # refresh intervals a device may miss before it is overdue
+CONNECTIVITY_GRACE = 120  # extra seconds for slow wake-ups and server polling lag
+CONNECTIVITY_DEFAULT_REFRESH_RATE = 900  # seconds, for devices that do not report one
+
+# Firmware rollouts
+ROLLOUT_CHECK_INTERVAL = 60  # seconds between checks on the current wave
+ROLLOUT_DEFAULT_WAVE_TIMEOUT = 3600  # seconds to wait for a wave's devices to update
+ROLLOUT_DEFAULT_HALT_THRESHOLD = 20  # percent of a wave failed or offline that halts
+ROLLOUT_SAVE_DELAY = 1
+
+# Write-behind queue
+WRITE_QUEUE_RETRY_INTERVAL = 30  # seconds between probes of an unreachable server
+WRITE_QUEUE_DRAIN_RATE = 2  # queued writes sent per second after recovery
+WRITE_QUEUE_SAVE_DELAY = 1  # seconds to coalesce queue persistence
+
+# Device logs
+LOG_BUFFER_SIZE = 500  # most recent raw log entries kept per server
+LOG_BATCH_WINDOW = 2  # seconds to gather posted entries into one request
+LOG_BATCH_SIZE = 50  # entries that trigger an immediate post
+LOG_PULL_INTERVAL = 300  # seconds between device log pulls
+LOG_PULL_CONCURRENCY = 4
+
+# Discovery
+DISCOVERY_CONCURRENCY = 64  # simultaneous TCP connects while scanning
+DISCOVERY_CONNECT_TIMEOUT = 0.5  # seconds per TCP connect
+DISCOVERY_PROBE_TIMEOUT = 3  # seconds for the confirming API request
+DISCOVERY_MAX_PREFIX = 24  # never scan more than a /24 per interface
+
+# Battery analytics
+BATTERY_HISTORY_SIZE = 672  # one week of samples at the minimum interval
+BATTERY_MIN_SAMPLE_INTERVAL = 900  # seconds between kept voltage samples
+BATTERY_CHARGE_JUMP = 0.1  # volts; a larger rise means the device was charged
+BATTERY_MIN_FIT_SAMPLES = 4
+BATTERY_MIN_FIT_SPAN = 6 * 3600  # seconds of history needed for a forecast
+BATTERY_EMPTY_VOLTAGE = 3.3  # volts at which the device browns out
+BATTERY_MIN_FULL_VOLTAGE = 4.0  # lowest peak accepted as a full-charge calibration
+
+# Adaptive refresh controller
+ADAPTIVE_REFRESH_INTERVAL = 900  # seconds between controller evaluations
+ADAPTIVE_REFRESH_HISTORY = 20  # content changes remembered per device
+ADAPTIVE_REFRESH_HYSTERESIS = 0.25  # relative change required before writing
+ADAPTIVE_REFRESH_HOLD_TIME = 3600  # seconds a written rate is kept at minimum
+ADAPTIVE_REFRESH_LOW_BATTERY = 20  # percent below which polling is slowed
+ADAPTIVE_REFRESH_LOW_BATTERY_FACTOR = 2
+ADAPTIVE_REFRESH_CONCURRENCY = 4
+
+# Device information
+MANUFACTURER = "TRMNL"
+MODEL = "TRMNL Display"
 
 # Services
 SERVICE_UPDATE_SCREEN = "update_screen"
-SERVICE_REFRESH_DEVICE = "refresh_device"
\ No newline at end of file
+SERVICE_REFRESH_DEVICE = "refresh_device"
+SERVICE_APPLY_SLEEP_SCHEDULE = "apply_sleep_schedule"
+SERVICE_RENDER_TEMPLATE = "render_template_to_device"
+SERVICE_SEND_DASHBOARD = "send_dashboard_to_device"
+SERVICE_SET_PUSH_BINDING = "set_push_binding"
+SERVICE_REMOVE_PUSH_BINDING = "remove_push_binding"
+SERVICE_SET_PLAYLIST = "set_playlist"
+SERVICE_REMOVE_PLAYLIST = "remove_playlist"
+SERVICE_START_FIRMWARE_ROLLOUT = "start_firmware_rollout"
+SERVICE_CANCEL_FIRMWARE_ROLLOUT = "cancel_firmware_rollout"
+SERVICE_START_CALL_RECORDING = "start_call_recording"
+SERVICE_STOP_CALL_RECORDING = "stop_call_recording"
+
+# Events
+EVENT_SLEEP_SCHEDULE_APPLIED = f"{DOMAIN}_sleep_schedule_applied"
+EVENT_PUSH_TRACE = f"{DOMAIN}_push_trace"
+EVENT_FIRMWARE_ROLLOUT = f"{DOMAIN}_firmware_rollout"
+
+# Push tracing
+PUSH_TRACE_BUFFER_SIZE = 50  # most recent push traces kept for diagnostics
+
+# Call recording for replay
+RECORDING_MAX_CALLS = 10000  # most recent calls kept while recording
+RECORDING_FORMAT_VERSION = 1
+
+# Memory budgets, in bytes, for caches that grow with the fleet
+MEMORY_PREVIEW_BUDGET = 8 * 1024 * 1024  # panel images per server
+MEMORY_RENDER_BUDGET = 8 * 1024 * 1024  # cached template frames, about 20 at 800x480
+MEMORY_TRACE_BUDGET = 256 * 1024  # push traces
+
+# Entity descriptions
+SENSOR_TYPES = {
+    "battery": {
+        "name": "Battery",
+        "icon": "mdi:battery",
+        "device_class": "battery",
+    },
+    "battery_remaining": {
+        "name": "Battery Remaining",
+        "icon": "mdi:battery-clock",
+        "device_class": "duration",
+    },
+    "wifi_signal": {
+        "name": "WiFi Signal",
+        "icon": "mdi:wifi",
+        "device_class": "signal_strength",
+    },
+    "firmware_version": {
+        "name": "Firmware Version",
+        "icon": "mdi:chip",
+    },
+    "last_seen": {
+        "name": "Last Seen",
+        "icon": "mdi:clock-outline",
+        "device_class": "timestamp",
+    },
+    "device_status": {
+        "name": "Device Status",
+        "icon": "mdi:information-outline",
+    },
+    "log_errors": {
+        "name": "Log Errors",
+        "icon": "mdi:text-box-remove-outline",
+        "state_class": "total_increasing",
+    },
+}
+
+# Server-level diagnostic sensors, one set per Terminus server
+SERVER_SENSOR_TYPES = {
+    "api_requests": {
+        "name": "API Requests",
+        "icon": "mdi:counter",
+        "state_class": "total_increasing",
+    },
+    "api_error_rate": {
+        "name": "API Error Rate",
+        "icon": "mdi:alert-circle-outline",
+        "unit": "%",
+    },
+    "api_latency_p95": {
+        "name": "API Latency p95",
+        "icon": "mdi:timer-outline",
+        "unit": "ms",
+    },
+    "log_entries": {
+        "name": "Log Entries",
+        "icon": "mdi:text-box-multiple-outline",
+        "state_class": "total_increasing",
+    },
+    "memory_usage": {
+        "name": "Memory Usage",
+        "icon": "mdi:memory",
+        "unit": "KiB",
+    },
+    "devices_overdue": {
+        "name": "Devices Overdue",
+        "icon": "mdi:lan-disconnect",
+    },
+}
+
+SWITCH_TYPES = {
+    "auto_refresh": {
+        "name": "Auto Refresh",
+        "icon": "mdi:refresh-auto",
+    },
+}
+
+IMAGE_TYPES = {
+    "display": {
+        "name": "Display",
+        "icon": "mdi:monitor-screenshot",
+    },
+}
+
+BINARY_SENSOR_TYPES = {
+    "connectivity": {
+        "name": "Connectivity",
+        "device_class": "connectivity",
+    },
+}
@@ -0,0 +1,230 @@
+"""Data update coordinator for the TRMNL integration."""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api import TRMNLApi
+from .battery import BatteryAnalytics
+from .connectivity import ConnectivityTracker
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY, STORAGE_VERSION
+from .display import DisplayCache
+from .logs import LogPipeline
+from .preview import PreviewCache
+
+_LOGGER = logging.getLogger(__name__)
+
+# Device fields that shape entities and device registry entries; a change in
+# any of them is worth persisting to the startup snapshot
+SNAPSHOT_FIELDS = ("id", "label", "model_id", "firmware_version", "mac_address")
+
+# Device credentials never go to disk
+SNAPSHOT_EXCLUDED_FIELDS = ("api_key",)
+
+
+class TRMNLDataUpdateCoordinator(DataUpdateCoordinator[Dict[str, Dict[str, Any]]]):
+    """Poll a Terminus server and keep device data keyed by friendly_id.
+
+    The coordinator has no timer of its own; polls are driven by the shared
+    scheduler in TRMNLRouter so several servers are staggered.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: TRMNLApi, entry_id: Optional[str] = None) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} {api.host}:{api.port}",
+            update_interval=None,
+        )
+        self.api = api
+        self.battery = BatteryAnalytics()
+        self.display = DisplayCache(api)
+        self.previews = PreviewCache()
+        self.logs = LogPipeline(api)
+        self.connectivity = ConnectivityTracker(hass, lambda: self.last_update_success)
+        self.models: Dict[str, str] = {}
+        self._store: Optional[Store] = (
+            Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}") if entry_id else None
+        )
+        self._entry_id = entry_id
+        self._snapshot_models: Dict[str, str] = {}
+        self._snapshot_signature: Optional[Tuple] = None
+        # Device set seen by the last listener update; None until the first data
+        self._known_devices: Optional[Set[str]] = None
+        self._device_listeners: List[Callable[[Set[str]], None]] = []
+        self._display_task: Optional[asyncio.Task] = None
+        self._log_task: Optional[asyncio.Task] = None
+
+    async def _async_update_data(self) -> Dict[str, Dict[str, Any]]:
+        """Fetch the current device list from Terminus."""
+        devices = await self.api.get_devices()
+        if not devices:
+            raise UpdateFailed(f"No devices returned by {self.api.base_url}")
+
+        data = {
+            device["friendly_id"]: device
+            for device in devices
+            if device.get("friendly_id")
+        }
+
+        now = time.time()
+        for device_id, device in data.items():
+            self.battery.record(device_id, device, now)
+
+        self._async_schedule_display_update(data)
+        self.previews.retain(data)
+        self._async_schedule_log_pull(data)
+        self.connectivity.async_update(data)
+        self._async_schedule_snapshot_save(data)
+        return data
+
+    @callback
+    def _async_schedule_display_update(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """Fetch changed display content without holding up the poll.
+
+        A fetch still running from an earlier poll is left to finish; devices
+        it missed differ from the cache and are picked up by the next poll.
+        """
+        if self._display_task is not None and not self._display_task.done():
+            return
+        self._display_task = self.hass.async_create_background_task(
+            self._async_update_display(data),
+            f"{DOMAIN} display {self.api.host}:{self.api.port}",
+        )
+
+    async def _async_update_display(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """Refresh the display cache and let entities pick up new entries."""
+        if await self.display.async_update(data):
+            self.async_update_listeners()
+
+    @callback
+    def _async_schedule_log_pull(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """Pull device logs without holding up the poll, once per LOG_PULL_INTERVAL."""
+        if not self.logs.pull_due() or (self._log_task is not None and not self._log_task.done()):
+            return
+        self._log_task = self.hass.async_create_background_task(
+            self._async_pull_logs(data),
+            f"{DOMAIN} log pull {self.api.host}:{self.api.port}",
+        )
+
+    async def _async_pull_logs(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """Pull device logs and let the log sensors pick up new entries."""
+        if await self.logs.async_pull(data):
+            self.async_update_listeners()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel fetches still running in the background."""
+        for task in (self._display_task, self._log_task):
+            if task is not None:
+                task.cancel()
+        self._display_task = self._log_task = None
+        self.connectivity.async_stop()
+
+    @callback
+    def async_add_device_listener(self, listener: Callable[[Set[str]], None]) -> Callable[[], None]:
+        """Call listener with the IDs of devices that appear on the server."""
+        self._device_listeners.append(listener)
+        return lambda: self._device_listeners.remove(listener)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Sync added and removed devices before entities see the new data."""
+        self._async_sync_devices()
+        super().async_update_listeners()
+
+    @callback
+    def _async_sync_devices(self) -> None:
+        """Add entities for new devices and drop removed devices from the registry."""
+        current = set(self.data or {})
+        if self._known_devices is None:
+            # Platforms create entities for the initial device set themselves
+            self._known_devices = current
+            return
+
+        added = current - self._known_devices
+        removed = self._known_devices - current
+        if not added and not removed:
+            return
+        self._known_devices = current
+
+        if removed:
+            _LOGGER.info("Devices removed from %s: %s", self.api.base_url, sorted(removed))
+            registry = dr.async_get(self.hass)
+            for device_id in removed:
+                self.battery.remove(device_id)
+                self.logs.remove(device_id)
+                device = registry.async_get_device(identifiers={(DOMAIN, device_id)})
+                if device is not None and self._entry_id:
+                    # Detaching the entry also removes its entities for the device
+                    registry.async_update_device(device.id, remove_config_entry_id=self._entry_id)
+
+        if added:
+            _LOGGER.info("Devices added on %s: %s", self.api.base_url, sorted(added))
+            for listener in list(self._device_listeners):
+                listener(added)
+
+    async def async_restore_snapshot(self) -> bool:
+        """Seed the coordinator with the last saved device snapshot."""
+        if self._store is None:
+            return False
+
+        snapshot = await self._store.async_load()
+        if not snapshot or not snapshot.get("devices"):
+            return False
+
+        self.models = snapshot.get("models", {})
+        self._snapshot_models = dict(self.models)
+        self._snapshot_signature = self._signature(snapshot["devices"])
+        self.async_set_updated_data(snapshot["devices"])
+        return True
+
+    async def async_reconcile(self) -> None:
+        """Refresh models and devices from the live server."""
+        models = await self.api.get_models()
+        if models:
+            self.models = models
+        await self.async_refresh()
+
+    def _async_schedule_snapshot_save(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """Persist the device snapshot if anything entity-shaping changed."""
+        if self._store is None:
+            return
+
+        signature = self._signature(data)
+        if signature == self._snapshot_signature and self._snapshot_models == self.models:
+            return
+
+        self._snapshot_signature = signature
+        self._snapshot_models = dict(self.models)
+        # Built when the delayed save runs, so no second copy of the fleet is kept
+        self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot_data(self) -> Dict[str, Any]:
+        """Return the current devices and models in snapshot form."""
+        return {
+            "devices": {
+                device_id: {
+                    key: value
+                    for key, value in device.items()
+                    if key not in SNAPSHOT_EXCLUDED_FIELDS
+                }
+                for device_id, device in (self.data or {}).items()
+            },
+            "models": dict(self.models),
+        }
+
+    @staticmethod
+    def _signature(data: Dict[str, Dict[str, Any]]) -> Tuple:
+        """Return the parts of the device data that the snapshot cares about."""
+        return tuple(
+            (device_id, tuple(device.get(field) for field in SNAPSHOT_FIELDS))
+            for device_id, device in sorted(data.items())
+        )
+
@@ -0,0 +1,61 @@
+"""Diagnostics support for the TRMNL integration."""
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .memory import memory_report
+
+TO_REDACT = {"api_key", "mac_address"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data["coordinator"]
+    screenshot_metrics = hass.data[DOMAIN].get("screenshot_metrics")
+    push_traces = hass.data[DOMAIN].get("push_traces")
+    push_bindings = hass.data[DOMAIN].get("push_bindings")
+    playlists = hass.data[DOMAIN].get("playlists")
+    rollouts = hass.data[DOMAIN].get("firmware_rollouts")
+    device_ids = set(coordinator.data or {})
+
+    return {
+        "server": f"{entry_data['host']}:{entry_data['port']}",
+        "options": dict(entry.options),
+        "last_update_success": coordinator.last_update_success,
+        "devices": async_redact_data(coordinator.data or {}, TO_REDACT),
+        "health": coordinator.api.health.as_dict() if coordinator.api.health else None,
+        "api_metrics": coordinator.api.metrics.as_dict(),
+        "memory": memory_report(coordinator),
+        "write_queue": entry_data["write_queue"].as_dict(),
+        "logs": {
+            "summary": coordinator.logs.summary(),
+            "recent": list(coordinator.logs.recent),
+        },
+        "screenshot_metrics": screenshot_metrics.as_dict() if screenshot_metrics else None,
+        "push_traces": [
+            trace
+            for trace in (push_traces.as_list() if push_traces else [])
+            if trace["device_id"] in device_ids
+        ],
+        "push_bindings": [
+            binding
+            for binding in (push_bindings.as_list() if push_bindings else [])
+            if binding["data"].get("device_friendly_id") in device_ids
+        ],
+        "playlists": [
+            playlist
+            for playlist in (playlists.as_list() if playlists else [])
+            if playlist["device_friendly_id"] in device_ids
+        ],
+        "firmware_rollouts": [
+            rollout
+            for rollout in (rollouts.as_list() if rollouts else [])
+            if device_ids & set(rollout["state"]["devices"])
+        ],
+    }
@@ -0,0 +1,125 @@
+"""Local network discovery of Terminus servers."""
+import asyncio
+import ipaddress
+import logging
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Set
+
+import aiohttp
+
+from homeassistant.components import network
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    DEFAULT_PORT,
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_CONNECT_TIMEOUT,
+    DISCOVERY_MAX_PREFIX,
+    DISCOVERY_PROBE_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DiscoveredServer:
+    """A Terminus server found on the network."""
+
+    host: str
+    port: int
+
+    @property
+    def key(self) -> str:
+        """Return the host:port identifier used as config entry unique_id."""
+        return f"{self.host}:{self.port}"
+
+
+async def async_get_scan_hosts(hass: HomeAssistant) -> List[str]:
+    """Return the IPv4 hosts on every enabled local subnet.
+
+    Subnets wider than DISCOVERY_MAX_PREFIX are narrowed to the block around
+    our own address so a /16 doesn't turn into 65k connection attempts.
+    """
+    hosts: List[str] = []
+    seen: Set[str] = set()
+
+    for adapter in await network.async_get_adapters(hass):
+        if not adapter["enabled"]:
+            continue
+        for ip_info in adapter["ipv4"]:
+            own_address = ip_info["address"]
+            prefix = max(ip_info["network_prefix"], DISCOVERY_MAX_PREFIX)
+            subnet = ipaddress.ip_network(f"{own_address}/{prefix}", strict=False)
+            if subnet.is_loopback or subnet.is_link_local:
+                continue
+            for address in subnet.hosts():
+                host = str(address)
+                if host != own_address and host not in seen:
+                    seen.add(host)
+                    hosts.append(host)
+
+    return hosts
+
+
+async def _async_port_open(host: str, port: int, semaphore: asyncio.Semaphore) -> bool:
+    """Return whether a TCP connect to host:port succeeds quickly."""
+    async with semaphore:
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), timeout=DISCOVERY_CONNECT_TIMEOUT
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+
+async def async_probe_server(hass: HomeAssistant, host: str, port: int) -> bool:
+    """Confirm that host:port answers like a Terminus API."""
+    session = async_get_clientsession(hass)
+    try:
+        async with session.get(
+            f"http://{host}:{port}/api/models",
+            timeout=aiohttp.ClientTimeout(total=DISCOVERY_PROBE_TIMEOUT),
+        ) as response:
+            if response.status != 200:
+                return False
+            result = await response.json(content_type=None)
+            return isinstance(result, dict) and "data" in result
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        return False
+
+
+async def async_discover_servers(
+    hass: HomeAssistant,
+    port: int = DEFAULT_PORT,
+    hosts: Optional[Iterable[str]] = None,
+) -> List[DiscoveredServer]:
+    """Scan local subnets concurrently for Terminus servers."""
+    if hosts is None:
+        hosts = await async_get_scan_hosts(hass)
+    hosts = list(hosts)
+
+    _LOGGER.debug("Scanning %d hosts for Terminus on port %s", len(hosts), port)
+    semaphore = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+    open_results = await asyncio.gather(
+        *(_async_port_open(host, port, semaphore) for host in hosts)
+    )
+    candidates = [host for host, is_open in zip(hosts, open_results) if is_open]
+
+    probe_results = await asyncio.gather(
+        *(async_probe_server(hass, host, port) for host in candidates)
+    )
+    servers = [
+        DiscoveredServer(host, port)
+        for host, confirmed in zip(candidates, probe_results)
+        if confirmed
+    ]
+
+    _LOGGER.info("Discovered %d Terminus servers (%d open ports)", len(servers), len(candidates))
+    return servers
@@ -0,0 +1,95 @@
+"""Per-device cache of what Terminus serves each panel."""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from homeassistant.util import dt as dt_util
+
+from .api import TRMNLApi
+from .const import CONTENT_FIELDS, DISPLAY_FETCH_CONCURRENCY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class DisplayInfo:
+    """The content Terminus last reported for a device."""
+
+    image_url: Optional[str]
+    filename: Optional[str]
+    refresh_rate: Optional[int]
+    fetched_at: datetime
+    content_key: Tuple
+
+
+def content_key(device: Dict[str, Any]) -> Tuple:
+    """Return the device fields that change when its content changes.
+
+    refresh_rate is left out: the adaptive controller retunes it on its own,
+    and a new rate alone does not change what the device shows.
+    """
+    return tuple(device.get(field) for field in CONTENT_FIELDS)
+
+
+class DisplayCache:
+    """Cache /api/display results and refetch only when a device's content changes.
+
+    Every /api/display request may advance the device's playlist on the
+    server, so the cache never fetches for a device whose content fields are
+    unchanged since the last successful fetch.
+    """
+
+    def __init__(self, api: TRMNLApi) -> None:
+        """Initialize the cache."""
+        self.api = api
+        self._entries: Dict[str, DisplayInfo] = {}
+
+    def get(self, device_id: str) -> Optional[DisplayInfo]:
+        """Return the cached display of a device."""
+        return self._entries.get(device_id)
+
+    async def async_update(self, devices: Dict[str, Dict[str, Any]]) -> bool:
+        """Bring the cache in line with freshly polled device data.
+
+        Returns whether any entry was fetched.
+        """
+        for device_id in set(self._entries) - set(devices):
+            del self._entries[device_id]
+
+        stale = {
+            device_id: device
+            for device_id, device in devices.items()
+            if device.get("mac_address")
+            and (
+                device_id not in self._entries
+                or self._entries[device_id].content_key != content_key(device)
+            )
+        }
+        if not stale:
+            return False
+
+        semaphore = asyncio.Semaphore(DISPLAY_FETCH_CONCURRENCY)
+
+        async def _fetch(device_id: str, device: Dict[str, Any]) -> bool:
+            async with semaphore:
+                result = await self.api.get_display(device["mac_address"])
+            if not result:
+                # Keep the old entry; the next poll tries again
+                return False
+            image_url = result.get("image_url")
+            self._entries[device_id] = DisplayInfo(
+                image_url=self.api.absolute_url(image_url) if image_url else None,
+                filename=result.get("filename"),
+                refresh_rate=result.get("refresh_rate", device.get("refresh_rate")),
+                fetched_at=dt_util.utcnow(),
+                content_key=content_key(device),
+            )
+            return True
+
+        _LOGGER.debug("Fetching display content for %d devices", len(stale))
+        results = await asyncio.gather(
+            *(_fetch(device_id, device) for device_id, device in stale.items())
+        )
+        return any(results)
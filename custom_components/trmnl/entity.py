@@ -0,0 +1,75 @@
+"""Base entity for the TRMNL integration."""
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, MANUFACTURER, MODEL
+from .coordinator import TRMNLDataUpdateCoordinator
+
+
+class TRMNLEntity(CoordinatorEntity[TRMNLDataUpdateCoordinator]):
+    """Common base for entities attached to a single TRMNL device."""
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: TRMNLDataUpdateCoordinator, device_id: str) -> None:
+        """Initialize the entity and build its device info once."""
+        super().__init__(coordinator)
+        self._device_id = device_id
+
+        data = self.device_data or {}
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
+            name=f"TRMNL {data.get('label') or device_id}",
+            manufacturer=MANUFACTURER,
+            model=coordinator.models.get(str(data.get("model_id")), MODEL),
+            sw_version=data.get("firmware_version", "Unknown"),
+        )
+
+    @property
+    def device_data(self) -> Optional[Dict[str, Any]]:
+        """Return the latest data for this entity's device."""
+        if not self.coordinator.data:
+            return None
+        return self.coordinator.data.get(self._device_id)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.last_update_success and self.device_data is not None
+
+
+def server_device_info(coordinator: TRMNLDataUpdateCoordinator) -> DeviceInfo:
+    """Return device info for the Terminus server itself."""
+    health = coordinator.api.health
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"server_{coordinator.api.host}:{coordinator.api.port}")},
+        name=f"Terminus {coordinator.api.host}:{coordinator.api.port}",
+        manufacturer=MANUFACTURER,
+        model="Terminus Server",
+        sw_version=health.version if health else None,
+        configuration_url=coordinator.api.base_url,
+    )
+
+
+@callback
+def async_add_device_entities(
+    coordinator: TRMNLDataUpdateCoordinator,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    factory: Callable[[str], Iterable[Entity]],
+) -> None:
+    """Add entities for the current devices and for devices that appear later."""
+
+    @callback
+    def _async_add(device_ids: Iterable[str]) -> None:
+        async_add_entities(
+            [entity for device_id in device_ids for entity in factory(device_id)]
+        )
+
+    _async_add(coordinator.data or {})
+    config_entry.async_on_unload(coordinator.async_add_device_listener(_async_add))
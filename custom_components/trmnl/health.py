@@ -0,0 +1,49 @@
+"""Terminus server health and capabilities."""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional
+
+# Response headers a Terminus build may report its version in, most specific first.
+# Server is left out: it names the web server or proxy, not Terminus.
+VERSION_HEADERS = ("X-Terminus-Version", "X-Version")
+
+# Header listing features the server advertises, comma separated
+CAPABILITIES_HEADER = "X-Capabilities"
+
+
+@dataclass
+class ServerHealth:
+    """Result of one health check."""
+
+    ok: bool
+    checked_at: float  # time.monotonic() of the check
+    status: Optional[int] = None
+    latency_ms: Optional[float] = None
+    version: Optional[str] = None
+    capabilities: Dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the result as a JSON-friendly dict."""
+        return {
+            "ok": self.ok,
+            "status": self.status,
+            "latency_ms": self.latency_ms,
+            "version": self.version,
+            "capabilities": dict(self.capabilities),
+        }
+
+
+def parse_version(headers: Mapping[str, str]) -> Optional[str]:
+    """Return the server version from response headers, if reported.
+
+    Pass the response's case-insensitive headers so any spelling matches.
+    """
+    for name in VERSION_HEADERS:
+        if headers.get(name):
+            return headers[name]
+    return None
+
+
+def parse_capabilities(headers: Mapping[str, str]) -> Dict[str, Any]:
+    """Return the features advertised in response headers."""
+    advertised = headers.get(CAPABILITIES_HEADER) or ""
+    return {name.strip(): True for name in advertised.split(",") if name.strip()}
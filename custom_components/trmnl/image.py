@@ -0,0 +1,196 @@
+"""Support for TRMNL display images."""
+import asyncio
+import logging
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_AUTHENTICATED, HomeAssistantView
+from homeassistant.components.image import ImageEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import TRMNLDataUpdateCoordinator
+from .const import DOMAIN, IMAGE_TYPES
+from .display import DisplayInfo
+from .entity import TRMNLEntity, async_add_device_entities
+from .preview import Preview
+
+_LOGGER = logging.getLogger(__name__)
+
+PREVIEW_URL = "/api/trmnl/preview/{entity_id}"
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up TRMNL images from a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+
+    if "preview_entities" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["preview_entities"] = {}
+        hass.http.register_view(TRMNLPreviewView(hass))
+
+    async_add_device_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        lambda device_id: [TRMNLDisplayImage(coordinator, device_id)],
+    )
+
+
+class TRMNLDisplayImage(TRMNLEntity, ImageEntity):
+    """What a TRMNL panel shows, served from the coordinator's preview cache.
+
+    The image is downloaded only when the display content id (the filename
+    Terminus serves) changes and is newer than the cached preview; pushes
+    seed the cache directly.
+    """
+
+    def __init__(self, coordinator: TRMNLDataUpdateCoordinator, device_id: str) -> None:
+        """Initialize the image."""
+        super().__init__(coordinator, device_id)
+        ImageEntity.__init__(self, coordinator.hass)
+        self._attr_name = IMAGE_TYPES["display"]["name"]
+        self._attr_unique_id = f"{device_id}_display"
+        self._attr_icon = IMAGE_TYPES["display"].get("icon")
+        self._display: Optional[DisplayInfo] = None
+        self._fetch_lock = asyncio.Lock()
+        self._update_from_display()
+
+    async def async_added_to_hass(self) -> None:
+        """Make the image reachable through the preview view."""
+        await super().async_added_to_hass()
+        self.hass.data[DOMAIN]["preview_entities"][self.entity_id] = self
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop serving the image."""
+        self.hass.data[DOMAIN]["preview_entities"].pop(self.entity_id, None)
+        await super().async_will_remove_from_hass()
+
+    @property
+    def entity_picture(self) -> str:
+        """Point the frontend at the view that answers conditional requests."""
+        return f"{PREVIEW_URL.format(entity_id=self.entity_id)}?token={self.access_tokens[-1]}"
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Pick up a new display entry once per coordinator update."""
+        self._update_from_display()
+        super()._handle_coordinator_update()
+
+    def _update_from_display(self) -> None:
+        """Track the cached display and when the shown image last changed."""
+        self._display = self.coordinator.display.get(self._device_id)
+        preview = self.coordinator.previews.peek(self._device_id)
+        changed = [
+            moment
+            for moment in (
+                self._display.fetched_at if self._display else None,
+                preview.last_modified if preview else None,
+            )
+            if moment is not None
+        ]
+        self._attr_image_last_updated = max(changed) if changed else None
+
+    async def async_preview(self) -> Optional[Preview]:
+        """Return the cached preview, fetching it if the display has moved on."""
+        async with self._fetch_lock:
+            previews = self.coordinator.previews
+            preview = previews.get(self._device_id)
+            display = self._display
+            if display is None or not display.image_url:
+                return preview
+
+            content_id = display.filename or display.image_url
+            if preview is not None and (
+                preview.content_id == content_id or preview.stored_at >= display.fetched_at
+            ):
+                return preview
+
+            result = await self.coordinator.api.get_image(display.image_url)
+            if result is None:
+                return preview
+            content, content_type = result
+            return previews.put(self._device_id, content_id, content, content_type)
+
+    async def async_image(self) -> Optional[bytes]:
+        """Return bytes of the image."""
+        preview = await self.async_preview()
+        if preview is None:
+            return None
+        self._attr_content_type = preview.content_type
+        return preview.content
+
+    @property
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        """Return what the panel is showing."""
+        if self._display is None:
+            return None
+        return {
+            "image_url": self._display.image_url,
+            "filename": self._display.filename,
+            "refresh_rate": self._display.refresh_rate,
+            "fetched_at": self._display.fetched_at.isoformat(),
+        }
+
+
+class TRMNLPreviewView(HomeAssistantView):
+    """Serve panel previews with ETag and Last-Modified validators."""
+
+    url = PREVIEW_URL
+    name = "api:trmnl:preview"
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request, entity_id: str) -> web.StreamResponse:
+        """Return the preview, or 304 if the client's copy is current."""
+        entity: Optional[TRMNLDisplayImage] = self.hass.data[DOMAIN].get(
+            "preview_entities", {}
+        ).get(entity_id)
+        if entity is None:
+            raise web.HTTPNotFound()
+
+        # Same rule as the image proxy: a logged-in session or a current entity token
+        if not (
+            request[KEY_AUTHENTICATED]
+            or request.query.get("token") in entity.access_tokens
+        ):
+            raise web.HTTPForbidden()
+
+        preview = await entity.async_preview()
+        if preview is None:
+            raise web.HTTPNotFound()
+
+        headers = {
+            "ETag": preview.etag,
+            "Last-Modified": format_datetime(preview.last_modified, usegmt=True),
+            # Let browsers keep the bytes but always ask whether they changed
+            "Cache-Control": "private, no-cache",
+        }
+        if _not_modified(request, preview):
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=preview.content, content_type=preview.content_type, headers=headers)
+
+
+def _not_modified(request: web.Request, preview: Preview) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or preview.etag in tags or f"W/{preview.etag}" in tags
+
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since:
+        try:
+            return preview.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
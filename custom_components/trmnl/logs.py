@@ -0,0 +1,253 @@
+"""Device log batching, collection and aggregation."""
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .api import TRMNLApi
+from .const import (
+    LOG_BATCH_SIZE,
+    LOG_BATCH_WINDOW,
+    LOG_BUFFER_SIZE,
+    LOG_PULL_CONCURRENCY,
+    LOG_PULL_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_ERROR_WORDS = ("error", "fail", "timeout", "exception")
+
+# Responses that mean the server has no device log endpoint at all
+_PULL_UNSUPPORTED = (404, 405)
+
+
+def normalize_log_entry(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a firmware or Terminus log entry into the fields we aggregate.
+
+    Firmware posts nest status under device_status_stamps; Terminus returns
+    flat records. Both shapes are accepted.
+    """
+    stamps = raw.get("device_status_stamps") or {}
+    info = raw.get("additional_info") or {}
+    message = str(raw.get("log_message") or raw.get("message") or "")
+    code = raw.get("error_code") or raw.get("code") or raw.get("log_codeline") or raw.get("line")
+    lowered = message.lower()
+    is_error = bool(raw.get("error_code") or raw.get("code")) or any(word in lowered for word in _ERROR_WORDS)
+    image_failed = is_error and (
+        "image" in lowered or "filename_new" in info or bool(info.get("retry_attempt"))
+    )
+    return {
+        "id": raw.get("log_id") or raw.get("id"),
+        "timestamp": raw.get("creation_timestamp") or raw.get("created_at"),
+        "message": message,
+        "code": str(code) if code is not None else None,
+        "source": raw.get("log_sourcefile") or raw.get("source_path"),
+        "wake_reason": stamps.get("wakeup_reason") or raw.get("wake_reason"),
+        "firmware_version": stamps.get("current_fw_version") or raw.get("firmware_version"),
+        "error": is_error,
+        "image_fetch_failed": image_failed,
+    }
+
+
+def log_position(entry: Dict[str, Any]) -> Optional[Tuple[int, Any]]:
+    """Return where a normalized entry falls in its device's log, or None if unknown.
+
+    Numeric IDs order entries best; timestamps are the fallback. The first
+    element keeps positions of different kinds comparable.
+    """
+    entry_id = entry["id"]
+    if isinstance(entry_id, int) or (isinstance(entry_id, str) and entry_id.isdigit()):
+        return (2, int(entry_id))
+    timestamp = entry["timestamp"]
+    if isinstance(timestamp, (int, float)):
+        return (1, timestamp)
+    if timestamp:
+        return (0, str(timestamp))
+    return None
+
+
+class DeviceLogStats:
+    """Counters aggregated from one device's log entries."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.entries = 0
+        self.errors = 0
+        self.image_fetch_failures = 0
+        self.error_codes: Counter = Counter()
+        self.wake_reasons: Counter = Counter()
+        self.last_error: Optional[str] = None
+        self.last_entry_at: Optional[Any] = None
+        # Position of the newest pulled entry; each pull returns the whole history
+        self.watermark: Optional[Tuple[int, Any]] = None
+        self.pulled = False
+
+    def is_new(self, entry: Dict[str, Any]) -> bool:
+        """Return whether a pulled entry comes after everything pulled before."""
+        position = log_position(entry)
+        if position is None:
+            # Cannot be told apart from the same entry in a later pull
+            return not self.pulled
+        return self.watermark is None or position > self.watermark
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """Count an entry."""
+        self.entries += 1
+        self.last_entry_at = entry["timestamp"]
+        if entry["wake_reason"]:
+            self.wake_reasons[entry["wake_reason"]] += 1
+        if entry["error"]:
+            self.errors += 1
+            self.last_error = entry["message"]
+            if entry["code"]:
+                self.error_codes[entry["code"]] += 1
+        if entry["image_fetch_failed"]:
+            self.image_fetch_failures += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a JSON-friendly dict."""
+        return {
+            "entries": self.entries,
+            "errors": self.errors,
+            "image_fetch_failures": self.image_fetch_failures,
+            "error_codes": dict(self.error_codes.most_common(10)),
+            "wake_reasons": dict(self.wake_reasons),
+            "last_error": self.last_error,
+            "last_entry_at": self.last_entry_at,
+        }
+
+
+class LogPipeline:
+    """Batch outgoing log posts and aggregate device logs from Terminus.
+
+    Raw entries go to a bounded ring buffer; everything else is counters, so
+    sensors read summaries instead of HA seeing an event per log line.
+    """
+
+    def __init__(self, api: TRMNLApi) -> None:
+        """Initialize the pipeline and take over the API's log posts."""
+        self.api = api
+        api.log_pipeline = self
+        self.stats: Dict[str, DeviceLogStats] = {}
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=LOG_BUFFER_SIZE)
+        # Terminus versions without a device log endpoint are not asked again
+        self.pull_supported = True
+        self._last_pull = 0.0
+        self._batches: Dict[str, Tuple[List[Dict[str, Any]], asyncio.Future]] = {}
+        self._flush_tasks: set = set()
+
+    def ingest(self, device_id: str, entries: Iterable[Dict[str, Any]], pulled: bool = False) -> int:
+        """Aggregate raw log entries of a device; return how many were new.
+
+        Pulled entries older than the device's watermark were counted before.
+        """
+        stats = self.stats.setdefault(device_id, DeviceLogStats())
+        added = 0
+        newest = stats.watermark
+        for raw in entries:
+            entry = normalize_log_entry(raw)
+            if pulled:
+                if not stats.is_new(entry):
+                    continue
+                position = log_position(entry)
+                if position is not None and (newest is None or position > newest):
+                    newest = position
+            stats.add(entry)
+            self.recent.append({"device_id": device_id, **entry})
+            added += 1
+        if pulled:
+            stats.watermark = newest
+            stats.pulled = True
+        return added
+
+    def remove(self, device_id: str) -> None:
+        """Forget a device."""
+        self.stats.pop(device_id, None)
+
+    async def async_post(self, device_id: str, log_data: Dict[str, Any]) -> bool:
+        """Queue log entries for a device and wait for the batched POST.
+
+        Entries posted for the same device within LOG_BATCH_WINDOW go out as
+        one logs_array; a full batch is sent right away.
+        """
+        entries = (log_data.get("log") or {}).get("logs_array") or [log_data]
+        if not self.pull_supported:
+            # Otherwise they are counted when pulled back from Terminus
+            self.ingest(device_id, entries)
+
+        batch = self._batches.get(device_id)
+        if batch is None:
+            batch = self._batches[device_id] = ([], asyncio.get_running_loop().create_future())
+            task = asyncio.create_task(self._async_flush_later(device_id))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        batch[0].extend(entries)
+        future = batch[1]
+        if len(batch[0]) >= LOG_BATCH_SIZE:
+            await self._async_flush(device_id)
+        return await asyncio.shield(future)
+
+    async def _async_flush_later(self, device_id: str) -> None:
+        await asyncio.sleep(LOG_BATCH_WINDOW)
+        await self._async_flush(device_id)
+
+    async def _async_flush(self, device_id: str) -> None:
+        """Send a device's pending entries in one request."""
+        batch = self._batches.pop(device_id, None)
+        if batch is None:
+            return
+        entries, future = batch
+        ok = await self.api.send_device_log(device_id, {"log": {"logs_array": entries}}, batch=False)
+        if not future.done():
+            future.set_result(ok)
+
+    def pull_due(self) -> bool:
+        """Return whether a pull may run now."""
+        return self.pull_supported and time.monotonic() - self._last_pull >= LOG_PULL_INTERVAL
+
+    async def async_pull(self, devices: Dict[str, Dict[str, Any]]) -> bool:
+        """Fetch new device logs from Terminus, at most once per LOG_PULL_INTERVAL.
+
+        Returns whether any logs were ingested.
+        """
+        if not self.pull_due():
+            return False
+        self._last_pull = time.monotonic()
+
+        semaphore = asyncio.Semaphore(LOG_PULL_CONCURRENCY)
+
+        async def _pull(device_id: str, device: Dict[str, Any]) -> Tuple[Optional[int], bool]:
+            async with semaphore:
+                status, logs = await self.api.get_device_logs(device["id"])
+            if status in _PULL_UNSUPPORTED:
+                return status, False
+            return None, logs is not None and self.ingest(device_id, logs, pulled=True) > 0
+
+        pulls = [
+            (device_id, device) for device_id, device in devices.items() if device.get("id") is not None
+        ]
+        results = await asyncio.gather(*(_pull(device_id, device) for device_id, device in pulls))
+        # Failed or timed out pulls are retried next interval; only a missing endpoint stops them
+        if pulls and all(status in _PULL_UNSUPPORTED for status, _ in results):
+            _LOGGER.info("%s does not expose device logs; only posted logs are aggregated",
+                         self.api.base_url)
+            self.pull_supported = False
+        return any(ingested for _, ingested in results)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return fleet-wide totals."""
+        codes: Counter = Counter()
+        wake_reasons: Counter = Counter()
+        for stats in self.stats.values():
+            codes.update(stats.error_codes)
+            wake_reasons.update(stats.wake_reasons)
+        return {
+            "entries": sum(stats.entries for stats in self.stats.values()),
+            "errors": sum(stats.errors for stats in self.stats.values()),
+            "image_fetch_failures": sum(stats.image_fetch_failures for stats in self.stats.values()),
+            "error_codes": dict(codes.most_common(10)),
+            "wake_reasons": dict(wake_reasons),
+            "devices_with_errors": sum(1 for stats in self.stats.values() if stats.errors),
+            "pull_supported": self.pull_supported,
+        }
@@ -0,0 +1,120 @@
+"""Byte-budgeted caches and memory accounting."""
+import sys
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, MutableMapping, Optional, TypeVar
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import TRMNLDataUpdateCoordinator
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+def estimate_size(obj: Any) -> int:
+    """Return a rough deep size in bytes of JSON-like data."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(key) + estimate_size(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in obj)
+    return size
+
+
+class LRUCache(MutableMapping[K, V]):
+    """Mapping that evicts the least recently used entries beyond a byte budget.
+
+    Sizes are measured on insert; call resize() after mutating a stored value
+    in place. The newest entry is never evicted, even if it alone is too big.
+    """
+
+    def __init__(self, budget: int, sizeof: Callable[[V], int] = estimate_size) -> None:
+        """Initialize the cache."""
+        self.budget = budget
+        self.evictions = 0
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+        self._sizes: Dict[K, int] = {}
+        self.usage = 0
+
+    def __getitem__(self, key: K) -> V:
+        value = self._entries[key]
+        self._entries.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._measure(key)
+
+    def __delitem__(self, key: K) -> None:
+        del self._entries[key]
+        self.usage -= self._sizes.pop(key)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, key: K) -> Optional[V]:
+        """Return an entry without counting it as used."""
+        return self._entries.get(key)
+
+    def resize(self, key: K) -> None:
+        """Re-measure an entry that changed in place."""
+        if key in self._entries:
+            self._measure(key)
+
+    def usage_for(self, keys: Iterable[K]) -> int:
+        """Return the bytes held for the given keys."""
+        return sum(self._sizes.get(key, 0) for key in keys)
+
+    def _measure(self, key: K) -> None:
+        size = self._sizeof(self._entries[key])
+        self.usage += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        while self.usage > self.budget and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == key:
+                break
+            del self[oldest]
+            self.evictions += 1
+
+    def as_dict(self, keys: Optional[Iterable[K]] = None) -> Dict[str, Any]:
+        """Return usage figures, optionally limited to some keys."""
+        if keys is None:
+            entries, usage = len(self._entries), self.usage
+        else:
+            keys = [key for key in keys if key in self._entries]
+            entries, usage = len(keys), self.usage_for(keys)
+        return {
+            "entries": entries,
+            "bytes": usage,
+            "budget": self.budget,
+            "evictions": self.evictions,
+        }
+
+
+def memory_report(coordinator: "TRMNLDataUpdateCoordinator") -> Dict[str, Dict[str, Any]]:
+    """Return the memory held for one server's devices, per cache.
+
+    Caches shared by all servers are counted for this server's devices only.
+    """
+    devices = coordinator.data or {}
+    shared = coordinator.hass.data.get(DOMAIN, {})
+    report = {
+        "devices": {"entries": len(devices), "bytes": estimate_size(devices), "budget": None},
+        "previews": coordinator.previews.as_memory_dict(),
+        "device_logs": {
+            "entries": len(coordinator.logs.recent),
+            "bytes": estimate_size(list(coordinator.logs.recent)),
+            "budget": None,
+        },
+    }
+    if "rendered_frames" in shared:
+        report["rendered_frames"] = shared["rendered_frames"].as_dict(devices)
+    if "push_traces" in shared:
+        report["push_traces"] = shared["push_traces"].as_memory_dict(devices)
+    return report
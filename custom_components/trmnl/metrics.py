@@ -0,0 +1,141 @@
+"""Request instrumentation for Terminus and screenshot service calls."""
+import re
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+# Upper bounds of the latency buckets in milliseconds; the last bucket is open
+LATENCY_BUCKETS_MS = (
+    5, 10, 25, 50, 75, 100, 150, 250, 400, 600, 1000,
+    1500, 2500, 4000, 6000, 10000, 15000, 30000, 60000,
+)
+
+# Most recent requests per endpoint the error rate is computed over
+ERROR_RATE_WINDOW = 200
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """Collapse numeric path segments so /api/devices/12 and /api/devices/7 share stats."""
+    return _ID_SEGMENT.sub("/{id}", endpoint.split("?", 1)[0])
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with percentile estimates."""
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.counts: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total = 0
+        self.max_ms = 0.0
+
+    def add(self, duration_ms: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.total += 1
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Return the bucket upper bound below which the given fraction falls."""
+        if not self.total:
+            return None
+        threshold = fraction * self.total
+        running = 0
+        for index, count in enumerate(self.counts):
+            running += count
+            if running >= threshold:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return float(min(LATENCY_BUCKETS_MS[index], self.max_ms))
+                return self.max_ms
+        return self.max_ms
+
+
+class EndpointStats:
+    """Counters for one method and endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.requests = 0
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.total_ms = 0.0
+        self.latency = LatencyHistogram()
+        self.status_codes: Dict[str, int] = {}
+        # Outcomes of the latest requests, so an old outage does not linger in the rate
+        self.recent: Deque[bool] = deque(maxlen=ERROR_RATE_WINDOW)
+        self.recent_errors = 0
+
+    def add_outcome(self, is_error: bool) -> None:
+        """Count one request in the totals and the recent error window."""
+        if len(self.recent) == self.recent.maxlen:
+            self.recent_errors -= self.recent[0]
+        self.recent.append(is_error)
+        self.recent_errors += is_error
+        self.requests += 1
+        self.errors += is_error
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a JSON-friendly dict."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.recent_errors / len(self.recent), 4) if self.recent else 0.0,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "mean_ms": round(self.total_ms / self.requests, 1) if self.requests else None,
+            "p50_ms": self.latency.percentile(0.50),
+            "p95_ms": self.latency.percentile(0.95),
+            "p99_ms": self.latency.percentile(0.99),
+            "max_ms": round(self.latency.max_ms, 1),
+            "status_codes": dict(self.status_codes),
+        }
+
+
+class RequestMetrics:
+    """Per-endpoint request counters, byte totals and latency histograms."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.overall = EndpointStats()
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        status: Optional[int],
+        duration: float,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+    ) -> None:
+        """Record one completed (or failed) request.
+
+        A missing status means the request never got a response; that and any
+        status of 400 or above count as an error.
+        """
+        key = f"{method.upper()} {normalize_endpoint(endpoint)}"
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = EndpointStats()
+
+        duration_ms = duration * 1000
+        status_key = str(status) if status is not None else "error"
+        is_error = status is None or status >= 400
+        for target in (stats, self.overall):
+            target.add_outcome(is_error)
+            target.bytes_in += bytes_in
+            target.bytes_out += bytes_out
+            target.total_ms += duration_ms
+            target.latency.add(duration_ms)
+            target.status_codes[status_key] = target.status_codes.get(status_key, 0) + 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-friendly dict."""
+        return {
+            "overall": self.overall.as_dict(),
+            "endpoints": {
+                key: stats.as_dict() for key, stats in sorted(self.endpoints.items())
+            },
+        }
@@ -0,0 +1,248 @@
+"""Rotate panels through pre-rendered screens."""
+import asyncio
+import base64
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .api import TRMNLApi
+from .const import DOMAIN, PLAYLIST_SAVE_DELAY, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+# Renders one playlist item for a device and returns the image bytes
+ItemRenderer = Callable[[Dict[str, Any], str], Awaitable[bytes]]
+
+
+class Playlist:
+    """One device cycling through a fixed set of screens.
+
+    Every item is rendered once into its own Terminus screen. A rotation step
+    only re-renders the next item if its screen is older than max_age, then
+    points the device at it with a single PATCH.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: Dict[str, Any],
+        state: Dict[str, Any],
+        renderer: ItemRenderer,
+        on_change: Callable[[], None],
+    ) -> None:
+        """Initialize the playlist from its config and persisted state."""
+        self.hass = hass
+        self.config = config
+        self.playlist_id: str = config["playlist_id"]
+        self.device_id: str = config["device_friendly_id"]
+        self._renderer = renderer
+        self._on_change = on_change
+        # Screen per item: {"screen_id", "rendered_at"}; reset if the item count changed
+        screens = state.get("screens", [])
+        if len(screens) != len(config["items"]):
+            screens = [None] * len(config["items"])
+        self.state: Dict[str, Any] = {
+            "screens": screens,
+            "index": state.get("index", -1),
+        }
+        self.steps = 0
+        self.renders = 0
+        self.last_error: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._unsub: Optional[Callable[[], None]] = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start rotating, beginning with an immediate step."""
+        self._unsub = async_track_time_interval(
+            self.hass, self._async_step, timedelta(seconds=self.config["interval"])
+        )
+        self.hass.async_create_task(self._async_prepare_and_step())
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop rotating."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def api(self) -> Optional[TRMNLApi]:
+        """Return the API client of the server that owns the device."""
+        router = self.hass.data[DOMAIN].get("router")
+        return router.api_for_device(self.device_id) if router else None
+
+    async def _async_prepare_and_step(self) -> None:
+        """Pre-render every stale screen, then show the next item."""
+        api = self.api()
+        if api is None:
+            return
+        async with self._lock:
+            for index in range(len(self.config["items"])):
+                await self._async_ensure_screen(api, index)
+        await self._async_step()
+
+    async def _async_step(self, now: Optional[datetime] = None) -> None:
+        """Advance to the next item."""
+        api = self.api()
+        if api is None:
+            self.last_error = f"Device {self.device_id} not found on any Terminus server"
+            return
+
+        async with self._lock:
+            index = (self.state["index"] + 1) % len(self.config["items"])
+            screen_id = await self._async_ensure_screen(api, index)
+            if screen_id is None:
+                return
+
+            # The API client starts at the assignment method this server last accepted
+            assigned, _ = await api.assign_screen(self.device_id, screen_id, f"HA Playlist {self.playlist_id}")
+            if not assigned:
+                self.last_error = f"Could not assign screen {screen_id}"
+                return
+
+            self.state["index"] = index
+            self.steps += 1
+            self.last_error = None
+            self._on_change()
+
+        entry = self.hass.data[DOMAIN]["router"].entry_for_device(self.device_id)
+        controller = entry.get("refresh_controller") if entry else None
+        if controller is not None:
+            controller.record_content_change(self.device_id)
+
+    async def _async_ensure_screen(self, api: TRMNLApi, index: int) -> Optional[Any]:
+        """Return the screen of an item, rendering it first if missing or stale."""
+        screen = self.state["screens"][index]
+        if screen is not None and time.time() - screen["rendered_at"] < self.config["max_age"]:
+            return screen["screen_id"]
+
+        try:
+            image_bytes = await self._renderer(self.config["items"][index], self.device_id)
+        except Exception as err:  # noqa: BLE001 - keep rotating through what exists
+            self.last_error = f"Rendering item {index} failed: {err}"
+            _LOGGER.warning("Playlist %s: %s", self.playlist_id, self.last_error)
+            return screen["screen_id"] if screen else None
+        self.renders += 1
+        image_data = base64.b64encode(image_bytes).decode()
+
+        if screen is not None and await api.update_screen(
+            screen["screen_id"], {"image": {"data": image_data}}
+        ):
+            screen["rendered_at"] = time.time()
+            self._on_change()
+            return screen["screen_id"]
+
+        # First render of this item, or its screen was deleted on the server
+        result = await api.create_screen({
+            "name": f"HA_Playlist_{self.playlist_id}_{index}",
+            "label": f"HA Playlist {self.playlist_id} #{index + 1}",
+            "image": {"data": image_data},
+        })
+        if not result:
+            self.last_error = f"Could not create screen for item {index}"
+            return None
+        self.state["screens"][index] = {"screen_id": result.get("id"), "rendered_at": time.time()}
+        self._on_change()
+        return result.get("id")
+
+    def screen_ids(self) -> List[Any]:
+        """Return the Terminus screens this playlist owns."""
+        return [screen["screen_id"] for screen in self.state["screens"] if screen]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the playlist, its state and counters."""
+        return {
+            **self.config,
+            "state": self.state,
+            "steps": self.steps,
+            "renders": self.renders,
+            "last_error": self.last_error,
+        }
+
+
+class PlaylistManager:
+    """Persisted playlists shared by all servers."""
+
+    def __init__(self, hass: HomeAssistant, renderer: ItemRenderer) -> None:
+        """Initialize the manager."""
+        self.hass = hass
+        self.playlists: Dict[str, Playlist] = {}
+        self._renderer = renderer
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.playlists")
+
+    async def async_load(self) -> None:
+        """Restore and start stored playlists."""
+        data = await self._store.async_load() or {}
+        for stored in data.get("playlists", []):
+            self._async_add(stored["config"], stored.get("state", {}))
+
+    @callback
+    def async_set(self, config: Dict[str, Any]) -> None:
+        """Create or replace a playlist.
+
+        Screens of a replaced playlist are reused when the items are unchanged.
+        """
+        previous = self.playlists.get(config["playlist_id"])
+        state = {}
+        if previous is not None and previous.config["items"] == config["items"]:
+            state = previous.state
+        elif previous is not None:
+            self.hass.async_create_task(self._async_delete_screens(previous))
+        self._async_add(config, state)
+        self._async_save()
+
+    async def async_remove(self, playlist_id: str) -> bool:
+        """Stop a playlist and delete its screens; return False if it did not exist."""
+        playlist = self.playlists.pop(playlist_id, None)
+        if playlist is None:
+            return False
+        playlist.async_stop()
+        self._async_save()
+        await self._async_delete_screens(playlist)
+        return True
+
+    @staticmethod
+    async def _async_delete_screens(playlist: Playlist) -> None:
+        """Delete the Terminus screens a playlist no longer needs."""
+        api = playlist.api()
+        if api is None:
+            return
+        for screen_id in playlist.screen_ids():
+            await api.delete_screen(str(screen_id))
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop every playlist."""
+        for playlist in self.playlists.values():
+            playlist.async_stop()
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        """Return all playlists for diagnostics."""
+        return [playlist.as_dict() for playlist in self.playlists.values()]
+
+    @callback
+    def _async_add(self, config: Dict[str, Any], state: Dict[str, Any]) -> None:
+        previous = self.playlists.pop(config["playlist_id"], None)
+        if previous is not None:
+            previous.async_stop()
+        playlist = self.playlists[config["playlist_id"]] = Playlist(
+            self.hass, config, state, self._renderer, self._async_save
+        )
+        playlist.async_start()
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(
+            lambda: {
+                "playlists": [
+                    {"config": playlist.config, "state": playlist.state}
+                    for playlist in self.playlists.values()
+                ]
+            },
+            PLAYLIST_SAVE_DELAY,
+        )
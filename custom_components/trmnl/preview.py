@@ -0,0 +1,92 @@
+"""In-memory cache of panel preview images with HTTP validators."""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from homeassistant.util import dt as dt_util
+
+from .const import MEMORY_PREVIEW_BUDGET
+from .memory import LRUCache
+
+
+@dataclass
+class Preview:
+    """Image bytes for one device and the content they were fetched for."""
+
+    content_id: str
+    content: bytes
+    content_type: str
+    etag: str
+    last_modified: datetime  # when the bytes last changed
+    stored_at: datetime  # when the content was last stored, changed or not
+
+
+def sniff_content_type(content: bytes, default: str = "image/png") -> str:
+    """Guess the image type from its magic bytes."""
+    if content.startswith(b"\x89PNG"):
+        return "image/png"
+    if content.startswith(b"BM"):
+        return "image/bmp"
+    if content.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    return default
+
+
+class PreviewCache:
+    """Last pushed or displayed image per device.
+
+    Least recently viewed images are dropped beyond the byte budget; the image
+    entity fetches them again from Terminus when next asked.
+    """
+
+    def __init__(self, budget: int = MEMORY_PREVIEW_BUDGET) -> None:
+        """Initialize the cache."""
+        self._previews: LRUCache[str, Preview] = LRUCache(
+            budget, lambda preview: len(preview.content)
+        )
+
+    def get(self, device_id: str) -> Optional[Preview]:
+        """Return the cached preview of a device."""
+        return self._previews.get(device_id)
+
+    def peek(self, device_id: str) -> Optional[Preview]:
+        """Return the cached preview without counting it as viewed."""
+        return self._previews.peek(device_id)
+
+    def put(
+        self,
+        device_id: str,
+        content_id: str,
+        content: bytes,
+        content_type: Optional[str] = None,
+    ) -> Preview:
+        """Store an image; the validators only change when the bytes do."""
+        now = dt_util.utcnow()
+        etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        previous = self._previews.peek(device_id)
+        if previous is not None and previous.etag == etag:
+            previous.content_id = content_id
+            previous.stored_at = now
+            return previous
+
+        preview = self._previews[device_id] = Preview(
+            content_id=content_id,
+            content=content,
+            content_type=content_type or sniff_content_type(content),
+            etag=etag,
+            # HTTP dates have one-second resolution
+            last_modified=now.replace(microsecond=0),
+            stored_at=now,
+        )
+        return preview
+
+    def retain(self, device_ids: Iterable[str]) -> None:
+        """Drop previews of devices that no longer exist."""
+        keep = set(device_ids)
+        for device_id in set(self._previews) - keep:
+            del self._previews[device_id]
+
+    def as_memory_dict(self) -> Dict[str, Any]:
+        """Return usage figures."""
+        return self._previews.as_dict()
@@ -0,0 +1,76 @@
+"""Record TRMNL service calls for replay against stand-in servers."""
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+from homeassistant.const import EVENT_CALL_SERVICE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, RECORDING_FORMAT_VERSION, RECORDING_MAX_CALLS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CallRecorder:
+    """Capture the timing and data of selected service calls.
+
+    Calls are taken from the call_service events Home Assistant already fires,
+    so recording adds no work to the service handlers. Only the most recent
+    max_calls calls are kept.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        services: Iterable[str],
+        max_calls: int = RECORDING_MAX_CALLS,
+    ) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self.services = set(services)
+        self.calls: Deque[Dict[str, Any]] = deque(maxlen=max_calls)
+        self.started_at = dt_util.utcnow()
+        self._t0 = time.monotonic()
+        self._unsub: Optional[Callable[[], None]] = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening for service calls."""
+        self._unsub = self.hass.bus.async_listen(
+            EVENT_CALL_SERVICE, self._async_record, event_filter=self._async_filter
+        )
+
+    @callback
+    def async_stop(self) -> Dict[str, Any]:
+        """Stop listening and return the recording."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        return {
+            "version": RECORDING_FORMAT_VERSION,
+            "started_at": self.started_at.isoformat(),
+            "duration": round(time.monotonic() - self._t0, 3),
+            "calls": list(self.calls),
+        }
+
+    @callback
+    def _async_filter(self, event_data: Dict[str, Any]) -> bool:
+        return event_data.get("domain") == DOMAIN and event_data.get("service") in self.services
+
+    @callback
+    def _async_record(self, event: Event) -> None:
+        self.calls.append({
+            "offset": round(time.monotonic() - self._t0, 3),
+            "service": event.data["service"],
+            # Round-trip through JSON so the recording only holds plain values
+            "data": json.loads(json.dumps(event.data.get("service_data") or {}, default=str)),
+        })
+
+
+def write_recording(path: str, recording: Dict[str, Any]) -> None:
+    """Write a recording to disk; runs in the executor."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(recording, file, indent=1)
@@ -0,0 +1,162 @@
+"""Adaptive refresh-rate controller for TRMNL devices."""
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    ADAPTIVE_REFRESH_CONCURRENCY,
+    ADAPTIVE_REFRESH_HISTORY,
+    ADAPTIVE_REFRESH_HOLD_TIME,
+    ADAPTIVE_REFRESH_HYSTERESIS,
+    ADAPTIVE_REFRESH_INTERVAL,
+    ADAPTIVE_REFRESH_LOW_BATTERY,
+    ADAPTIVE_REFRESH_LOW_BATTERY_FACTOR,
+    CONTENT_FIELDS,
+)
+from .coordinator import TRMNLDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AdaptiveRefreshController:
+    """Tune each device's refresh_rate to how often its content changes."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TRMNLDataUpdateCoordinator,
+        min_rate: int,
+        max_rate: int,
+    ) -> None:
+        """Initialize the controller."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._started = time.time()
+        self._changes: Dict[str, Deque[float]] = {}
+        self._signatures: Dict[str, Tuple[Any, ...]] = {}
+        self._last_applied: Dict[str, float] = {}
+        self._unsubscribers: List[Callable[[], None]] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Start observing coordinator updates and evaluating on a timer."""
+        self._unsubscribers.append(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+        self._unsubscribers.append(
+            async_track_time_interval(
+                self.hass,
+                self._async_evaluate,
+                timedelta(seconds=ADAPTIVE_REFRESH_INTERVAL),
+            )
+        )
+        self._handle_coordinator_update()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the controller."""
+        while self._unsubscribers:
+            self._unsubscribers.pop()()
+
+    @callback
+    def record_content_change(self, device_id: str, timestamp: Optional[float] = None) -> None:
+        """Record that new content was assigned to a device."""
+        history = self._changes.setdefault(
+            device_id, deque(maxlen=ADAPTIVE_REFRESH_HISTORY)
+        )
+        history.append(timestamp or time.time())
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Detect content changes from the polled device data."""
+        for device_id, device in (self.coordinator.data or {}).items():
+            signature = tuple(device.get(field) for field in CONTENT_FIELDS)
+            previous = self._signatures.get(device_id)
+            self._signatures[device_id] = signature
+            if previous is not None and previous != signature:
+                self.record_content_change(device_id)
+
+    def change_interval(self, device_id: str, device: Dict[str, Any], now: float) -> Optional[float]:
+        """Estimate how many seconds pass between content changes.
+
+        Until two changes have been seen, the time observed is only a lower
+        bound, so the estimate never asks a device to poll faster than its
+        current refresh_rate. Returns None when there is nothing to go on.
+        """
+        history = self._changes.get(device_id)
+        quiet = now - history[-1] if history else now - self._started
+        intervals = [b - a for a, b in zip(history, list(history)[1:])] if history else []
+        if not intervals:
+            current = device.get("refresh_rate")
+            if not current:
+                return None
+            observed = max(quiet, history[-1] - self._started) if history else quiet
+            return max(observed, 2 * current)
+        # A long quiet spell since the last change outweighs older, busier history
+        return max(median(intervals), quiet)
+
+    def compute_target(self, device_id: str, device: Dict[str, Any], now: float) -> Optional[int]:
+        """Return the desired refresh_rate for a device, or None to leave it."""
+        interval = self.change_interval(device_id, device, now)
+        if interval is None:
+            return None
+        # Poll twice per expected change so new content shows within half an interval
+        target = interval / 2
+
+        forecast = self.coordinator.battery.forecast(device_id)
+        if forecast is not None and forecast.percent <= ADAPTIVE_REFRESH_LOW_BATTERY:
+            target *= ADAPTIVE_REFRESH_LOW_BATTERY_FACTOR
+
+        return int(min(max(target, self.min_rate), self.max_rate))
+
+    def pending_updates(self, now: float) -> Dict[str, int]:
+        """Return refresh_rate changes that clear the hysteresis band."""
+        updates = {}
+        for device_id, device in (self.coordinator.data or {}).items():
+            # Rates written before a restart count as applied when the controller started
+            if now - self._last_applied.get(device_id, self._started) < ADAPTIVE_REFRESH_HOLD_TIME:
+                continue
+
+            target = self.compute_target(device_id, device, now)
+            if target is None:
+                continue
+            current = device.get("refresh_rate")
+            if current:
+                if abs(target - current) / current < ADAPTIVE_REFRESH_HYSTERESIS:
+                    continue
+            updates[device_id] = target
+
+        return updates
+
+    async def _async_evaluate(self, _now: Optional[datetime] = None) -> None:
+        """Apply pending refresh_rate changes as one batch."""
+        now = time.time()
+        updates = self.pending_updates(now)
+        if not updates:
+            return
+
+        _LOGGER.info("Adaptive refresh: updating %d devices: %s", len(updates), updates)
+        semaphore = asyncio.Semaphore(ADAPTIVE_REFRESH_CONCURRENCY)
+
+        async def _apply(device_id: str, rate: int) -> None:
+            async with semaphore:
+                result = await self.coordinator.api.set_device_refresh_rate(device_id, rate)
+                if result is False:
+                    _LOGGER.warning("Adaptive refresh: failed to set %s to %ss", device_id, rate)
+                else:
+                    # Queued updates reach the device once Terminus is back
+                    self._last_applied[device_id] = now
+
+        await asyncio.gather(
+            *(_apply(device_id, rate) for device_id, rate in updates.items())
+        )
+        await self.coordinator.async_request_refresh()
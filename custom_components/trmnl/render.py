@@ -0,0 +1,183 @@
+"""Direct rendering of text panels to 1-bit bitmaps with Pillow.
+
+Everything here is blocking and meant to run in the executor.
+"""
+import io
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from .const import RENDER_FONT_CACHE_SIZE
+
+# Lines starting with this marker are drawn with the title font
+TITLE_MARKER = "# "
+
+
+@dataclass
+class Layout:
+    """How rendered template text is placed on the panel."""
+
+    font_size: int = 28
+    title_font_size: int = 48
+    padding: int = 20
+    line_spacing: int = 6
+    align: str = "left"
+    font: Optional[str] = None  # path to a TrueType font; Pillow's default if unset
+    invert: bool = False
+
+
+@lru_cache(maxsize=RENDER_FONT_CACHE_SIZE)
+def load_font(path: Optional[str], size: int) -> ImageFont.ImageFont:
+    """Load a font once per path and size."""
+    if path:
+        return ImageFont.truetype(path, size)
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 only has the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def _wrap(text: str, font: ImageFont.ImageFont, max_width: int) -> List[str]:
+    """Break a line into pieces no wider than max_width."""
+    words = text.split(" ")
+    lines: List[str] = []
+    current = ""
+    for word in words:
+        candidate = f"{current} {word}" if current else word
+        if current and font.getlength(candidate) > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    lines.append(current)
+    return lines
+
+
+def layout_lines(text: str, width: int, layout: Layout) -> List[Tuple[str, ImageFont.ImageFont, int]]:
+    """Return (text, font, line height) for each wrapped output line."""
+    body_font = load_font(layout.font, layout.font_size)
+    title_font = load_font(layout.font, layout.title_font_size)
+    max_width = width - 2 * layout.padding
+
+    lines = []
+    for raw in text.strip("\n").splitlines():
+        if raw.startswith(TITLE_MARKER):
+            font, size, raw = title_font, layout.title_font_size, raw[len(TITLE_MARKER):]
+        else:
+            font, size = body_font, layout.font_size
+        if not raw.strip():
+            lines.append(("", font, size // 2))
+            continue
+        for piece in _wrap(raw.rstrip(), font, max_width):
+            lines.append((piece, font, size))
+    return lines
+
+
+def render_text_image(text: str, width: int, height: int, layout: Layout) -> Image.Image:
+    """Rasterize text to a 1-bit image of the given size."""
+    background, foreground = (0, 1) if layout.invert else (1, 0)
+    image = Image.new("1", (width, height), background)
+    draw = ImageDraw.Draw(image)
+
+    y = layout.padding
+    for line, font, size in layout_lines(text, width, layout):
+        if y + size > height - layout.padding:
+            break
+        if line:
+            line_width = font.getlength(line)
+            if layout.align == "center":
+                x = (width - line_width) / 2
+            elif layout.align == "right":
+                x = width - layout.padding - line_width
+            else:
+                x = layout.padding
+            draw.text((x, y), line, font=font, fill=foreground)
+        y += size + layout.line_spacing
+
+    return image
+
+
+def render_text(text: str, width: int, height: int, layout: Layout) -> bytes:
+    """Rasterize text to a 1-bit PNG of the given size."""
+    return encode_png(render_text_image(text, width, height, layout))
+
+
+@dataclass
+class Region:
+    """A rectangle of the frame filled from its own template."""
+
+    name: str
+    x: int
+    y: int
+    width: int
+    height: int
+    layout: Layout = field(default_factory=Layout)
+
+
+class TiledFrame:
+    """A cached panel frame made of a static base and independently updated regions."""
+
+    def __init__(self) -> None:
+        """Initialize an empty frame."""
+        self.size: Optional[Tuple[int, int]] = None
+        self.frame: Optional[Image.Image] = None
+        self.base_text: Optional[str] = None
+        # What the base was drawn from: size, text, layout and region rectangles
+        self._base_key: Optional[Tuple] = None
+        # Region and text each tile was last drawn with
+        self.tiles: Dict[str, Tuple[Region, str]] = {}
+        # Caller-defined signature of each region's inputs, used to skip template renders
+        self.signatures: Dict[str, Tuple] = {}
+
+    def update(
+        self,
+        size: Tuple[int, int],
+        base_text: str,
+        base_layout: Layout,
+        regions: List[Tuple[Region, str]],
+    ) -> Tuple[Optional[bytes], List[str]]:
+        """Redraw what changed and return the encoded frame and the changed regions.
+
+        A region that moved, resized or was dropped would leave stale pixels
+        behind, so any change to the set of rectangles redraws the base too.
+        The frame is None when nothing changed, so there is nothing to upload.
+        """
+        changed: List[str] = []
+        rectangles = tuple((r.name, r.x, r.y, r.width, r.height) for r, _ in regions)
+        base_key = (size, base_text, base_layout, rectangles)
+        if self.frame is None or base_key != self._base_key:
+            self.frame = render_text_image(base_text, size[0], size[1], base_layout)
+            self.size = size
+            self.base_text = base_text
+            self._base_key = base_key
+            self.tiles = {}
+            changed.append("base")
+
+        for region, text in regions:
+            if self.tiles.get(region.name) == (region, text):
+                continue
+            tile = render_text_image(text, region.width, region.height, region.layout)
+            self.frame.paste(tile, (region.x, region.y))
+            self.tiles[region.name] = (region, text)
+            changed.append(region.name)
+
+        if not changed:
+            return None, changed
+        return encode_png(self.frame), changed
+
+    @property
+    def nbytes(self) -> int:
+        """Return the approximate memory held by the frame."""
+        # Pillow keeps 1-bit images at one byte per pixel
+        size = self.size[0] * self.size[1] if self.frame is not None else 0
+        return size + len(self.base_text or "") + sum(len(text) for _, text in self.tiles.values())
+
+
+def encode_png(image: Image.Image) -> bytes:
+    """Encode a bitmap as a 1-bit PNG."""
+    buffer = io.BytesIO()
+    image.convert("1").save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
@@ -0,0 +1,345 @@
+"""Staged firmware rollouts across the fleet."""
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import TRMNLApi
+from .connectivity import expected_check_in, in_sleep_window
+from .const import (
+    DOMAIN,
+    EVENT_FIRMWARE_ROLLOUT,
+    ROLLOUT_CHECK_INTERVAL,
+    ROLLOUT_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Device rollout states; enabled devices are the ones still being waited for
+PENDING = "pending"
+ENABLED = "enabled"
+UPDATED = "updated"
+FAILED = "failed"
+OFFLINE = "offline"
+
+# Rollout states
+RUNNING = "running"
+COMPLETED = "completed"
+HALTED = "halted"
+CANCELLED = "cancelled"
+
+
+def plan_waves(device_ids: List[str], wave_size: Optional[int], wave_percent: Optional[float]) -> List[List[str]]:
+    """Split devices into waves of a fixed count or a share of the fleet."""
+    if wave_size is None:
+        wave_size = math.ceil(len(device_ids) * (wave_percent or 100) / 100)
+    wave_size = max(1, wave_size)
+    return [device_ids[i:i + wave_size] for i in range(0, len(device_ids), wave_size)]
+
+
+class FirmwareRollout:
+    """Enable firmware updates wave by wave.
+
+    The next wave starts once every device of the current one has checked in
+    with a new firmware_version, or has been given up on after wave_timeout.
+    If the failed and offline devices of a wave exceed halt_threshold percent,
+    the rollout halts and updates are turned back off where still pending.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: Dict[str, Any],
+        state: Dict[str, Any],
+        on_change: Callable[[], None],
+    ) -> None:
+        """Initialize the rollout from its config and persisted state."""
+        self.hass = hass
+        self.config = config
+        self.rollout_id: str = config["rollout_id"]
+        self._on_change = on_change
+        self.state: Dict[str, Any] = {
+            "status": state.get("status", RUNNING),
+            "wave": state.get("wave", -1),
+            "wave_started_at": state.get("wave_started_at"),
+            "reason": state.get("reason"),
+            # Per device: status, firmware version and last_seen when enabled,
+            # and the firmware_update flag to restore afterwards
+            "devices": state.get("devices") or {
+                device_id: {"status": PENDING} for wave in config["waves"] for device_id in wave
+            },
+        }
+        self._lock = asyncio.Lock()
+        self._unsub: Optional[Callable[[], None]] = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start or resume the rollout."""
+        if self.state["status"] != RUNNING:
+            return
+        self._unsub = async_track_time_interval(
+            self.hass, self._async_evaluate, timedelta(seconds=ROLLOUT_CHECK_INTERVAL)
+        )
+        self.hass.async_create_task(self._async_evaluate())
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop checking on the rollout."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    async def async_cancel(self) -> None:
+        """Stop the rollout and turn updates off where they are still pending."""
+        async with self._lock:
+            if self.state["status"] == RUNNING:
+                await self._async_finish(CANCELLED, "Cancelled")
+
+    def _entry(self, device_id: str) -> Optional[Dict[str, Any]]:
+        router = self.hass.data[DOMAIN].get("router")
+        return router.entry_for_device(device_id) if router else None
+
+    def _device_data(self, device_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entry(device_id)
+        if entry is None:
+            return None
+        return (entry["coordinator"].data or {}).get(device_id)
+
+    async def _async_evaluate(self, now: Optional[datetime] = None) -> None:
+        """Classify the current wave's devices and move on, halt, or finish."""
+        async with self._lock:
+            if self.state["status"] != RUNNING:
+                return
+            if self.state["wave"] >= 0:
+                self._check_wave()
+                if self.state["status"] != RUNNING:
+                    return
+                reason = self._halt_reason()
+                if reason:
+                    await self._async_finish(HALTED, reason)
+                    return
+                if any(self.state["devices"][d]["status"] == ENABLED for d in self._current_wave()):
+                    return
+                await self._async_restore(UPDATED, FAILED, OFFLINE)
+
+            if self.state["wave"] + 1 >= len(self.config["waves"]):
+                await self._async_finish(COMPLETED, None)
+                return
+            await self._async_start_wave(self.state["wave"] + 1)
+
+    def _current_wave(self) -> List[str]:
+        return self.config["waves"][self.state["wave"]]
+
+    def _check_wave(self) -> None:
+        """Mark devices of the current wave as updated, failed or offline.
+
+        A device is offline once it misses its check-in deadline, counted from
+        when updates were enabled. As for connectivity, a sleep window moves
+        the deadline past wake-up, and the wave timeout waits for sleeping
+        devices to wake.
+        """
+        now = time.time()
+        timed_out = now - self.state["wave_started_at"] >= self.config["wave_timeout"]
+        started = dt_util.utc_from_timestamp(self.state["wave_started_at"]).isoformat()
+        tz = dt_util.get_time_zone(self.hass.config.time_zone) or dt_util.UTC
+        utcnow = dt_util.utcnow()
+        for device_id in self._current_wave():
+            status = self.state["devices"][device_id]
+            if status["status"] != ENABLED:
+                continue
+            data = self._device_data(device_id)
+            if data is not None and self._is_updated(status, data):
+                status["status"] = UPDATED
+                status["to_version"] = data.get("firmware_version")
+                continue
+
+            checked_in = data is not None and data.get("last_seen") != status["last_seen"]
+            if checked_in:
+                if timed_out:
+                    # Checked in since updates were enabled, but still on the old firmware
+                    status["status"] = FAILED
+                continue
+
+            if data is None:
+                overdue = asleep = False
+            else:
+                deadline = expected_check_in({**data, "last_seen": started}, tz)
+                overdue = deadline is not None and utcnow > deadline
+                asleep = in_sleep_window(data, utcnow, tz)
+            if overdue or (timed_out and not asleep):
+                status["status"] = OFFLINE
+        self._on_change()
+
+    def _is_updated(self, status: Dict[str, Any], data: Dict[str, Any]) -> bool:
+        version = data.get("firmware_version")
+        if self.config.get("target_version"):
+            return version == self.config["target_version"]
+        return version is not None and version != status["from_version"]
+
+    def _halt_reason(self) -> Optional[str]:
+        wave = self._current_wave()
+        statuses = [self.state["devices"][device_id]["status"] for device_id in wave]
+        bad = statuses.count(FAILED) + statuses.count(OFFLINE)
+        if bad * 100 / len(wave) > self.config["halt_threshold"]:
+            return (
+                f"Wave {self.state['wave'] + 1}: {statuses.count(FAILED)} failed and "
+                f"{statuses.count(OFFLINE)} offline of {len(wave)} devices"
+            )
+        return None
+
+    async def _async_start_wave(self, wave: int) -> None:
+        """Enable firmware updates for every device of a wave."""
+        self.state["wave"] = wave
+        self.state["wave_started_at"] = time.time()
+        by_api: Dict[TRMNLApi, Dict[str, Dict[str, Any]]] = {}
+        for device_id in self.config["waves"][wave]:
+            status = self.state["devices"][device_id]
+            entry = self._entry(device_id)
+            data = self._device_data(device_id)
+            if entry is None or data is None:
+                status["status"] = OFFLINE
+                continue
+            if self.config.get("target_version") and data.get("firmware_version") == self.config["target_version"]:
+                status.update({"status": UPDATED, "to_version": data["firmware_version"]})
+                continue
+            status.update({
+                "status": ENABLED,
+                "from_version": data.get("firmware_version"),
+                "last_seen": data.get("last_seen"),
+                "firmware_update": bool(data.get("firmware_update")),
+            })
+            by_api.setdefault(entry["api"], {})[device_id] = {"firmware_update": True}
+
+        for api, updates in by_api.items():
+            results = await api.update_devices(updates)
+            for device_id, success in results.items():
+                if not success:
+                    self.state["devices"][device_id]["status"] = FAILED
+
+        _LOGGER.info("Firmware rollout %s: wave %d of %d enabled for %d devices",
+                     self.rollout_id, wave + 1, len(self.config["waves"]),
+                     sum(len(updates) for updates in by_api.values()))
+        self._fire("wave_started")
+        self._on_change()
+
+    async def _async_restore(self, *statuses: str) -> None:
+        """Put back the firmware_update flag of devices in the given states."""
+        by_api: Dict[TRMNLApi, Dict[str, Dict[str, Any]]] = {}
+        for device_id in self._current_wave() if self.state["wave"] >= 0 else []:
+            status = self.state["devices"][device_id]
+            if status["status"] not in statuses or status.get("firmware_update", True) or status.get("restored"):
+                continue
+            entry = self._entry(device_id)
+            if entry is not None:
+                by_api.setdefault(entry["api"], {})[device_id] = {"firmware_update": False}
+                status["restored"] = True
+        for api, updates in by_api.items():
+            await api.update_devices(updates)
+
+    async def _async_finish(self, status: str, reason: Optional[str]) -> None:
+        """End the rollout; devices not yet updated do not keep updates enabled."""
+        await self._async_restore(ENABLED, FAILED, OFFLINE, UPDATED)
+        self.state["status"] = status
+        self.state["reason"] = reason
+        self.async_stop()
+        if status == HALTED:
+            _LOGGER.warning("Firmware rollout %s halted: %s", self.rollout_id, reason)
+        else:
+            _LOGGER.info("Firmware rollout %s %s", self.rollout_id, status)
+        self._fire(status)
+        self._on_change()
+
+    def _fire(self, event: str) -> None:
+        self.hass.bus.async_fire(EVENT_FIRMWARE_ROLLOUT, {
+            "rollout_id": self.rollout_id,
+            "event": event,
+            "wave": self.state["wave"] + 1,
+            "waves": len(self.config["waves"]),
+            "reason": self.state["reason"],
+            "counts": self.counts(),
+        })
+
+    def counts(self) -> Dict[str, int]:
+        """Return how many devices are in each state."""
+        counts = {state: 0 for state in (PENDING, ENABLED, UPDATED, FAILED, OFFLINE)}
+        for status in self.state["devices"].values():
+            counts[status["status"]] += 1
+        return counts
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the rollout, its state and counters."""
+        return {**self.config, "state": self.state, "counts": self.counts()}
+
+
+class RolloutManager:
+    """Persisted firmware rollouts shared by all servers."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the manager."""
+        self.hass = hass
+        self.rollouts: Dict[str, FirmwareRollout] = {}
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.firmware_rollouts")
+
+    async def async_load(self) -> None:
+        """Restore stored rollouts and resume the running ones."""
+        data = await self._store.async_load() or {}
+        for stored in data.get("rollouts", []):
+            self._async_add(stored["config"], stored.get("state", {}))
+
+    async def async_start(self, config: Dict[str, Any]) -> FirmwareRollout:
+        """Start a rollout, cancelling a running one with the same ID."""
+        previous = self.rollouts.get(config["rollout_id"])
+        if previous is not None:
+            await previous.async_cancel()
+        rollout = self._async_add(config, {})
+        self._async_save()
+        return rollout
+
+    async def async_cancel(self, rollout_id: str) -> bool:
+        """Cancel a rollout; return False if it does not exist."""
+        rollout = self.rollouts.get(rollout_id)
+        if rollout is None:
+            return False
+        await rollout.async_cancel()
+        return True
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop checking on every rollout; running ones resume after a restart."""
+        for rollout in self.rollouts.values():
+            rollout.async_stop()
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        """Return all rollouts for diagnostics."""
+        return [rollout.as_dict() for rollout in self.rollouts.values()]
+
+    @callback
+    def _async_add(self, config: Dict[str, Any], state: Dict[str, Any]) -> FirmwareRollout:
+        previous = self.rollouts.pop(config["rollout_id"], None)
+        if previous is not None:
+            previous.async_stop()
+        rollout = self.rollouts[config["rollout_id"]] = FirmwareRollout(
+            self.hass, config, state, self._async_save
+        )
+        rollout.async_start()
+        return rollout
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(
+            lambda: {
+                "rollouts": [
+                    {"config": rollout.config, "state": rollout.state}
+                    for rollout in self.rollouts.values()
+                ]
+            },
+            ROLLOUT_SAVE_DELAY,
+        )
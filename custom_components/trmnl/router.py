@@ -0,0 +1,144 @@
+"""Routing and shared poll scheduling across Terminus servers."""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import TRMNLApi
+from .const import DEFAULT_SCAN_INTERVAL
+from .coordinator import TRMNLDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class TRMNLRouter:
+    """Map devices to the Terminus server that owns them.
+
+    Also runs the single poll scheduler: instead of every coordinator keeping
+    its own timer, servers are refreshed round-robin so that each is polled once
+    per scan interval and polls are spread evenly across that interval.
+    """
+
+    def __init__(self, hass: HomeAssistant, scan_interval: int = DEFAULT_SCAN_INTERVAL) -> None:
+        """Initialize the router."""
+        self.hass = hass
+        self.scan_interval = scan_interval
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._next_index = 0
+        self._unsub_timer: Optional[Callable[[], None]] = None
+
+    @property
+    def entries(self) -> List[Dict[str, Any]]:
+        """Return the data of every registered config entry."""
+        return list(self._entries.values())
+
+    @property
+    def apis(self) -> List[TRMNLApi]:
+        """Return every registered API client."""
+        return [entry["api"] for entry in self._entries.values()]
+
+    @callback
+    def async_register(self, entry_id: str, entry_data: Dict[str, Any]) -> None:
+        """Add a server and reschedule polling."""
+        self._entries[entry_id] = entry_data
+        self._async_reschedule()
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Remove a server and reschedule polling."""
+        self._entries.pop(entry_id, None)
+        self._async_reschedule()
+
+    def entry_for_device(self, device_id: str) -> Optional[Dict[str, Any]]:
+        """Return the entry data of the server that owns a device."""
+        for entry in self._entries.values():
+            data = entry["coordinator"].data or {}
+            if device_id in data:
+                return entry
+            # Also accept numeric Terminus IDs
+            for device in data.values():
+                if str(device.get("id")) == str(device_id):
+                    return entry
+        return None
+
+    def api_for_device(self, device_id: str) -> Optional[TRMNLApi]:
+        """Return the API client of the server that owns a device."""
+        entry = self.entry_for_device(device_id)
+        if entry is not None:
+            return entry["api"]
+        # A single server owns everything, including devices it hasn't polled yet
+        if len(self._entries) == 1:
+            return self.apis[0]
+        return None
+
+    def entries_for_server(self, server: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the entries matching an entry_id or host:port, or all of them."""
+        if not server:
+            return self.entries
+        return [
+            entry
+            for entry_id, entry in self._entries.items()
+            if server in (entry_id, f"{entry['host']}:{entry['port']}", entry["host"])
+        ]
+
+    async def async_fan_out(
+        self,
+        func: Callable[[Dict[str, Any]], Awaitable[_T]],
+        server: Optional[str] = None,
+    ) -> Dict[str, _T]:
+        """Run a coroutine against every matching server in parallel.
+
+        Results are keyed by host:port. A server that raises is logged and left
+        out of the results rather than failing the whole fan-out.
+        """
+        entries = self.entries_for_server(server)
+        results = await asyncio.gather(
+            *(func(entry) for entry in entries), return_exceptions=True
+        )
+
+        output: Dict[str, _T] = {}
+        for entry, result in zip(entries, results):
+            name = f"{entry['host']}:{entry['port']}"
+            if isinstance(result, Exception):
+                _LOGGER.error("Operation failed on %s: %s", name, result)
+                continue
+            output[name] = result
+        return output
+
+    @callback
+    def _async_reschedule(self) -> None:
+        """Restart the poll timer with a tick spacing that fits the server count."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+        if not self._entries:
+            return
+
+        tick = self.scan_interval / len(self._entries)
+        self._next_index %= len(self._entries)
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._async_poll_next, timedelta(seconds=tick)
+        )
+
+    async def _async_poll_next(self, _now: Optional[datetime] = None) -> None:
+        """Refresh the next server in the rotation."""
+        entries = self.entries
+        if not entries:
+            return
+
+        entry = entries[self._next_index % len(entries)]
+        self._next_index = (self._next_index + 1) % len(entries)
+        coordinator: TRMNLDataUpdateCoordinator = entry["coordinator"]
+        await coordinator.async_refresh()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop the poll scheduler."""
+        self._entries.clear()
+        self._async_reschedule()
@@ -1,7 +1,7 @@
 """Support for TRMNL sensors."""
 import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -9,42 +9,192 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, SIGNAL_STRENGTH_DECIBELS_MILLIWATT
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import TRMNLDataUpdateCoordinator
-from .const import (
-    DOMAIN,
-    SENSOR_TYPES,
-    MANUFACTURER,
-    MODEL,
-    CONF_DEVICE_ID,
-)
+from .battery import BatteryForecast
+from .const import DOMAIN, SENSOR_TYPES, SERVER_SENSOR_TYPES
+from .entity import TRMNLEntity, async_add_device_entities, server_device_info
+from .logs import DeviceLogStats
+from .memory import memory_report
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp as returned by Terminus."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+
+
+# Value extractors, selected once per entity at construction time
+SENSOR_VALUE_FNS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "wifi_signal": lambda data: data.get("wifi", data.get("wifi_signal", -100)),
+    "firmware_version": lambda data: data.get("firmware_version", "Unknown"),
+    "last_seen": lambda data: _parse_timestamp(data.get("last_seen") or data.get("updated_at")),
+    "device_status": lambda data: data.get("device_status", "unknown"),
+}
+
+SENSOR_ATTRIBUTE_FNS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "device_status": lambda data: {
+        "mac_address": data.get("mac_address", ""),
+        "uptime": data.get("uptime", 0),
+        "last_update": data.get("last_seen") or data.get("updated_at", ""),
+    },
+}
+
+
+# Battery sensors read the coordinator's discharge forecast instead of raw data
+BATTERY_VALUE_FNS: Dict[str, Callable[[BatteryForecast], Any]] = {
+    "battery": lambda forecast: forecast.percent,
+    "battery_remaining": lambda forecast: (
+        round(forecast.remaining_days, 1)
+        if forecast.remaining_days is not None
+        else None
+    ),
+}
+
+BATTERY_ATTRIBUTE_FNS: Dict[str, Callable[[BatteryForecast], Dict[str, Any]]] = {
+    "battery": lambda forecast: {
+        "voltage": forecast.voltage,
+        "full_voltage": forecast.full_voltage,
+    },
+    "battery_remaining": lambda forecast: {
+        "discharge_rate_mv_per_day": (
+            round(forecast.discharge_rate * 1000, 2)
+            if forecast.discharge_rate is not None
+            else None
+        ),
+        "energy_per_refresh_mv": (
+            round(forecast.energy_per_refresh_mv, 4)
+            if forecast.energy_per_refresh_mv is not None
+            else None
+        ),
+        "percent_per_refresh": (
+            round(forecast.percent_per_refresh, 4)
+            if forecast.percent_per_refresh is not None
+            else None
+        ),
+        "samples": forecast.samples,
+    },
+}
+
+
+# Log sensors read the coordinator's aggregated device log counters
+LOG_VALUE_FNS: Dict[str, Callable[[DeviceLogStats], Any]] = {
+    "log_errors": lambda stats: stats.errors,
+}
+
+LOG_ATTRIBUTE_FNS: Dict[str, Callable[[DeviceLogStats], Dict[str, Any]]] = {
+    "log_errors": lambda stats: stats.as_dict(),
+}
+
+
+# Server sensors read the API client's request metrics
+SERVER_VALUE_FNS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "api_requests": lambda metrics: metrics["overall"]["requests"],
+    "api_error_rate": lambda metrics: round(metrics["overall"]["error_rate"] * 100, 2),
+    "api_latency_p95": lambda metrics: metrics["overall"]["p95_ms"],
+}
+
+SERVER_ATTRIBUTE_FNS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "api_requests": lambda metrics: {
+        endpoint: stats["requests"] for endpoint, stats in metrics["endpoints"].items()
+    },
+    "api_error_rate": lambda metrics: {
+        endpoint: stats["error_rate"] for endpoint, stats in metrics["endpoints"].items()
+    },
+    "api_latency_p95": lambda metrics: {
+        "p50_ms": metrics["overall"]["p50_ms"],
+        "p99_ms": metrics["overall"]["p99_ms"],
+        "bytes_in": metrics["overall"]["bytes_in"],
+        "bytes_out": metrics["overall"]["bytes_out"],
+        "endpoints_p95_ms": {
+            endpoint: stats["p95_ms"] for endpoint, stats in metrics["endpoints"].items()
+        },
+    },
+}
+
+SERVER_MEMORY_VALUE_FNS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "memory_usage": lambda report: round(sum(cache["bytes"] for cache in report.values()) / 1024, 1),
+}
+
+SERVER_MEMORY_ATTRIBUTE_FNS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "memory_usage": lambda report: report,
+}
+
+SERVER_CONNECTIVITY_VALUE_FNS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "devices_overdue": lambda summary: summary["overdue"],
+}
+
+SERVER_CONNECTIVITY_ATTRIBUTE_FNS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "devices_overdue": lambda summary: {
+        key: value for key, value in summary.items() if key != "overdue"
+    },
+}
+
+SERVER_LOG_VALUE_FNS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "log_entries": lambda summary: summary["entries"],
+}
+
+SERVER_LOG_ATTRIBUTE_FNS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "log_entries": lambda summary: {
+        key: value for key, value in summary.items() if key != "entries"
+    },
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up TRMNL sensors from a config entry."""
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    device_id = config_entry.data[CONF_DEVICE_ID]
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+
+    def _device_sensors(device_id: str) -> List[SensorEntity]:
+        sensors: List[SensorEntity] = []
+        for sensor_type in SENSOR_TYPES:
+            if sensor_type in BATTERY_VALUE_FNS:
+                sensors.append(TRMNLBatterySensor(coordinator, device_id, sensor_type))
+            elif sensor_type in LOG_VALUE_FNS:
+                sensors.append(TRMNLLogSensor(coordinator, device_id, sensor_type))
+            else:
+                sensors.append(TRMNLSensor(coordinator, device_id, sensor_type))
+        return sensors
+
+    async_add_device_entities(coordinator, config_entry, async_add_entities, _device_sensors)
 
-    sensors = []
-    for sensor_type in SENSOR_TYPES:
-        sensors.append(TRMNLSensor(coordinator, device_id, sensor_type))
+    def _server_sensor(sensor_type: str) -> SensorEntity:
+        if sensor_type in SERVER_LOG_VALUE_FNS:
+            return TRMNLServerLogSensor(coordinator, sensor_type)
+        if sensor_type in SERVER_MEMORY_VALUE_FNS:
+            return TRMNLServerMemorySensor(coordinator, sensor_type)
+        if sensor_type in SERVER_CONNECTIVITY_VALUE_FNS:
+            return TRMNLServerConnectivitySensor(coordinator, sensor_type)
+        return TRMNLServerSensor(coordinator, sensor_type)
 
-    async_add_entities(sensors)
+    async_add_entities(_server_sensor(sensor_type) for sensor_type in SERVER_SENSOR_TYPES)
 
 
-class TRMNLSensor(CoordinatorEntity, SensorEntity):
+class TRMNLSensor(TRMNLEntity, SensorEntity):
     """Representation of a TRMNL sensor."""
 
+    _value_fns = SENSOR_VALUE_FNS
+    _attribute_fns = SENSOR_ATTRIBUTE_FNS
+
     def __init__(
         self,
         coordinator: TRMNLDataUpdateCoordinator,
@@ -52,12 +202,13 @@ class TRMNLSensor(CoordinatorEntity, SensorEntity):
         sensor_type: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._device_id = device_id
+        super().__init__(coordinator, device_id)
         self._sensor_type = sensor_type
-        self._attr_name = f"TRMNL {SENSOR_TYPES[sensor_type]['name']}"
+        self._attr_name = SENSOR_TYPES[sensor_type]["name"]
         self._attr_unique_id = f"{device_id}_{sensor_type}"
         self._attr_icon = SENSOR_TYPES[sensor_type].get("icon")
+        self._value_fn = self._value_fns[sensor_type]
+        self._attributes_fn = self._attribute_fns.get(sensor_type)
 
         # Set device class and unit of measurement
         if "device_class" in SENSOR_TYPES[sensor_type]:
@@ -71,76 +222,152 @@ class TRMNLSensor(CoordinatorEntity, SensorEntity):
                 self._attr_state_class = SensorStateClass.MEASUREMENT
             elif SENSOR_TYPES[sensor_type]["device_class"] == "timestamp":
                 self._attr_device_class = SensorDeviceClass.TIMESTAMP
+            elif SENSOR_TYPES[sensor_type]["device_class"] == "duration":
+                self._attr_device_class = SensorDeviceClass.DURATION
+                self._attr_native_unit_of_measurement = UnitOfTime.DAYS
+                self._attr_state_class = SensorStateClass.MEASUREMENT
+        if "state_class" in SENSOR_TYPES[sensor_type]:
+            self._attr_state_class = SensorStateClass(SENSOR_TYPES[sensor_type]["state_class"])
 
-    @property
-    def device_info(self) -> Dict[str, Any]:
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": f"TRMNL {self._device_id}",
-            "manufacturer": MANUFACTURER,
-            "model": MODEL,
-            "sw_version": self.coordinator.data.get("firmware_version", "Unknown") if self.coordinator.data else "Unknown",
-        }
+        self._update_from_data()
 
-    @property
-    def native_value(self) -> Optional[Any]:
-        """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
-
-        data = self.coordinator.data
-
-        if self._sensor_type == "battery":
-            # Convert voltage to percentage (approximate)
-            voltage = data.get("battery", 0)
-            if voltage > 4.0:
-                return 100
-            elif voltage > 3.7:
-                return int((voltage - 3.7) / 0.3 * 100)
-            else:
-                return 0
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute cached values once per coordinator update."""
+        self._update_from_data()
+        super()._handle_coordinator_update()
 
-        elif self._sensor_type == "wifi_signal":
-            return data.get("wifi_signal", -100)
+    def _update_from_data(self) -> None:
+        """Extract native value and attributes from the device data."""
+        data = self.device_data
+        if not data:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = None
+            return
 
-        elif self._sensor_type == "firmware_version":
-            return data.get("firmware_version", "Unknown")
+        self._attr_native_value = self._value_fn(data)
+        if self._attributes_fn:
+            self._attr_extra_state_attributes = self._attributes_fn(data)
 
-        elif self._sensor_type == "last_seen":
-            last_seen = data.get("last_seen")
-            if last_seen:
-                try:
-                    return datetime.fromisoformat(last_seen.replace("Z", "+00:00"))
-                except (ValueError, AttributeError):
-                    return None
-            return None
 
-        elif self._sensor_type == "device_status":
-            return data.get("device_status", "unknown")
+class TRMNLBatterySensor(TRMNLSensor):
+    """Battery sensor backed by the coordinator's discharge model."""
 
-        return None
+    _value_fns = BATTERY_VALUE_FNS
+    _attribute_fns = BATTERY_ATTRIBUTE_FNS
+
+    def _update_from_data(self) -> None:
+        """Extract native value and attributes from the battery forecast."""
+        forecast = self.coordinator.battery.forecast(self._device_id)
+        if forecast is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = None
+            return
+
+        self._attr_native_value = self._value_fn(forecast)
+        self._attr_extra_state_attributes = self._attributes_fn(forecast)
+
+
+class TRMNLLogSensor(TRMNLSensor):
+    """Diagnostic sensor backed by the coordinator's device log counters."""
+
+    _value_fns = LOG_VALUE_FNS
+    _attribute_fns = LOG_ATTRIBUTE_FNS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def _update_from_data(self) -> None:
+        """Extract native value and attributes from the log counters."""
+        stats = self.coordinator.logs.stats.get(self._device_id) or DeviceLogStats()
+        self._attr_native_value = self._value_fn(stats)
+        self._attr_extra_state_attributes = self._attributes_fn(stats)
+
+
+class TRMNLServerSensor(CoordinatorEntity[TRMNLDataUpdateCoordinator], SensorEntity):
+    """Diagnostic sensor for a Terminus server's API request metrics."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _value_fns = SERVER_VALUE_FNS
+    _attribute_fns = SERVER_ATTRIBUTE_FNS
+
+    def __init__(self, coordinator: TRMNLDataUpdateCoordinator, sensor_type: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        api = coordinator.api
+        self._attr_name = SERVER_SENSOR_TYPES[sensor_type]["name"]
+        self._attr_unique_id = f"{api.host}:{api.port}_{sensor_type}"
+        self._attr_icon = SERVER_SENSOR_TYPES[sensor_type].get("icon")
+        self._attr_native_unit_of_measurement = SERVER_SENSOR_TYPES[sensor_type].get("unit")
+        self._attr_state_class = SensorStateClass(
+            SERVER_SENSOR_TYPES[sensor_type].get("state_class", "measurement")
+        )
+        self._attr_device_info = server_device_info(coordinator)
+        self._value_fn = self._value_fns[sensor_type]
+        self._attributes_fn = self._attribute_fns[sensor_type]
+        self._update_from_metrics()
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
+        """Return True; metrics are local and available even when the server is not."""
+        return True
 
-    @property
-    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
-        """Return additional state attributes."""
-        if not self.coordinator.data:
-            return None
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Snapshot the metrics once per coordinator update."""
+        self._update_from_metrics()
+        super()._handle_coordinator_update()
+
+    def _metrics(self) -> Dict[str, Any]:
+        """Return the snapshot the value and attribute extractors read."""
+        return self.coordinator.api.metrics.as_dict()
+
+    def _update_from_metrics(self) -> None:
+        """Extract native value and attributes from the request metrics."""
+        metrics = self._metrics()
+        self._attr_native_value = self._value_fn(metrics)
+        self._attr_extra_state_attributes = self._attributes_fn(metrics)
+
+
+class TRMNLServerLogSensor(TRMNLServerSensor):
+    """Diagnostic sensor summarizing the device logs seen on a server."""
+
+    _value_fns = SERVER_LOG_VALUE_FNS
+    _attribute_fns = SERVER_LOG_ATTRIBUTE_FNS
+
+    def _metrics(self) -> Dict[str, Any]:
+        """Return the fleet-wide log summary."""
+        return self.coordinator.logs.summary()
+
+
+class TRMNLServerMemorySensor(TRMNLServerSensor):
+    """Diagnostic sensor for the memory held by a server's caches."""
+
+    _value_fns = SERVER_MEMORY_VALUE_FNS
+    _attribute_fns = SERVER_MEMORY_ATTRIBUTE_FNS
+
+    def _metrics(self) -> Dict[str, Any]:
+        """Return the per-cache memory report."""
+        return memory_report(self.coordinator)
+
+
+class TRMNLServerConnectivitySensor(TRMNLServerSensor):
+    """Number of a server's devices that missed their check-in deadline."""
 
-        attributes = {}
-        data = self.coordinator.data
+    _value_fns = SERVER_CONNECTIVITY_VALUE_FNS
+    _attribute_fns = SERVER_CONNECTIVITY_ATTRIBUTE_FNS
 
-        if self._sensor_type == "battery":
-            attributes["voltage"] = data.get("battery", 0)
+    async def async_added_to_hass(self) -> None:
+        """Also update when devices become overdue between polls."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.connectivity.async_add_listener(self._handle_overdue)
+        )
 
-        elif self._sensor_type == "device_status":
-            attributes["mac_address"] = data.get("mac_address", "")
-            attributes["uptime"] = data.get("uptime", 0)
-            attributes["last_update"] = data.get("last_seen", "")
+    @callback
+    def _handle_overdue(self, device_ids: Set[str]) -> None:
+        self._update_from_metrics()
+        self.async_write_ha_state()
 
-        return attributes
\ No newline at end of file
+    def _metrics(self) -> Dict[str, Any]:
+        """Return the fleet connectivity summary."""
+        return self.coordinator.connectivity.summary()
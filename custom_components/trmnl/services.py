@@ -1,17 +1,60 @@
 """TRMNL services for Home Assistant with external screenshot service."""
+import asyncio
+import json
 import logging
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 import voluptuous as vol
 from datetime import datetime
 import aiohttp
 import base64
+import binascii
 
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers import config_validation as cv
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.storage import Store
 from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    SERVICE_APPLY_SLEEP_SCHEDULE,
+    SERVICE_REFRESH_DEVICE,
+    SERVICE_RENDER_TEMPLATE,
+    SERVICE_SEND_DASHBOARD,
+    SERVICE_SET_PUSH_BINDING,
+    SERVICE_REMOVE_PUSH_BINDING,
+    SERVICE_SET_PLAYLIST,
+    SERVICE_REMOVE_PLAYLIST,
+    SERVICE_START_FIRMWARE_ROLLOUT,
+    SERVICE_CANCEL_FIRMWARE_ROLLOUT,
+    SERVICE_START_CALL_RECORDING,
+    SERVICE_STOP_CALL_RECORDING,
+    SERVICE_UPDATE_SCREEN,
+    PLAYLIST_DEFAULT_MAX_AGE,
+    PLAYLIST_MIN_INTERVAL,
+    PUSH_BINDING_DEFAULT_DEBOUNCE,
+    RECORDING_MAX_CALLS,
+    RENDER_DEFAULT_SIZE,
+    RENDER_SCREENS_SAVE_DELAY,
+    ROLLOUT_DEFAULT_HALT_THRESHOLD,
+    ROLLOUT_DEFAULT_WAVE_TIMEOUT,
+    EVENT_SLEEP_SCHEDULE_APPLIED,
+    EVENT_PUSH_TRACE,
+    MEMORY_RENDER_BUDGET,
+    STORAGE_VERSION,
+)
 from .api import TRMNLApi
+from .bindings import PushBindingManager
+from .memory import LRUCache
+from .metrics import RequestMetrics
+from .playlist import PlaylistManager
+from .recording import CallRecorder, write_recording
+from .rollout import RolloutManager, plan_waves
+from .render import Layout, Region, TiledFrame, encode_png, render_text
+from .router import TRMNLRouter
+from .tracing import PushTrace, Span, TraceBuffer
+from .sleep_schedule import SleepWindow, plan_sleep_schedules
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,83 +77,290 @@ DASHBOARD_CAPTURE_SCHEMA = vol.Schema({
     vol.Optional("rotation_angle", default=0.0): vol.Coerce(float),
 })
 
+TIME_HHMM = vol.Match(r"^([01]\d|2[0-3]):[0-5]\d$")
+
+SLEEP_WINDOW_SCHEMA = vol.Schema({
+    vol.Required("sleep_start"): TIME_HHMM,
+    vol.Required("sleep_stop"): TIME_HHMM,
+})
+
+SLEEP_SCHEDULE_SCHEMA = vol.Schema({
+    vol.Required("sleep_start"): TIME_HHMM,
+    vol.Required("sleep_stop"): TIME_HHMM,
+    vol.Optional("device_friendly_ids"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("areas", default={}): {cv.string: SLEEP_WINDOW_SCHEMA},
+    vol.Optional("timezones", default={}): {cv.string: cv.time_zone},
+    vol.Optional("dry_run", default=False): cv.boolean,
+    vol.Optional("server"): cv.string,
+})
+
+RENDER_LAYOUT_SCHEMA = vol.Schema({
+    vol.Optional("font_size", default=28): vol.All(vol.Coerce(int), vol.Range(min=6, max=400)),
+    vol.Optional("title_font_size", default=48): vol.All(vol.Coerce(int), vol.Range(min=6, max=400)),
+    vol.Optional("padding", default=20): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional("line_spacing", default=6): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional("align", default="left"): vol.In(["left", "center", "right"]),
+    vol.Optional("font"): cv.isfile,
+    vol.Optional("invert", default=False): cv.boolean,
+})
+
+def _unique_region_names(regions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reject region lists that reuse a name."""
+    names = [region["name"] for region in regions]
+    if len(names) != len(set(names)):
+        raise vol.Invalid("region names must be unique")
+    return regions
+
+
+RENDER_REGION_SCHEMA = vol.Schema({
+    vol.Required("name"): cv.string,
+    vol.Required("x"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Required("y"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Required("width"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Required("height"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Required("template"): cv.template,
+    vol.Optional("entities"): cv.entity_ids,
+    vol.Optional("layout", default={}): RENDER_LAYOUT_SCHEMA,
+})
+
+RENDER_TEMPLATE_SCHEMA = vol.Schema({
+    vol.Required("device_friendly_id"): cv.string,
+    vol.Required("template"): cv.template,
+    vol.Optional("layout", default={}): RENDER_LAYOUT_SCHEMA,
+    vol.Optional("regions", default=[]): vol.All(
+        cv.ensure_list, [RENDER_REGION_SCHEMA], _unique_region_names
+    ),
+    vol.Optional("width"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional("height"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+})
+
+# Service payloads a push binding may run, and how to validate them
+BINDABLE_SERVICES = {
+    SERVICE_SEND_DASHBOARD: DASHBOARD_CAPTURE_SCHEMA,
+    SERVICE_RENDER_TEMPLATE: RENDER_TEMPLATE_SCHEMA,
+}
+
+SET_PUSH_BINDING_SCHEMA = vol.Schema({
+    vol.Required("binding_id"): cv.string,
+    vol.Required("entities"): cv.entity_ids,
+    vol.Required("service"): vol.In(list(BINDABLE_SERVICES)),
+    vol.Required("data"): dict,
+    vol.Optional("debounce", default=PUSH_BINDING_DEFAULT_DEBOUNCE): vol.All(
+        vol.Coerce(float), vol.Range(min=0)
+    ),
+})
+
+REMOVE_PUSH_BINDING_SCHEMA = vol.Schema({
+    vol.Required("binding_id"): cv.string,
+})
+
+PLAYLIST_ITEM_SCHEMA = vol.Schema({
+    vol.Required("service"): vol.In(list(BINDABLE_SERVICES)),
+    vol.Required("data"): dict,
+})
+
+SET_PLAYLIST_SCHEMA = vol.Schema({
+    vol.Required("playlist_id"): cv.string,
+    vol.Required("device_friendly_id"): cv.string,
+    vol.Required("items"): vol.All(cv.ensure_list, [PLAYLIST_ITEM_SCHEMA], vol.Length(min=1)),
+    vol.Optional("interval", default=900): vol.All(vol.Coerce(int), vol.Range(min=PLAYLIST_MIN_INTERVAL)),
+    vol.Optional("max_age", default=PLAYLIST_DEFAULT_MAX_AGE): vol.All(vol.Coerce(int), vol.Range(min=0)),
+})
+
+REMOVE_PLAYLIST_SCHEMA = vol.Schema({
+    vol.Required("playlist_id"): cv.string,
+})
+
+START_FIRMWARE_ROLLOUT_SCHEMA = vol.Schema({
+    vol.Required("rollout_id"): cv.string,
+    vol.Optional("device_friendly_ids"): vol.All(cv.ensure_list, [cv.string], vol.Length(min=1)),
+    vol.Optional("target_version"): cv.string,
+    vol.Exclusive("wave_size", "wave"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Exclusive("wave_percent", "wave"): vol.All(vol.Coerce(float), vol.Range(min=1, max=100)),
+    vol.Optional("wave_timeout", default=ROLLOUT_DEFAULT_WAVE_TIMEOUT): vol.All(vol.Coerce(int), vol.Range(min=60)),
+    vol.Optional("halt_threshold", default=ROLLOUT_DEFAULT_HALT_THRESHOLD): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=100)
+    ),
+})
+
+CANCEL_FIRMWARE_ROLLOUT_SCHEMA = vol.Schema({
+    vol.Required("rollout_id"): cv.string,
+})
+
+# Calls worth replaying to reproduce push load
+RECORDED_SERVICES = (SERVICE_SEND_DASHBOARD, SERVICE_REFRESH_DEVICE)
+
+START_CALL_RECORDING_SCHEMA = vol.Schema({
+    vol.Optional("max_calls", default=RECORDING_MAX_CALLS): vol.All(vol.Coerce(int), vol.Range(min=1)),
+})
+
+STOP_CALL_RECORDING_SCHEMA = vol.Schema({
+    vol.Optional("filename"): vol.Match(r"^[\w.-]+\.json$"),
+})
+
+REFRESH_DEVICE_SCHEMA = vol.Schema({
+    vol.Required("device"): cv.string,
+})
+
+SERVICES = (
+    SERVICE_APPLY_SLEEP_SCHEDULE,
+    SERVICE_REFRESH_DEVICE,
+    SERVICE_RENDER_TEMPLATE,
+    SERVICE_SET_PUSH_BINDING,
+    SERVICE_REMOVE_PUSH_BINDING,
+    SERVICE_SET_PLAYLIST,
+    SERVICE_REMOVE_PLAYLIST,
+    SERVICE_START_FIRMWARE_ROLLOUT,
+    SERVICE_CANCEL_FIRMWARE_ROLLOUT,
+    SERVICE_START_CALL_RECORDING,
+    SERVICE_STOP_CALL_RECORDING,
+    SERVICE_UPDATE_SCREEN,
+    SERVICE_SEND_DASHBOARD,
+)
+
+
+def _entity_signature(hass: HomeAssistant, entity_ids: Tuple[str, ...]) -> Tuple:
+    """Return when each entity last changed, to tell whether a region needs re-rendering."""
+    signature = []
+    for entity_id in entity_ids:
+        state = hass.states.get(entity_id)
+        signature.append((entity_id, state.last_updated if state else None))
+    return tuple(signature)
+
+
+def _dashboard_url(hass: HomeAssistant, dashboard_path: str) -> str:
+    """Return the full URL the screenshot service should load."""
+    # Get Home Assistant base URL
+    ha_base_url = hass.config.external_url or hass.config.internal_url
+    if not ha_base_url:
+        ha_base_url = f"http://localhost:8123"
+    
+    # Construct full dashboard URL
+    return f"{ha_base_url}{dashboard_path}"
+
+
+def _screenshot_payload(data: Dict[str, Any], dashboard_url: str) -> Dict[str, Any]:
+    """Build the screenshot service request from validated capture options."""
+    return {
+        "url": dashboard_url,
+        "width": data["width"],
+        "height": data["height"],
+        "theme": data.get("theme"),
+        "waitTime": data["wait_time"],
+        "orientation": data["orientation"],
+        "centerX": data["center_x_offset"],
+        "centerY": data["center_y_offset"],
+        "marginTop": data["margin_top"],
+        "marginBottom": data["margin_bottom"],
+        "marginLeft": data["margin_left"],
+        "marginRight": data["margin_right"],
+        "rotation": data["rotation_angle"]
+    }
+
+
+async def _async_capture_screenshot(
+    screenshot_service_url: str,
+    screenshot_payload: Dict[str, Any],
+    metrics: RequestMetrics,
+    span: Optional[Span] = None,
+) -> str:
+    """Call the external screenshot service and return the base64 image."""
+    async with aiohttp.ClientSession() as session:
+        screenshot_endpoint = f"{screenshot_service_url.rstrip('/')}/screenshot"
+        _LOGGER.info("Calling screenshot service: %s", screenshot_endpoint)
+        
+        status = None
+        bytes_in = 0
+        request_body = json.dumps(screenshot_payload).encode()
+        start = time.monotonic()
+        try:
+            async with session.post(
+                screenshot_endpoint, 
+                data=request_body,
+                headers={"Content-Type": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=60)
+            ) as response:
+                status = response.status
+                body = await response.read()
+                bytes_in = len(body)
+                if response.status == 200:
+                    result = json.loads(body)
+                    if result.get('success'):
+                        image_data = result['image']
+                        _LOGGER.info("Screenshot captured successfully: %d characters", len(image_data))
+                        return image_data
+                    raise ServiceValidationError(f"Screenshot service failed: {result.get('message', 'Unknown error')}")
+                error_text = body.decode(errors="replace")
+                raise ServiceValidationError(f"Screenshot service returned {response.status}: {error_text}")
+                    
+        except aiohttp.ClientError as e:
+            _LOGGER.error("Failed to connect to screenshot service at %s: %s", screenshot_endpoint, e)
+            raise ServiceValidationError(f"Cannot connect to screenshot service at {screenshot_service_url}. Please ensure the service is running.")
+        finally:
+            if span is not None:
+                span.payload_bytes = bytes_in
+            metrics.record(
+                "POST", screenshot_endpoint, status, time.monotonic() - start,
+                bytes_in, len(request_body),
+            )
+
+
+def _decode_image(image_data: str) -> bytes:
+    """Validate and decode a base64 image before uploading it anywhere."""
+    try:
+        return base64.b64decode(image_data, validate=True)
+    except (binascii.Error, TypeError) as e:
+        raise ServiceValidationError(f"Screenshot service returned invalid image data: {e}")
+
+
+def _api_for_device(hass: HomeAssistant, device_id: str) -> TRMNLApi:
+    """Return the API client of the server that owns a device."""
+    router: TRMNLRouter = hass.data[DOMAIN]["router"]
+    api = router.api_for_device(device_id)
+    if api is None:
+        raise ServiceValidationError(f"Device {device_id} not found on any Terminus server")
+    return api
+
 
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up TRMNL services."""
+    if hass.services.has_service(DOMAIN, SERVICE_SEND_DASHBOARD):
+        return
+
+    screenshot_metrics: RequestMetrics = hass.data[DOMAIN].setdefault(
+        "screenshot_metrics", RequestMetrics()
+    )
+    push_traces: TraceBuffer = hass.data[DOMAIN].setdefault("push_traces", TraceBuffer())
     
     async def handle_send_dashboard_to_device(call: ServiceCall) -> None:
         """Handle the send_dashboard_to_device service call."""
         device_friendly_id = call.data["device_friendly_id"]
         dashboard_path = call.data["dashboard_path"]
         screenshot_service_url = call.data["screenshot_service_url"]
-        theme = call.data.get("theme")
-        width = call.data["width"]
-        height = call.data["height"]
-        wait_time = call.data["wait_time"]
-        orientation = call.data["orientation"]
-        center_x_offset = call.data["center_x_offset"]
-        center_y_offset = call.data["center_y_offset"]
-        margin_top = call.data["margin_top"]
-        margin_bottom = call.data["margin_bottom"]
-        margin_left = call.data["margin_left"]
-        margin_right = call.data["margin_right"]
-        rotation_angle = call.data["rotation_angle"]
         
+        trace = PushTrace(device_friendly_id, dashboard_path)
+        push_ok = False
+        push_error = None
         try:
-            # Get the TRMNL API instance
-            api: TRMNLApi = hass.data[DOMAIN]["api"]
-            
-            # Get Home Assistant base URL
-            ha_base_url = hass.config.external_url or hass.config.internal_url
-            if not ha_base_url:
-                ha_base_url = f"http://localhost:8123"
+            # Get the TRMNL API instance of the server that owns the device
+            api = _api_for_device(hass, device_friendly_id)
             
-            # Construct full dashboard URL
-            dashboard_url = f"{ha_base_url}{dashboard_path}"
+            with trace.span("build_url"):
+                dashboard_url = _dashboard_url(hass, dashboard_path)
             
             _LOGGER.info("Capturing dashboard %s via external screenshot service", dashboard_url)
             
-            # Call external screenshot service
-            screenshot_payload = {
-                "url": dashboard_url,
-                "width": width,
-                "height": height,
-                "theme": theme,
-                "waitTime": wait_time,
-                "orientation": orientation,
-                "centerX": center_x_offset,
-                "centerY": center_y_offset,
-                "marginTop": margin_top,
-                "marginBottom": margin_bottom,
-                "marginLeft": margin_left,
-                "marginRight": margin_right,
-                "rotation": rotation_angle
-            }
+            with trace.span("screenshot") as span:
+                image_data = await _async_capture_screenshot(
+                    screenshot_service_url,
+                    _screenshot_payload(call.data, dashboard_url),
+                    screenshot_metrics,
+                    span,
+                )
             
-            async with aiohttp.ClientSession() as session:
-                screenshot_endpoint = f"{screenshot_service_url.rstrip('/')}/screenshot"
-                _LOGGER.info("Calling screenshot service: %s", screenshot_endpoint)
-                
-                try:
-                    async with session.post(
-                        screenshot_endpoint, 
-                        json=screenshot_payload,
-                        timeout=aiohttp.ClientTimeout(total=60)
-                    ) as response:
-                        if response.status == 200:
-                            result = await response.json()
-                            if result.get('success'):
-                                image_data = result['image']
-                                _LOGGER.info("Screenshot captured successfully: %d characters", len(image_data))
-                            else:
-                                raise ServiceValidationError(f"Screenshot service failed: {result.get('message', 'Unknown error')}")
-                        else:
-                            error_text = await response.text()
-                            raise ServiceValidationError(f"Screenshot service returned {response.status}: {error_text}")
-                            
-                except aiohttp.ClientError as e:
-                    _LOGGER.error("Failed to connect to screenshot service at %s: %s", screenshot_endpoint, e)
-                    raise ServiceValidationError(f"Cannot connect to screenshot service at {screenshot_service_url}. Please ensure the service is running.")
+            with trace.span("decode") as span:
+                image_bytes = _decode_image(image_data)
+                span.payload_bytes = len(image_bytes)
             
             # Create screen in TRMNL
             safe_path = dashboard_path.replace("/", "_").replace("\\", "_")
@@ -119,63 +369,72 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             
             _LOGGER.info("Creating TRMNL screen with external screenshot data")
             
-            # Try simple format first
-            simple_screen_data = {
-                "name": unique_name,
-                "label": f"HA Dashboard {dashboard_path}",
-                "image": {
-                    "data": image_data
-                }
-            }
-            
-            screen_result = await api.create_screen(simple_screen_data)
-            
-            if not screen_result:
-                _LOGGER.warning("Simple format failed, trying with model_id")
-                # Try with model_id as we know this was required
-                enhanced_screen_data = {
-                    "model_id": 1,
+            with trace.span("create_screen") as span:
+                span.payload_bytes = len(image_data)
+                
+                # Try simple format first
+                simple_screen_data = {
                     "name": unique_name,
                     "label": f"HA Dashboard {dashboard_path}",
                     "image": {
-                        "model_id": 1,
-                        "name": unique_name,
-                        "label": f"HA Dashboard {dashboard_path}",
                         "data": image_data
                     }
                 }
                 
-                screen_result = await api.create_screen(enhanced_screen_data)
+                screen_result = await api.create_screen(simple_screen_data)
                 
-            if not screen_result:
-                raise ServiceValidationError(f"Failed to create screen for dashboard {dashboard_path}")
+                if not screen_result and not api.reachable and api.write_queue is not None:
+                    # Only the latest push per device waits; it is assigned on delivery
+                    api.write_queue.enqueue_push(
+                        device_friendly_id, simple_screen_data, f"HA Dashboard {dashboard_path}"
+                    )
+                    span.detail = "queued"
+                    # Not an error: retrying would only replace the queued push
+                    _LOGGER.warning("Terminus at %s is unreachable; queued the push to %s "
+                                    "for delivery when it is back", api.base_url, device_friendly_id)
+                    return
+                
+                if not screen_result:
+                    _LOGGER.warning("Simple format failed, trying with model_id")
+                    span.retries += 1
+                    # Try with model_id as we know this was required
+                    enhanced_screen_data = {
+                        "model_id": 1,
+                        "name": unique_name,
+                        "label": f"HA Dashboard {dashboard_path}",
+                        "image": {
+                            "model_id": 1,
+                            "name": unique_name,
+                            "label": f"HA Dashboard {dashboard_path}",
+                            "data": image_data
+                        }
+                    }
+                    
+                    screen_result = await api.create_screen(enhanced_screen_data)
+                    
+                if not screen_result:
+                    raise ServiceValidationError(f"Failed to create screen for dashboard {dashboard_path}")
             
             screen_id = screen_result.get('id')
             _LOGGER.info("Successfully created screen %s with external screenshot", screen_id)
             
             # Try to assign screen to device
-            assignment_methods = [
-                {"current_screen_id": screen_id},
-                {"screen_id": screen_id}, 
-                {"active_screen": screen_id},
-                {"display_screen_id": screen_id},
-                {"label": f"HA Dashboard {dashboard_path}", "active_screen_id": screen_id}
-            ]
-            
-            assignment_success = False
-            for i, assignment_data in enumerate(assignment_methods):
-                try:
-                    _LOGGER.info("Trying screen assignment method %d", i + 1)
-                    result = await api.update_device(device_friendly_id, assignment_data)
-                    if result:
-                        _LOGGER.info("Screen assignment method %d succeeded!", i + 1)
-                        assignment_success = True
-                        break
-                except Exception as assign_error:
-                    _LOGGER.warning("Screen assignment method %d failed: %s", i + 1, assign_error)
-                    continue
+            with trace.span("assign") as span:
+                assignment_success, span.retries = await api.assign_screen(
+                    device_friendly_id, screen_id, f"HA Dashboard {dashboard_path}"
+                )
+                span.ok = assignment_success
             
             if assignment_success:
+                if api.write_queue is not None:
+                    api.write_queue.discard_push(device_friendly_id)
+                entry = hass.data[DOMAIN]["router"].entry_for_device(device_friendly_id)
+                controller = entry.get("refresh_controller") if entry else None
+                if controller is not None:
+                    controller.record_content_change(device_friendly_id)
+                if entry:
+                    # The preview shows the push without fetching it back from Terminus
+                    entry["coordinator"].previews.put(device_friendly_id, f"screen:{screen_id}", image_bytes)
                 _LOGGER.info("Successfully assigned screen %s to device %s", screen_id, device_friendly_id)
                 _LOGGER.info("Dashboard should now appear on TRMNL device!")
             else:
@@ -184,19 +443,525 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                 _LOGGER.info("You can manually assign it to device %s", device_friendly_id)
             
             _LOGGER.info("Dashboard capture completed - screen %s created", screen_id)
+            push_ok = assignment_success
             
-        except ServiceValidationError:
+        except ServiceValidationError as e:
+            push_error = str(e)
             raise
         except Exception as e:
+            push_error = str(e)
             _LOGGER.error("Error in send_dashboard_to_device service: %s", e, exc_info=True)
             raise ServiceValidationError(f"Failed to send dashboard to device: {e}")
+        finally:
+            trace.finish(push_ok, push_error)
+            push_traces.add(trace)
+            hass.bus.async_fire(EVENT_PUSH_TRACE, trace.as_dict())
+    
+    # Stable per-device screen that template renders overwrite in place; kept
+    # across restarts so each device keeps reusing the same Terminus screen
+    rendered_store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.rendered_screens")
+    rendered_screens: Dict[str, Any] = hass.data[DOMAIN].setdefault("rendered_screens", {})
+    rendered_screens.update(await rendered_store.async_load() or {})
+    # Cached frames of region-based renders, least recently rendered evicted
+    # first, and a lock per device
+    rendered_frames: LRUCache[str, TiledFrame] = hass.data[DOMAIN].setdefault(
+        "rendered_frames", LRUCache(MEMORY_RENDER_BUDGET, lambda frame: frame.nbytes)
+    )
+    render_locks: Dict[str, asyncio.Lock] = {}
+    model_sizes: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+    async def _async_panel_size(api: TRMNLApi, device: Dict[str, Any]) -> Tuple[int, int]:
+        """Return the panel resolution from the device, its model, or the default."""
+        if device.get("width") and device.get("height"):
+            return int(device["width"]), int(device["height"])
+        model_id = device.get("model_id")
+        if model_id is None:
+            return RENDER_DEFAULT_SIZE
+        key = (api.base_url, str(model_id))
+        if key not in model_sizes:
+            model = await api.get_model(str(model_id))
+            if not model or not model.get("width") or not model.get("height"):
+                return RENDER_DEFAULT_SIZE
+            model_sizes[key] = (int(model["width"]), int(model["height"]))
+        return model_sizes[key]
+
+    @callback
+    def _async_render_regions(frame: TiledFrame, regions: List[Dict[str, Any]]) -> List[Tuple[Region, str]]:
+        """Render region templates, reusing the last text when their entities are unchanged."""
+        rendered = []
+        for spec in regions:
+            region = Region(
+                spec["name"], spec["x"], spec["y"], spec["width"], spec["height"], Layout(**spec["layout"])
+            )
+            previous = frame.signatures.get(region.name)
+            if previous is not None and region.name in frame.tiles:
+                watched, signature = previous
+                if _entity_signature(hass, watched) == signature:
+                    rendered.append((region, frame.tiles[region.name][1]))
+                    continue
+            
+            region_template = spec["template"]
+            if region_template.hass is None:
+                region_template.hass = hass
+            info = region_template.async_render_to_info(parse_result=False)
+            text = str(info.result())
+            if info.has_time or info.rate_limit is not None:
+                # Changes with the clock or is rate limited, so entity states cannot tell
+                watched = None
+            elif spec.get("entities"):
+                watched = tuple(spec["entities"])
+            elif info.all_states or info.domains:
+                # Depends on whole domains; no cheap signature, so always render
+                watched = None
+            else:
+                watched = tuple(sorted(info.entities))
+            if watched is None:
+                frame.signatures.pop(region.name, None)
+            else:
+                frame.signatures[region.name] = (watched, _entity_signature(hass, watched))
+            rendered.append((region, text))
+        return rendered
+
+    async def handle_render_template_to_device(call: ServiceCall) -> ServiceResponse:
+        """Render a template straight to a 1-bit bitmap and show it on a device."""
+        device_friendly_id = call.data["device_friendly_id"]
+        template = call.data["template"]
+        regions = call.data["regions"]
+        
+        trace = PushTrace(device_friendly_id, "template")
+        push_ok = False
+        push_error = None
+        try:
+            api = _api_for_device(hass, device_friendly_id)
+            entry = hass.data[DOMAIN]["router"].entry_for_device(device_friendly_id)
+            device = (entry["coordinator"].data or {}).get(device_friendly_id, {}) if entry else {}
+            
+            width, height = await _async_panel_size(api, device)
+            width = call.data.get("width", width)
+            height = call.data.get("height", height)
+            layout = Layout(**call.data["layout"])
+            
+            # One render per device at a time, so cached frames and screens stay consistent
+            async with render_locks.setdefault(device_friendly_id, asyncio.Lock()):
+                frame = rendered_frames.setdefault(device_friendly_id, TiledFrame()) if regions else None
+                
+                with trace.span("template"):
+                    if template.hass is None:
+                        template.hass = hass
+                    text = template.async_render(parse_result=False)
+                    region_texts = _async_render_regions(frame, regions) if frame else []
+                
+                # The frame takes the new tiles before the upload; if the upload
+                # fails, drop it so the next call redraws and uploads them again
+                try:
+                    with trace.span("render") as span:
+                        if frame is not None:
+                            image_bytes, changed = await hass.async_add_executor_job(
+                                frame.update, (width, height), text, layout, region_texts
+                            )
+                            rendered_frames.resize(device_friendly_id)
+                        else:
+                            image_bytes = await hass.async_add_executor_job(
+                                render_text, text, width, height, layout
+                            )
+                            changed = ["base"]
+                        span.payload_bytes = len(image_bytes or b"")
+                        span.detail = ",".join(changed) or "unchanged"
+                    render_ms = round(trace.spans[-1].duration * 1000, 1)
+                
+                    screen_id = rendered_screens.get(device_friendly_id)
+                    shown = screen_id is not None and api.assigned_screens.get(device_friendly_id) == screen_id
+                    if image_bytes is None and shown:
+                        # No region changed, so the panel already shows this frame
+                        push_ok = True
+                        response = {
+                            "screen_id": screen_id,
+                            "width": width,
+                            "height": height,
+                            "render_ms": render_ms,
+                            "changed_regions": [],
+                        }
+                        return response if call.return_response else None
+                    if image_bytes is None:
+                        image_bytes = await hass.async_add_executor_job(encode_png, frame.frame)
+                
+                    image_data = base64.b64encode(image_bytes).decode()
+                    label = f"HA Template {device_friendly_id}"
+                
+                    with trace.span("update_screen") as span:
+                        span.payload_bytes = len(image_data)
+                        updated = screen_id is not None and await api.update_screen(
+                            screen_id, {"image": {"data": image_data}}
+                        )
+                        span.ok = bool(updated)
+                
+                    if updated and not shown:
+                        # Another push or playlist step pointed the device elsewhere since
+                        with trace.span("assign") as span:
+                            assigned, span.retries = await api.assign_screen(device_friendly_id, screen_id, label)
+                            span.ok = assigned
+                        if not assigned:
+                            raise ServiceValidationError(
+                                f"Screen {screen_id} was updated but could not be assigned to {device_friendly_id}"
+                            )
+                
+                    if not updated:
+                        # First render for this device, or its screen was deleted on the server
+                        with trace.span("create_screen") as span:
+                            span.payload_bytes = len(image_data)
+                            screen_result = await api.create_screen({
+                                "name": f"HA_Template_{device_friendly_id}",
+                                "label": label,
+                                "image": {"data": image_data},
+                            })
+                            if not screen_result:
+                                raise ServiceValidationError(f"Failed to create screen for device {device_friendly_id}")
+                        screen_id = screen_result.get("id")
+                    
+                        with trace.span("assign") as span:
+                            assigned, span.retries = await api.assign_screen(device_friendly_id, screen_id, label)
+                            span.ok = assigned
+                        if not assigned:
+                            raise ServiceValidationError(
+                                f"Screen {screen_id} was created but could not be assigned to {device_friendly_id}"
+                            )
+                        rendered_screens[device_friendly_id] = screen_id
+                        rendered_store.async_delay_save(lambda: dict(rendered_screens), RENDER_SCREENS_SAVE_DELAY)
+                except BaseException:
+                    if frame is not None:
+                        rendered_frames.pop(device_friendly_id, None)
+                    raise
+            
+            if entry:
+                controller = entry.get("refresh_controller")
+                if controller is not None:
+                    controller.record_content_change(device_friendly_id)
+                entry["coordinator"].previews.put(
+                    device_friendly_id, f"screen:{screen_id}:{trace.trace_id}", image_bytes, "image/png"
+                )
+            push_ok = True
+            
+            response = {
+                "screen_id": screen_id,
+                "width": width,
+                "height": height,
+                "render_ms": render_ms,
+                "bytes": len(image_bytes),
+                "changed_regions": changed,
+            }
+            return response if call.return_response else None
+            
+        except ServiceValidationError as e:
+            push_error = str(e)
+            raise
+        except Exception as e:
+            push_error = str(e)
+            _LOGGER.error("Error in render_template_to_device service: %s", e, exc_info=True)
+            raise ServiceValidationError(f"Failed to render template for device: {e}")
+        finally:
+            trace.finish(push_ok, push_error)
+            push_traces.add(trace)
+            hass.bus.async_fire(EVENT_PUSH_TRACE, trace.as_dict())
     
+    async def handle_apply_sleep_schedule(call: ServiceCall) -> ServiceResponse:
+        """Handle the apply_sleep_schedule service call."""
+        router: TRMNLRouter = hass.data[DOMAIN]["router"]
+        wanted = call.data.get("device_friendly_ids")
+        registry = dr.async_get(hass)
+        default_window = SleepWindow(call.data["sleep_start"], call.data["sleep_stop"])
+        area_windows = {
+            area: SleepWindow(window["sleep_start"], window["sleep_stop"])
+            for area, window in call.data["areas"].items()
+        }
+        timezones = {key: dt_util.get_time_zone(name) for key, name in call.data["timezones"].items()}
+        server_tz = dt_util.get_time_zone(hass.config.time_zone)
+        now = dt_util.now()
+
+        async def _apply(entry: Dict[str, Any]) -> Dict[str, Any]:
+            api: TRMNLApi = entry["api"]
+            devices = await api.get_devices()
+            if wanted:
+                devices = [device for device in devices if device.get("friendly_id") in wanted]
+
+            device_areas = {}
+            for device in devices:
+                device_entry = registry.async_get_device(identifiers={(DOMAIN, device.get("friendly_id"))})
+                device_areas[device.get("friendly_id")] = device_entry.area_id if device_entry else None
+
+            changes, unchanged = plan_sleep_schedules(
+                devices, default_window, area_windows, device_areas, timezones, server_tz, now
+            )
+
+            current = {device.get("friendly_id"): device for device in devices}
+            report = {
+                "changed": {
+                    device_id: {
+                        "from": {
+                            "sleep_start_at": current[device_id].get("sleep_start_at"),
+                            "sleep_stop_at": current[device_id].get("sleep_stop_at"),
+                        },
+                        "to": window.as_updates(),
+                    }
+                    for device_id, window in changes.items()
+                },
+                "unchanged": unchanged,
+                "failed": [],
+            }
+
+            if changes and not call.data["dry_run"]:
+                _LOGGER.info("Applying sleep schedule to %d devices on %s (%d already up to date)",
+                             len(changes), api.base_url, len(unchanged))
+                results = await api.update_devices(
+                    {device_id: window.as_updates() for device_id, window in changes.items()}
+                )
+                for device_id, success in results.items():
+                    if not success:
+                        report["changed"].pop(device_id)
+                        report["failed"].append(device_id)
+                if report["failed"]:
+                    _LOGGER.warning("Sleep schedule failed for devices: %s", report["failed"])
+
+            return report
+
+        servers = await router.async_fan_out(_apply, call.data.get("server"))
+        if not servers:
+            raise ServiceValidationError("Could not reach any Terminus server")
+
+        report = {"servers": servers, "dry_run": call.data["dry_run"]}
+        hass.bus.async_fire(EVENT_SLEEP_SCHEDULE_APPLIED, report)
+        return report if call.return_response else None
+
+    async def handle_set_push_binding(call: ServiceCall) -> None:
+        """Create or replace a push binding."""
+        try:
+            # Validate now so a bad payload fails here rather than on every change
+            BINDABLE_SERVICES[call.data["service"]](call.data["data"])
+        except vol.Invalid as e:
+            raise ServiceValidationError(f"Invalid data for {call.data['service']}: {e}")
+        hass.data[DOMAIN]["push_bindings"].async_set(dict(call.data))
+
+    async def handle_remove_push_binding(call: ServiceCall) -> None:
+        """Remove a push binding."""
+        if not hass.data[DOMAIN]["push_bindings"].async_remove(call.data["binding_id"]):
+            raise ServiceValidationError(f"No push binding {call.data['binding_id']}")
+
+    async def _async_render_playlist_item(item: Dict[str, Any], device_friendly_id: str) -> bytes:
+        """Render one playlist item to image bytes without uploading it."""
+        data = BINDABLE_SERVICES[item["service"]]({**item["data"], "device_friendly_id": device_friendly_id})
+        if item["service"] == SERVICE_SEND_DASHBOARD:
+            image_data = await _async_capture_screenshot(
+                data["screenshot_service_url"],
+                _screenshot_payload(data, _dashboard_url(hass, data["dashboard_path"])),
+                screenshot_metrics,
+            )
+            return _decode_image(image_data)
+        
+        api = _api_for_device(hass, device_friendly_id)
+        entry = hass.data[DOMAIN]["router"].entry_for_device(device_friendly_id)
+        device = (entry["coordinator"].data or {}).get(device_friendly_id, {}) if entry else {}
+        width, height = await _async_panel_size(api, device)
+        template = data["template"]
+        if template.hass is None:
+            template.hass = hass
+        text = template.async_render(parse_result=False)
+        return await hass.async_add_executor_job(
+            render_text,
+            text,
+            data.get("width", width),
+            data.get("height", height),
+            Layout(**data["layout"]),
+        )
+
+    async def handle_set_playlist(call: ServiceCall) -> None:
+        """Create or replace a playlist."""
+        device_friendly_id = call.data["device_friendly_id"]
+        _api_for_device(hass, device_friendly_id)
+        for index, item in enumerate(call.data["items"]):
+            try:
+                BINDABLE_SERVICES[item["service"]]({**item["data"], "device_friendly_id": device_friendly_id})
+            except vol.Invalid as e:
+                raise ServiceValidationError(f"Invalid data for playlist item {index + 1}: {e}")
+        hass.data[DOMAIN]["playlists"].async_set(dict(call.data))
+
+    async def handle_remove_playlist(call: ServiceCall) -> None:
+        """Remove a playlist and its screens."""
+        if not await hass.data[DOMAIN]["playlists"].async_remove(call.data["playlist_id"]):
+            raise ServiceValidationError(f"No playlist {call.data['playlist_id']}")
+
+    async def handle_start_firmware_rollout(call: ServiceCall) -> ServiceResponse:
+        """Start enabling firmware updates wave by wave."""
+        router: TRMNLRouter = hass.data[DOMAIN]["router"]
+        known = sorted(
+            device_id for entry in router.entries for device_id in (entry["coordinator"].data or {})
+        )
+        wanted = call.data.get("device_friendly_ids")
+        if wanted:
+            unknown = sorted(set(wanted) - set(known))
+            if unknown:
+                raise ServiceValidationError(f"Devices not found on any Terminus server: {unknown}")
+            device_ids = [device_id for device_id in known if device_id in wanted]
+        else:
+            device_ids = known
+        if not device_ids:
+            raise ServiceValidationError("No devices to roll out to")
+
+        config = {
+            "rollout_id": call.data["rollout_id"],
+            "target_version": call.data.get("target_version"),
+            "waves": plan_waves(device_ids, call.data.get("wave_size"), call.data.get("wave_percent", 10)),
+            "wave_timeout": call.data["wave_timeout"],
+            "halt_threshold": call.data["halt_threshold"],
+        }
+        rollout = await hass.data[DOMAIN]["firmware_rollouts"].async_start(config)
+        return rollout.as_dict() if call.return_response else None
+
+    async def handle_cancel_firmware_rollout(call: ServiceCall) -> None:
+        """Cancel a firmware rollout."""
+        if not await hass.data[DOMAIN]["firmware_rollouts"].async_cancel(call.data["rollout_id"]):
+            raise ServiceValidationError(f"No firmware rollout {call.data['rollout_id']}")
+
+    async def handle_start_call_recording(call: ServiceCall) -> None:
+        """Start recording calls of the services that generate push load."""
+        previous = hass.data[DOMAIN].pop("call_recorder", None)
+        if previous is not None:
+            previous.async_stop()
+        recorder = hass.data[DOMAIN]["call_recorder"] = CallRecorder(
+            hass, RECORDED_SERVICES, call.data["max_calls"]
+        )
+        recorder.async_start()
+
+    async def handle_stop_call_recording(call: ServiceCall) -> ServiceResponse:
+        """Stop recording and write the calls to the config directory."""
+        recorder: Optional[CallRecorder] = hass.data[DOMAIN].pop("call_recorder", None)
+        if recorder is None:
+            raise ServiceValidationError("No call recording is running")
+        recording = recorder.async_stop()
+        filename = call.data.get("filename") or f"trmnl_calls_{dt_util.utcnow():%Y%m%d_%H%M%S}.json"
+        path = hass.config.path(filename)
+        await hass.async_add_executor_job(write_recording, path, recording)
+        _LOGGER.info("Recorded %d service calls to %s", len(recording["calls"]), path)
+        result = {"path": path, "calls": len(recording["calls"]), "duration": recording["duration"]}
+        return result if call.return_response else None
+
+    async def handle_refresh_device(call: ServiceCall) -> None:
+        """Handle refresh device service call."""
+        device_id = call.data["device"]
+
+        _LOGGER.info("Refresh device service called: device=%s", device_id)
+
+        api = _api_for_device(hass, device_id)
+
+        try:
+            success = await api.refresh_device(device_id)
+            if success:
+                _LOGGER.info("Successfully refreshed device %s", device_id)
+            else:
+                _LOGGER.error("Failed to refresh device %s", device_id)
+        except Exception as e:
+            _LOGGER.error("Error refreshing device %s: %s", device_id, e)
+
+    async def handle_update_screen(call: ServiceCall) -> None:
+        """Handle update screen service call."""
+        device_id = call.data.get("device")
+        screen_id = call.data.get("screen_id")
+
+        _LOGGER.info("Update screen service called: device=%s, screen=%s", device_id, screen_id)
+
+        # For now, just log the request since screen updates are complex
+        _LOGGER.info("Screen update requested but not yet implemented")
+
     # Register services
     hass.services.async_register(
         DOMAIN,
-        "send_dashboard_to_device", 
+        SERVICE_APPLY_SLEEP_SCHEDULE,
+        handle_apply_sleep_schedule,
+        schema=SLEEP_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH_DEVICE, handle_refresh_device, schema=REFRESH_DEVICE_SCHEMA
+    )
+    hass.services.async_register(DOMAIN, SERVICE_UPDATE_SCREEN, handle_update_screen)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RENDER_TEMPLATE,
+        handle_render_template_to_device,
+        schema=RENDER_TEMPLATE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_PUSH_BINDING, handle_set_push_binding, schema=SET_PUSH_BINDING_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REMOVE_PUSH_BINDING, handle_remove_push_binding, schema=REMOVE_PUSH_BINDING_SCHEMA
+    )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_PLAYLIST, handle_set_playlist, schema=SET_PLAYLIST_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REMOVE_PLAYLIST, handle_remove_playlist, schema=REMOVE_PLAYLIST_SCHEMA
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_FIRMWARE_ROLLOUT,
+        handle_start_firmware_rollout,
+        schema=START_FIRMWARE_ROLLOUT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CANCEL_FIRMWARE_ROLLOUT,
+        handle_cancel_firmware_rollout,
+        schema=CANCEL_FIRMWARE_ROLLOUT_SCHEMA,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_CALL_RECORDING,
+        handle_start_call_recording,
+        schema=START_CALL_RECORDING_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_CALL_RECORDING,
+        handle_stop_call_recording,
+        schema=STOP_CALL_RECORDING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEND_DASHBOARD, 
         handle_send_dashboard_to_device,
         schema=DASHBOARD_CAPTURE_SCHEMA
     )
     
-    _LOGGER.info("TRMNL dashboard capture service registered (external screenshot version)")
\ No newline at end of file
+    _LOGGER.info("TRMNL dashboard capture service registered (external screenshot version)")
+    
+    # Bindings call the services above, so start them once those exist
+    bindings = hass.data[DOMAIN]["push_bindings"] = PushBindingManager(hass)
+    await bindings.async_load()
+    playlists = hass.data[DOMAIN]["playlists"] = PlaylistManager(hass, _async_render_playlist_item)
+    await playlists.async_load()
+    rollouts = hass.data[DOMAIN]["firmware_rollouts"] = RolloutManager(hass)
+    await rollouts.async_load()
+
+
+async def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove TRMNL services."""
+    for service in SERVICES:
+        hass.services.async_remove(DOMAIN, service)
+    hass.data[DOMAIN].pop("screenshot_metrics", None)
+    hass.data[DOMAIN].pop("push_traces", None)
+    hass.data[DOMAIN].pop("rendered_screens", None)
+    hass.data[DOMAIN].pop("rendered_frames", None)
+    recorder = hass.data[DOMAIN].pop("call_recorder", None)
+    if recorder is not None:
+        recorder.async_stop()
+    for key in ("push_bindings", "playlists", "firmware_rollouts"):
+        manager = hass.data[DOMAIN].pop(key, None)
+        if manager is not None:
+            manager.async_shutdown()
@@ -0,0 +1,79 @@
+"""Fleet sleep-schedule planning for TRMNL devices."""
+from dataclasses import dataclass
+from datetime import datetime, time, tzinfo
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class SleepWindow:
+    """A sleep window in HH:MM form, in the server's timezone."""
+
+    start: str
+    stop: str
+
+    def as_updates(self) -> Dict[str, str]:
+        """Return the device fields for this window."""
+        return {"sleep_start_at": self.start, "sleep_stop_at": self.stop}
+
+
+def normalize_time(value: Any) -> Optional[str]:
+    """Reduce a Terminus time value ("HH:MM", "HH:MM:SS" or ISO datetime) to HH:MM."""
+    if not value:
+        return None
+    value = str(value)
+    if "T" in value:
+        value = value.split("T", 1)[1]
+    return value[:5]
+
+
+def convert_time(value: str, source_tz: tzinfo, target_tz: tzinfo, now: datetime) -> str:
+    """Convert an HH:MM wall-clock time from one timezone to another."""
+    hour, minute = (int(part) for part in value.split(":")[:2])
+    local = datetime.combine(now.astimezone(source_tz).date(), time(hour, minute), source_tz)
+    return local.astimezone(target_tz).strftime("%H:%M")
+
+
+def plan_sleep_schedules(
+    devices: Iterable[Dict[str, Any]],
+    default: SleepWindow,
+    area_windows: Dict[str, SleepWindow],
+    device_areas: Dict[str, Optional[str]],
+    timezones: Dict[str, tzinfo],
+    server_tz: tzinfo,
+    now: datetime,
+) -> Tuple[Dict[str, SleepWindow], List[str]]:
+    """Compute target sleep windows and diff them against current device state.
+
+    Area windows override the default. Timezones are looked up by friendly_id
+    first and then by area; windows are given in that local time and converted
+    to the server's timezone. Returns the windows that need writing and the
+    friendly_ids that are already up to date.
+    """
+    changes: Dict[str, SleepWindow] = {}
+    unchanged: List[str] = []
+
+    for device in devices:
+        device_id = device.get("friendly_id")
+        if not device_id:
+            continue
+
+        area = device_areas.get(device_id)
+        window = area_windows.get(area, default) if area else default
+
+        local_tz = timezones.get(device_id) or (timezones.get(area) if area else None)
+        if local_tz is not None:
+            window = SleepWindow(
+                convert_time(window.start, local_tz, server_tz, now),
+                convert_time(window.stop, local_tz, server_tz, now),
+            )
+
+        current = (
+            normalize_time(device.get("sleep_start_at")),
+            normalize_time(device.get("sleep_stop_at")),
+        )
+        if current == (window.start, window.stop):
+            unchanged.append(device_id)
+        else:
+            changes[device_id] = window
+
+    return changes, unchanged
@@ -1,21 +1,15 @@
 """Support for TRMNL switches."""
 import logging
-from typing import Any, Dict, Optional
+from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import TRMNLDataUpdateCoordinator
-from .const import (
-    DOMAIN,
-    SWITCH_TYPES,
-    MANUFACTURER,
-    MODEL,
-    CONF_DEVICE_ID,
-)
+from .const import DOMAIN, SWITCH_TYPES
+from .entity import TRMNLEntity, async_add_device_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,17 +20,20 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up TRMNL switches from a config entry."""
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    device_id = config_entry.data[CONF_DEVICE_ID]
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
 
-    switches = []
-    for switch_type in SWITCH_TYPES:
-        switches.append(TRMNLSwitch(coordinator, device_id, switch_type))
+    async_add_device_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        lambda device_id: [
+            TRMNLSwitch(coordinator, device_id, switch_type)
+            for switch_type in SWITCH_TYPES
+        ],
+    )
 
-    async_add_entities(switches)
 
-
-class TRMNLSwitch(CoordinatorEntity, SwitchEntity):
+class TRMNLSwitch(TRMNLEntity, SwitchEntity):
     """Representation of a TRMNL switch."""
 
     def __init__(
@@ -46,33 +43,20 @@ class TRMNLSwitch(CoordinatorEntity, SwitchEntity):
         switch_type: str,
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
-        self._device_id = device_id
+        super().__init__(coordinator, device_id)
         self._switch_type = switch_type
-        self._attr_name = f"TRMNL {SWITCH_TYPES[switch_type]['name']}"
+        self._attr_name = SWITCH_TYPES[switch_type]["name"]
         self._attr_unique_id = f"{device_id}_{switch_type}"
         self._attr_icon = SWITCH_TYPES[switch_type].get("icon")
         self._is_on = False
 
-    @property
-    def device_info(self) -> Dict[str, Any]:
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": f"TRMNL {self._device_id}",
-            "manufacturer": MANUFACTURER,
-            "model": MODEL,
-            "sw_version": self.coordinator.data.get("firmware_version", "Unknown") if self.coordinator.data else "Unknown",
-        }
-
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
-        if not self.coordinator.data:
+        data = self.device_data
+        if not data:
             return self._is_on
 
-        data = self.coordinator.data
-
         if self._switch_type == "auto_refresh":
             # Check if auto refresh is enabled based on device status
             return data.get("auto_refresh", True)
@@ -124,8 +108,3 @@ class TRMNLSwitch(CoordinatorEntity, SwitchEntity):
         except Exception as err:
             _LOGGER.error(f"Failed to disable auto refresh: {err}")
             return False
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
\ No newline at end of file
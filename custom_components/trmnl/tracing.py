@@ -0,0 +1,121 @@
+"""Span-based tracing of dashboard pushes."""
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .const import MEMORY_TRACE_BUDGET, PUSH_TRACE_BUFFER_SIZE
+from .memory import estimate_size
+
+
+@dataclass
+class Span:
+    """One timed stage of a push."""
+
+    name: str
+    start: float  # seconds since the trace started
+    duration: float = 0.0
+    payload_bytes: int = 0
+    retries: int = 0
+    ok: bool = True
+    detail: Optional[str] = None
+
+
+@dataclass
+class PushTrace:
+    """Timing of a single push from service call to device assignment."""
+
+    device_id: str
+    dashboard_path: str
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    ok: bool = False
+    error: Optional[str] = None
+    spans: List[Span] = field(default_factory=list)
+    _t0: float = field(default_factory=time.monotonic, repr=False)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        """Time a stage; the span is marked failed if the block raises."""
+        span = Span(name, time.monotonic() - self._t0)
+        try:
+            yield span
+        except BaseException as err:
+            span.ok = False
+            span.detail = span.detail or str(err)
+            raise
+        finally:
+            span.duration = time.monotonic() - self._t0 - span.start
+            self.spans.append(span)
+
+    def finish(self, ok: bool, error: Optional[str] = None) -> None:
+        """Close the trace."""
+        self.ok = ok
+        self.error = error
+        self.duration = time.monotonic() - self._t0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the trace as a JSON-friendly dict with millisecond durations."""
+        return {
+            "trace_id": self.trace_id,
+            "device_id": self.device_id,
+            "dashboard_path": self.dashboard_path,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 1),
+            "ok": self.ok,
+            "error": self.error,
+            "spans": [
+                {
+                    "name": span.name,
+                    "start_ms": round(span.start * 1000, 1),
+                    "duration_ms": round(span.duration * 1000, 1),
+                    "payload_bytes": span.payload_bytes,
+                    "retries": span.retries,
+                    "ok": span.ok,
+                    "detail": span.detail,
+                }
+                for span in self.spans
+            ],
+        }
+
+
+class TraceBuffer:
+    """Ring buffer of the most recent push traces, bounded by count and bytes."""
+
+    def __init__(self, size: int = PUSH_TRACE_BUFFER_SIZE, budget: int = MEMORY_TRACE_BUDGET) -> None:
+        """Initialize the buffer."""
+        self.budget = budget
+        self.usage = 0
+        self.evictions = 0
+        self._size = size
+        self._traces: Deque[Tuple[PushTrace, int]] = deque()
+
+    def add(self, trace: PushTrace) -> None:
+        """Add a finished trace, evicting the oldest while full."""
+        size = estimate_size(trace.as_dict())
+        self._traces.append((trace, size))
+        self.usage += size
+        while len(self._traces) > 1 and (len(self._traces) > self._size or self.usage > self.budget):
+            _, evicted = self._traces.popleft()
+            self.usage -= evicted
+            self.evictions += 1
+
+    def as_memory_dict(self, device_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Return usage figures, optionally limited to some devices."""
+        traces = list(self._traces)
+        if device_ids is not None:
+            device_ids = set(device_ids)
+            traces = [(trace, size) for trace, size in traces if trace.device_id in device_ids]
+        return {
+            "entries": len(traces),
+            "bytes": sum(size for _, size in traces),
+            "budget": self.budget,
+            "evictions": self.evictions,
+        }
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        """Return the buffered traces, newest first."""
+        return [trace.as_dict() for trace, _ in reversed(self._traces)]
@@ -0,0 +1,196 @@
+"""Persistent write-behind queue for Terminus mutations."""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .api import TRMNLApi
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    WRITE_QUEUE_DRAIN_RATE,
+    WRITE_QUEUE_RETRY_INTERVAL,
+    WRITE_QUEUE_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """Hold device updates and dashboard pushes made while Terminus is unreachable.
+
+    Device updates are merged per field so only the final value of each field
+    is sent. Pushes are kept per device, so only the latest image waits for
+    each panel; draining one creates its screen and assigns it. The queue is
+    persisted and drained at WRITE_QUEUE_DRAIN_RATE writes per second once
+    the server answers again.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: TRMNLApi, entry_id: Optional[str] = None) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self.api = api
+        self.devices: Dict[str, Dict[str, Any]] = {}
+        # Per device: the screen to create and the label to assign it with
+        self.pushes: Dict[str, Dict[str, Any]] = {}
+        self._in_flight: Set[str] = set()
+        self._store: Optional[Store] = (
+            Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.write_queue") if entry_id else None
+        )
+        self._drain_task: Optional[asyncio.Task] = None
+        self._unsubscribers: List[Callable[[], None]] = []
+
+    @property
+    def pending(self) -> int:
+        """Return the number of queued writes."""
+        return len(self.devices) + len(self.pushes)
+
+    async def async_load(self) -> None:
+        """Restore writes queued before the last restart."""
+        if self._store is None:
+            return
+        data = await self._store.async_load() or {}
+        for device_id, updates in data.get("devices", {}).items():
+            self.devices.setdefault(device_id, {}).update(updates)
+        self.pushes.update(data.get("pushes", {}))
+        if self.pending:
+            _LOGGER.info("Restored %d queued writes for %s", self.pending, self.api.base_url)
+
+    @callback
+    def async_start(self) -> None:
+        """Attach to the API and retry queued writes on a timer."""
+        self.api.write_queue = self
+        self._unsubscribers.append(
+            async_track_time_interval(
+                self.hass,
+                self._async_retry,
+                timedelta(seconds=WRITE_QUEUE_RETRY_INTERVAL),
+            )
+        )
+        if self.pending:
+            self.hass.async_create_task(self._async_retry())
+
+    async def async_stop(self) -> None:
+        """Detach from the API and persist whatever is still queued."""
+        while self._unsubscribers:
+            self._unsubscribers.pop()()
+        if self.api.write_queue is self:
+            self.api.write_queue = None
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            self._drain_task = None
+        if self._store is not None:
+            await self._store.async_save(self._data())
+
+    def has_pending_device(self, device_id: str) -> bool:
+        """Return True if writes for the device are queued or being drained."""
+        device_id = str(device_id)
+        return device_id in self.devices or device_id in self._in_flight
+
+    @callback
+    def enqueue_device(self, device_id: str, updates: Dict[str, Any]) -> None:
+        """Queue a device update, overwriting earlier values of the same fields."""
+        self.devices.setdefault(str(device_id), {}).update(updates)
+        _LOGGER.info("Queued update of device %s: %s", device_id, sorted(updates))
+        self._async_changed()
+
+    @callback
+    def enqueue_push(self, device_id: str, screen_data: Dict[str, Any], label: str) -> None:
+        """Queue a screen for a device, replacing a push still waiting for it."""
+        self.pushes[str(device_id)] = {"screen": dict(screen_data), "label": label}
+        _LOGGER.info("Queued push of screen %s to device %s", screen_data.get("name"), device_id)
+        self._async_changed()
+
+    @callback
+    def discard_push(self, device_id: str) -> None:
+        """Drop a queued push that a newer, delivered push has superseded."""
+        if self.pushes.pop(str(device_id), None) is not None:
+            self._async_changed()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a summary of the queue for diagnostics."""
+        return {
+            "devices": {device_id: sorted(updates) for device_id, updates in self.devices.items()},
+            "pushes": {device_id: push["screen"].get("name") for device_id, push in self.pushes.items()},
+        }
+
+    def _data(self) -> Dict[str, Any]:
+        return {"devices": self.devices, "pushes": self.pushes}
+
+    @callback
+    def _async_changed(self) -> None:
+        """Persist the queue and start draining if the server is up."""
+        if self._store is not None:
+            self._store.async_delay_save(self._data, WRITE_QUEUE_SAVE_DELAY)
+        if self.api.reachable:
+            self._async_start_drain()
+
+    @callback
+    def _async_start_drain(self) -> None:
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = self.hass.async_create_background_task(
+                self._async_drain(), f"{DOMAIN} drain write queue {self.api.base_url}"
+            )
+
+    async def _async_retry(self, now: Optional[datetime] = None) -> None:
+        """Probe an unreachable server and drain once it answers."""
+        if not self.pending:
+            return
+        if not self.api.reachable:
+            await self.api.test_connection()
+            if not self.api.reachable:
+                return
+            _LOGGER.info("%s is reachable again, draining %d queued writes",
+                         self.api.base_url, self.pending)
+        self._async_start_drain()
+
+    async def _async_drain(self) -> None:
+        """Send queued writes one at a time until empty or the server drops."""
+        interval = 1 / WRITE_QUEUE_DRAIN_RATE
+        while self.pending and self.api.reachable:
+            if self.devices:
+                device_id = next(iter(self.devices))
+                updates = self.devices.pop(device_id)
+                self._in_flight.add(device_id)
+                try:
+                    ok = await self.api.update_device(device_id, updates, defer=False)
+                finally:
+                    self._in_flight.discard(device_id)
+                if not ok and not self.api.reachable:
+                    # Keep fields that were updated again while in flight
+                    pending = self.devices.setdefault(device_id, {})
+                    for key, value in updates.items():
+                        pending.setdefault(key, value)
+                elif not ok:
+                    _LOGGER.error("Terminus rejected queued update of device %s: %s", device_id, updates)
+            else:
+                device_id = next(iter(self.pushes))
+                push = self.pushes.pop(device_id)
+                if not await self._async_push(device_id, push) and not self.api.reachable:
+                    # A push queued while this one was in flight is newer
+                    self.pushes.setdefault(device_id, push)
+
+            if self._store is not None:
+                self._store.async_delay_save(self._data, WRITE_QUEUE_SAVE_DELAY)
+            await asyncio.sleep(interval)
+
+    async def _async_push(self, device_id: str, push: Dict[str, Any]) -> bool:
+        """Create a queued screen and point its device at it."""
+        screen = await self.api.create_screen(push["screen"])
+        if screen is None:
+            if self.api.reachable:
+                _LOGGER.error("Terminus rejected queued screen for device %s", device_id)
+            return False
+        assigned, _ = await self.api.assign_screen(device_id, screen.get("id"), push["label"])
+        if not assigned:
+            # An unassigned screen would only be left behind on the server
+            await self.api.delete_screen(str(screen.get("id")))
+            if self.api.reachable:
+                _LOGGER.error("Could not assign queued screen to device %s", device_id)
+            return False
+        _LOGGER.info("Delivered queued push of screen %s to device %s", screen.get("id"), device_id)
+        return True